@@ -0,0 +1,90 @@
+"""Unit tests for the C header generator."""
+
+import os
+from os.path import join as pjoin
+import shutil
+import subprocess
+import tempfile
+from unittest import TestCase, skipIf
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+from vhdmmio.c import CHeaderGenerator
+
+class TestCHeader(TestCase):
+    """Unit tests for the C header generator."""
+
+    @staticmethod
+    def _generate(cfg):
+        """Generates the C header for the given register file configuration
+        dictionary and returns its contents."""
+        regfile = RegisterFile(RegisterFileConfig.load(cfg), trusted=True)
+        with tempfile.TemporaryDirectory() as tempdir:
+            output_file, = CHeaderGenerator(regfile).generate(tempdir)
+            with open(output_file, 'r') as fil:
+                return fil.read()
+
+    _CFG = {
+        'metadata': {'name': 'test'},
+        'fields': [
+            {'address': 0, 'bitrange': '7..0', 'name': 'a', 'behavior': 'control'},
+            {'address': 0, 'bitrange': '15..8', 'name': 'b', 'behavior': 'status'},
+            {'address': 0, 'bitrange': 16, 'name': 'c', 'behavior': 'flag'},
+            {'address': 4, 'bitrange': '63..0', 'name': 'd', 'behavior': 'control'},
+            {'address': 12, 'bitrange': '7..0', 'name': 'e', 'behavior': 'control'},
+            {'address': 12, 'bitrange': '15..8', 'name': 'f', 'behavior': 'latching',
+             'bus-read': 'valid-only', 'after-bus-read': 'invalidate'},
+            {'address': 12, 'bitrange': '23..16', 'name': 'h', 'behavior': 'control'},
+            {'address': '0x1---', 'name': 'g', 'behavior': 'axi'},
+        ]}
+
+    def test_defines(self):
+        """test C header offset and mask definitions"""
+        header = self._generate(self._CFG)
+        self.assertIn('#define TEST_A_OFFSET 0x00000000u\n', header)
+        self.assertIn('#define TEST_A_B_MASK 0x0000FF00u\n', header)
+        self.assertIn('#define TEST_A_B_SHIFT 8\n', header)
+        self.assertIn('#define TEST_A_C_WIDTH 1\n', header)
+        self.assertIn('#define TEST_DL_OFFSET 0x00000004u\n', header)
+        self.assertIn('#define TEST_DH_OFFSET 0x00000008u\n', header)
+        self.assertIn('#define TEST_D_D_MASK 0xFFFFFFFFFFFFFFFFull\n', header)
+        self.assertIn('#define TEST_G_SIZE 0x00001000u\n', header)
+        self.assertNotIn('test_g_read', header)
+
+    def test_accessors(self):
+        """test C header accessor functions"""
+        header = self._generate(self._CFG)
+
+        # Writing the flag requires a read-modify-write to preserve the
+        # control field, but writing the control field does not, since writing
+        # zero to a flag is a no-op.
+        self.assertIn(
+            '  uint32_t reg = test_a_read(base) & 0x000000FFu;\n'
+            '  test_a_write(base, test_a_c_set(reg, value));\n', header)
+        self.assertIn('  test_a_write(base, test_a_a_set(0, value));\n', header)
+
+        # Multi-block registers are accessed in block order.
+        self.assertIn(
+            '  value |= (uint64_t)*(const volatile uint32_t *)'
+            '((const volatile uint8_t *)base + 0x00000004u) << 0;\n'
+            '  value |= (uint64_t)*(const volatile uint32_t *)'
+            '((const volatile uint8_t *)base + 0x00000008u) << 32;\n', header)
+
+        # Reading register E has side effects, so the control fields in it
+        # cannot be written using a read-modify-write.
+        self.assertNotIn('test_e_e_write', header)
+        self.assertNotIn('test_e_h_write', header)
+        self.assertIn('test_e_e_read', header)
+        self.assertIn('test_e_write', header)
+
+    @skipIf(shutil.which('cc') is None, 'no C compiler available')
+    def test_compile(self):
+        """test compiling the C header"""
+        header = self._generate(self._CFG)
+        with tempfile.TemporaryDirectory() as tempdir:
+            with open(pjoin(tempdir, 'test.gen.h'), 'w') as fil:
+                fil.write(header)
+            with open(pjoin(tempdir, 'test.c'), 'w') as fil:
+                fil.write('#include "test.gen.h"\n')
+            subprocess.run(
+                ['cc', '-std=c99', '-Wall', '-Werror', '-c', 'test.c',
+                 '-o', os.devnull], cwd=tempdir, check=True)
@@ -1,7 +1,10 @@
 """Runs basic tests for all `vhdmmio`'s generators."""
 
+import contextlib
+import io
 import os
 from os.path import join as pjoin
+import shutil
 import tempfile
 from unittest import TestCase
 from vhdmmio import run_cli
@@ -64,3 +67,64 @@ class TestVhdlPaths(TestCase):
             self.assertEqual(self._list_files(base), [
                 'a/b/index.html',
                 'a/b/style.css'])
+
+    def test_parallel(self):
+        """test parallel generation against sequential generation"""
+        examples = pjoin(os.path.dirname(__file__), '..', '..', 'examples')
+        outputs = []
+        for jobs in ('1', '2'):
+            with tempfile.TemporaryDirectory() as base:
+                shutil.copytree(examples, pjoin(base, 'examples'))
+                cwd = os.getcwd()
+                try:
+                    os.chdir(base)
+                    self.assertEqual(run_cli(['-j', jobs, '-V', '-c', '--python', '-H']), 0)
+                finally:
+                    os.chdir(cwd)
+                files = {}
+                for filename in self._list_files(base):
+                    with open(pjoin(base, filename), 'r') as fil:
+                        files[filename] = fil.read()
+                outputs.append(files)
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_cache(self):
+        """test the build cache"""
+        with tempfile.TemporaryDirectory() as base:
+            with open(pjoin(base, 'test.mmio.yaml'), 'w') as fil:
+                fil.write('metadata:\n  name: test\nfields:\n'
+                          '  - address: 0\n    name: a\n    behavior: control\n')
+            cwd = os.getcwd()
+            try:
+                os.chdir(base)
+                self.assertEqual(run_cli(['-V', '-H', '-C']), 0)
+                self.assertTrue(os.path.isfile('.vhdmmio-cache/index.json'))
+                mtime = os.stat('test.gen.vhd').st_mtime_ns
+
+                # Nothing changed, so nothing should be regenerated.
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    self.assertEqual(run_cli(['-V', '-H', '-C']), 0)
+                self.assertIn('VHDL files for ./test.mmio.yaml are up to date', output.getvalue())
+                self.assertIn('HTML documentation in vhdmmio-doc is up to date', output.getvalue())
+                self.assertEqual(os.stat('test.gen.vhd').st_mtime_ns, mtime)
+
+                # Modifying an output should invalidate the cache entry.
+                with open('test.gen.vhd', 'a') as fil:
+                    fil.write('-- modified\n')
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    self.assertEqual(run_cli(['-V', '-C']), 0)
+                self.assertIn('Wrote test.gen.vhd', output.getvalue())
+                self.assertIn('test_pkg.gen.vhd is up to date', output.getvalue())
+
+                # Modifying the description should regenerate the outputs.
+                with open('test.mmio.yaml', 'a') as fil:
+                    fil.write('  - address: 4\n    name: b\n    behavior: control\n')
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    self.assertEqual(run_cli(['-V', '-C']), 0)
+                self.assertIn('Wrote test.gen.vhd', output.getvalue())
+                self.assertIn('Wrote test_pkg.gen.vhd', output.getvalue())
+            finally:
+                os.chdir(cwd)
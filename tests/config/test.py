@@ -1,11 +1,13 @@
 """Integration tests for `vhdmmio.config` and `vhdmmio.configurable`."""
 
+import copy
 import tempfile
 import os
 import glob
+import shutil
 from unittest import TestCase
 from vhdmmio.config import RegisterFileConfig
-from vhdmmio.configurable import document_configurables
+from vhdmmio.configurable import document_configurables, ParseError
 
 class TestConfig(TestCase):
     """Integration tests for `vhdmmio.config` and `vhdmmio.configurable`."""
@@ -35,6 +37,78 @@ class TestConfig(TestCase):
                 from vhdmmio.core import RegisterFile
                 RegisterFile(regfile1, True)
 
+    def test_cache(self):
+        """test the parsed configuration cache"""
+        example = glob.glob(os.path.dirname(__file__) + '/../../examples/**/*.yaml')[0]
+        with tempfile.TemporaryDirectory() as base:
+            cache = base + '/cache'
+            fname = base + '/test.mmio.yaml'
+            shutil.copyfile(example, fname)
+            regfile1 = RegisterFileConfig.load(fname, cache=cache)
+            cached, = os.listdir(cache + '/configs')
+
+            # The cached object should be equivalent to the original, and
+            # refer to the file it was loaded from.
+            regfile2 = RegisterFileConfig.load(fname, cache=cache)
+            self.assertEqual(regfile2.serialize(), regfile1.serialize())
+            self.assertEqual(regfile2.source_file, fname)
+            fname2 = base + '/sub/test.mmio.yaml'
+            os.makedirs(base + '/sub')
+            shutil.copyfile(example, fname2)
+            regfile3 = RegisterFileConfig.load(fname2, cache=cache)
+            self.assertEqual(regfile3.source_directory, base + '/sub')
+            self.assertEqual(os.listdir(cache + '/configs'), [cached])
+
+            # Modifying the file should result in a new cache entry.
+            with open(fname, 'a') as fil:
+                fil.write('\n# modified\n')
+            RegisterFileConfig.load(fname, cache=cache)
+            self.assertEqual(len(os.listdir(cache + '/configs')), 2)
+
+            # Corrupt cache entries should be ignored.
+            with open(cache + '/configs/' + cached, 'wb') as fil:
+                fil.write(b'garbage')
+            regfile4 = RegisterFileConfig.load(fname2, cache=cache)
+            self.assertEqual(regfile4.serialize(), regfile1.serialize())
+
+            from vhdmmio.core import RegisterFile
+            RegisterFile(regfile2, True)
+
+    def test_prototypes(self):
+        """test flattening of prototype trees"""
+        proto = {
+            'behavior': 'custom',
+            'interfaces': [{'input': 'x'}],
+            'read': '$data$ := $s.x$;',
+            'subfields': [
+                {'address': 0, 'name': 'a'},
+                {'address': 4, 'name': 'b', 'read': '$data$ := "0";'},
+                {'address': 8, 'name': 'c', 'subfields': [
+                    {'name': 'd', 'bitrange': 3},
+                    {'name': 'e', 'bitrange': 4, 'interfaces': []},
+                ]},
+            ]}
+        flat = [
+            {'address': 0, 'name': 'a'},
+            {'address': 4, 'name': 'b', 'read': '$data$ := "0";'},
+            {'address': 8, 'name': 'd', 'bitrange': 3},
+            {'address': 8, 'name': 'e', 'bitrange': 4, 'interfaces': []},
+        ]
+        for field in flat:
+            for key in ('behavior', 'interfaces', 'read'):
+                field.setdefault(key, copy.deepcopy(proto[key]))
+        regfile1 = RegisterFileConfig.load({'metadata': {'name': 'x'}, 'fields': [proto]})
+        regfile2 = RegisterFileConfig.load({'metadata': {'name': 'x'}, 'fields': flat})
+        self.assertEqual(regfile1.serialize(), regfile2.serialize())
+        self.assertEqual(len(regfile1.fields), 4)
+
+        # Errors in the leaves should be reported with the path through the
+        # tree.
+        proto['subfields'][2]['subfields'][1]['bogus'] = 1
+        with self.assertRaisesRegex(
+                ParseError, r'unknown key `bogus` in fields\[0\]\.subfields\[2\]\.subfields\[1\]'):
+            RegisterFileConfig.load({'metadata': {'name': 'x'}, 'fields': [proto]})
+
     def test_docgen(self):
         """test register file documentation generation"""
         self.maxDiff = None #pylint: disable=C0103
@@ -2,8 +2,10 @@
 
 from collections import OrderedDict
 from unittest import TestCase
+import random
 from vhdmmio.core.mixins import Shaped, Named, Unique
 from vhdmmio.core.address import AddressSignalMap, MaskedAddress, AddressManager
+from vhdmmio.core.address import AddressMap, AddressConflictError
 
 class Signal(Shaped, Named, Unique):
     """Generic `Shaped+Named+Unique` class for testing purposes."""
@@ -121,3 +123,36 @@ class TestAddresses(TestCase):
                 ValueError, r'address conflict between SPR \(0x00000007\) and '
                 r'MSR \(0x00000006/1\) at 0x00000007, `dlab`=0 in read mode'):
             add_mapping(mgr, 'SPR', MaskedAddress(7, 0xFFFFFFFF), 1, 1)
+
+    def test_address_map(self):
+        """test AddressMap conflict detection against brute force"""
+        rand = random.Random(42)
+        for _ in range(20):
+            amap = AddressMap()
+            reference = []
+            for _ in range(200):
+                mask = rand.getrandbits(8) | rand.choice([0, 0xF0, 0xFF])
+                address = MaskedAddress(rand.getrandbits(8) & mask, mask)
+                if address in reference:
+                    continue
+                expected = None
+                for other in reference:
+                    if address.common(other) is not None:
+                        expected = other
+                        break
+                if expected is None:
+                    amap[address] = len(reference)
+                    reference.append(address)
+                else:
+                    with self.assertRaises(AddressConflictError) as ctx:
+                        amap[address] = len(reference)
+                    self.assertEqual(ctx.exception.address_b, expected)
+
+                # Randomly remove entries to test pruning.
+                if reference and rand.random() < 0.2:
+                    address = reference.pop(rand.randrange(len(reference)))
+                    if rand.random() < 0.5:
+                        del amap[address]
+                    else:
+                        amap.pop(address)
+            self.assertEqual(set(amap), set(reference))
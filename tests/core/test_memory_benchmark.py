@@ -0,0 +1,46 @@
+"""Benchmark for the memory usage of elaborated register files."""
+
+from unittest import TestCase
+import gc
+import logging
+import tracemalloc
+
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+
+_LOGGER = logging.getLogger(__name__)
+
+class TestMemoryBenchmark(TestCase):
+    """Benchmark for the memory usage of elaborated register files."""
+
+    @staticmethod
+    def _elaborate(num_fields):
+        """Elaborates a register file with `num_fields` fields, each in its
+        own register, similar to large generated register files. Returns the
+        number of bytes kept alive by the elaborated register file."""
+        cfg = RegisterFileConfig.load({
+            'metadata': {'name': 'test'},
+            'fields': [{
+                'address': 0, 'repeat': num_fields, 'stride': 1, 'field-repeat': 1,
+                'bitrange': '7..0', 'name': 'a', 'behavior': 'control'}]})
+        gc.collect()
+        tracemalloc.start()
+        try:
+            regfile = RegisterFile(cfg, trusted=True)
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert len(regfile.registers) == num_fields
+        return size
+
+    def test_bytes_per_field(self):
+        """benchmark memory usage per field"""
+        per_field = (self._elaborate(1150) - self._elaborate(150)) / 1000
+        _LOGGER.info('elaborated register file uses %.0f bytes per field', per_field)
+
+        # The elaborated objects should not need more than a few kilobytes
+        # per field, which includes the field, its register and block, the
+        # field mapping and bitrange, and the address map and namespace
+        # entries.
+        self.assertLess(per_field, 6 * 1024)
@@ -0,0 +1,80 @@
+"""Test the AXI4 slave interface."""
+
+from unittest import TestCase
+from ..testbench import RegisterFileTestbench
+
+class TestAXI4(TestCase):
+    """AXI4 slave interface tests"""
+
+    def test_axi4(self):
+        """test AXI4 bursts"""
+        rft = RegisterFileTestbench({
+            'metadata': {'name': 'test'},
+            'entity': {
+                'bus-protocol': 'axi4',
+                'bus-id-width': 4,
+            },
+            'fields': [
+                {
+                    'repeat': 8,
+                    'address': 0,
+                    'name': 'a',
+                    'behavior': 'control',
+                },
+                {
+                    'address': 32,
+                    'name': 'b',
+                    'behavior': 'status',
+                },
+            ]})
+        self.assertEqual(rft.ports, (
+            'bus',
+            'f_a_o.0.data',
+            'f_a_o.1.data',
+            'f_a_o.2.data',
+            'f_a_o.3.data',
+            'f_a_o.4.data',
+            'f_a_o.5.data',
+            'f_a_o.6.data',
+            'f_a_o.7.data',
+            'f_b_i.write_data',
+        ))
+        with rft as objs:
+
+            # Single-beat accesses.
+            objs.bus.write(0, 11)
+            self.assertEqual(objs.bus.read(0), 11)
+            self.assertEqual(int(objs.f_a_o[0].data), 11)
+            objs.f_b_i.write_data.val = 42
+            self.assertEqual(objs.bus.read(32), 42)
+            with self.assertRaisesRegex(ValueError, 'decode'):
+                objs.bus.read(36)
+            with self.assertRaisesRegex(ValueError, 'decode'):
+                objs.bus.write(36, 0)
+
+            # Incrementing bursts.
+            objs.bus.burst_write(0, [1, 2, 3, 4, 5, 6, 7, 8], ident=3)
+            self.assertEqual(
+                objs.bus.burst_read(0, 8, ident=5), [1, 2, 3, 4, 5, 6, 7, 8])
+            self.assertEqual(objs.bus.burst_read(12, 2), [4, 5])
+            for index in range(8):
+                self.assertEqual(int(objs.f_a_o[index].data), index + 1)
+
+            # Wrapping bursts.
+            objs.bus.burst_write(8, [10, 20, 30, 40], 'WRAP')
+            self.assertEqual(objs.bus.burst_read(0, 4), [30, 40, 10, 20])
+            self.assertEqual(objs.bus.burst_read(20, 2, 'WRAP'), [6, 5])
+
+            # Fixed bursts.
+            objs.bus.burst_write(28, [100, 200, 300], 'FIXED')
+            self.assertEqual(objs.bus.read(28), 300)
+            self.assertEqual(objs.bus.read(24), 7)
+            self.assertEqual(objs.bus.burst_read(28, 3, 'FIXED'), [300, 300, 300])
+
+            # Error responses.
+            with self.assertRaisesRegex(ValueError, 'decode'):
+                objs.bus.burst_write(28, [1, 2, 3])
+            self.assertEqual(objs.bus.read(28), 1)
+            with self.assertRaisesRegex(ValueError, 'decode'):
+                objs.bus.burst_read(28, 3)
+            self.assertEqual(objs.bus.burst_read(24, 3), [7, 1, 42])
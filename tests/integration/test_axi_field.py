@@ -107,7 +107,7 @@ class TestAxiFields(TestCase):
 
     def test_errors(self):
         """test AXI field config errors"""
-        msg = ('AXI fields must be 32 or 64 bits wide')
+        msg = ('AXI fields must be 32, 64, 128, 256, or 512 bits wide')
         with self.assertRaisesRegex(Exception, msg):
             RegisterFileTestbench({
                 'metadata': {'name': 'test'},
@@ -0,0 +1,82 @@
+"""Test the different bus widths."""
+
+from unittest import TestCase
+from ..testbench import RegisterFileTestbench
+
+class TestBusWidth(TestCase):
+    """Bus width tests"""
+
+    def _test_bus_width(self, bus_width):
+        """Tests a register file with a couple of single- and multi-word
+        registers and an AXI field, using the given bus width."""
+        word = bus_width // 8
+        rft = RegisterFileTestbench({
+            'metadata': {'name': 'test'},
+            'features': {'bus-width': bus_width},
+            'fields': [
+                {
+                    'address': 0,
+                    'name': 'a',
+                    'behavior': 'control',
+                },
+                {
+                    'address': word,
+                    'bitrange': '%d..0' % (bus_width * 2 - 1),
+                    'name': 'b',
+                    'behavior': 'control',
+                },
+                {
+                    'address': word * 3,
+                    'bitrange': '%d..%d' % (bus_width - 1, bus_width - 8),
+                    'name': 'c',
+                    'behavior': 'status',
+                },
+                {
+                    'address': '0x1---',
+                    'bitrange': '%d..0' % (bus_width - 1),
+                    'name': 'd',
+                    'behavior': 'axi',
+                    'flatten': True,
+                },
+            ]})
+        self.assertEqual(rft.ports, (
+            'bus',
+            'f_a_o.data',
+            'f_b_o.data',
+            'f_c_i.write_data',
+            'f_d',
+        ))
+        with rft as objs:
+            objs.f_d.start()
+
+            value = int('1234567890abcdef' * (bus_width // 64), 16)
+            objs.bus.write(0, value)
+            self.assertEqual(objs.bus.read(0), value)
+            self.assertEqual(int(objs.f_a_o.data), value)
+
+            objs.bus.write(word, value + 1)
+            objs.bus.write(word * 2, value + 2)
+            self.assertEqual(objs.bus.read(word), value + 1)
+            self.assertEqual(objs.bus.read(word * 2), value + 2)
+            self.assertEqual(
+                int(objs.f_b_o.data), value + 1 | ((value + 2) << bus_width))
+
+            objs.f_c_i.write_data.val = 0xA5
+            self.assertEqual(objs.bus.read(word * 3), 0xA5 << (bus_width - 8))
+
+            objs.bus.write(0x1000 + word * 5, value)
+            self.assertEqual(objs.f_d.read(word * 5), value)
+            objs.f_d.write(word * 7, value + 3)
+            self.assertEqual(objs.bus.read(0x1000 + word * 7), value + 3)
+
+    def test_64(self):
+        """test 64-bit busses"""
+        self._test_bus_width(64)
+
+    def test_128(self):
+        """test 128-bit busses"""
+        self._test_bus_width(128)
+
+    def test_512(self):
+        """test 512-bit busses"""
+        self._test_bus_width(512)
@@ -0,0 +1,93 @@
+"""Test pipelined address decoders."""
+
+from unittest import TestCase
+from ..testbench import RegisterFileTestbench
+
+class TestPipelining(TestCase):
+    """Pipelined address decoder tests"""
+
+    @staticmethod
+    def _make_testbench(stages, decoder='tree', optimize=False):
+        """Constructs a testbench for a register file with a couple of
+        control registers, a multi-word register, and conditional registers,
+        using the given address decoder configuration."""
+        fields = [
+            {
+                'address': 0,
+                'name': 'a',
+                'behavior': 'control',
+            },
+            {
+                'address': 4,
+                'name': 'b',
+                'behavior': 'control',
+            },
+            {
+                'address': 8,
+                'bitrange': '63..0',
+                'name': 'c',
+                'behavior': 'control',
+            },
+            {
+                'address': 16,
+                'bitrange': '1..0',
+                'name': 'x',
+                'behavior': 'internal-control',
+                'internal': 'x',
+            },
+        ]
+        for idx, val in enumerate([4, 8, 15, 16]):
+            fields.append({
+                'address': 20,
+                'conditions': [{'internal': 'x:2', 'value': idx}],
+                'name': 'k%d' % idx,
+                'behavior': 'constant',
+                'value': val,
+            })
+        return RegisterFileTestbench({
+            'metadata': {'name': 'test'},
+            'features': {
+                'decoder-stages': stages,
+                'decoder': decoder,
+                'optimize': optimize,
+            },
+            'fields': fields,
+        })
+
+    def _test_pipelining(self, *args, **kwargs):
+        """Tests the register file generated by `_make_testbench()`."""
+        rft = self._make_testbench(*args, **kwargs)
+        self.assertEqual(rft.ports, ('bus', 'f_a_o.data', 'f_b_o.data', 'f_c_o.data'))
+        with rft as objs:
+            objs.bus.write(0, 11)
+            objs.bus.write(4, 22)
+            objs.bus.write(8, 33)
+            objs.bus.write(12, 44)
+            self.assertEqual(objs.bus.read(0), 11)
+            self.assertEqual(objs.bus.read(4), 22)
+            self.assertEqual(objs.bus.read(8), 33)
+            self.assertEqual(objs.bus.read(12), 44)
+            self.assertEqual(int(objs.f_a_o.data), 11)
+            self.assertEqual(int(objs.f_b_o.data), 22)
+            self.assertEqual(int(objs.f_c_o.data), 33 | (44 << 32))
+            for idx, val in enumerate([4, 8, 15, 16]):
+                objs.bus.write(16, idx)
+                self.assertEqual(objs.bus.read(20), val)
+            if not kwargs.get('optimize', False):
+                with self.assertRaisesRegex(ValueError, 'decode'):
+                    objs.bus.read(24)
+                with self.assertRaisesRegex(ValueError, 'decode'):
+                    objs.bus.write(24, 0)
+
+    def test_single_stage(self):
+        """test single-stage pipelined address decoders"""
+        self._test_pipelining(1)
+
+    def test_multi_stage(self):
+        """test multi-stage pipelined address decoders"""
+        self._test_pipelining(3)
+
+    def test_minimized(self):
+        """test pipelined, minimized address decoders"""
+        self._test_pipelining(1, decoder='minimized')
+        self._test_pipelining(2, decoder='minimized', optimize=True)
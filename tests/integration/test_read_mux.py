@@ -0,0 +1,106 @@
+"""Test the read data multiplexer variants."""
+
+from unittest import TestCase
+from ..testbench import RegisterFileTestbench
+
+class TestReadMux(TestCase):
+    """Read data multiplexer tests"""
+
+    def _test_read_mux(self, read_mux, **features):
+        """Tests a register file with a couple of different kinds of readable
+        registers using the given read data multiplexer configuration."""
+        features['read-mux'] = read_mux
+        rft = RegisterFileTestbench({
+            'metadata': {'name': 'test'},
+            'features': features,
+            'fields': [
+                {
+                    'address': 0,
+                    'name': 'a',
+                    'behavior': 'status',
+                },
+                {
+                    'address': 4,
+                    'name': 'b',
+                    'behavior': 'control',
+                },
+                {
+                    'address': 8,
+                    'bitrange': '63..0',
+                    'name': 'c',
+                    'behavior': 'status',
+                },
+                {
+                    'address': 16,
+                    'name': 'd',
+                    'behavior': 'latching',
+                    'bus-read': 'valid-wait',
+                    'ctrl-validate': True,
+                },
+                {
+                    'address': 20,
+                    'name': 'e',
+                    'behavior': 'latching',
+                    'bus-read': 'valid-only',
+                    'after-bus-read': 'invalidate',
+                    'reset': 33,
+                },
+            ]})
+        self.assertEqual(rft.ports, (
+            'bus',
+            'f_a_i.write_data',
+            'f_b_o.data',
+            'f_c_i.write_data',
+            'f_d_i.validate',
+            'f_d_i.write_data',
+            'f_d_i.write_enable',
+            'f_e_i.write_data',
+            'f_e_i.write_enable',
+        ))
+        with rft as objs:
+            objs.f_a_i.write_data.val = 33
+            self.assertEqual(objs.bus.read(0), 33)
+            objs.f_a_i.write_data.val = 42
+            self.assertEqual(objs.bus.read(0), 42)
+
+            objs.bus.write(4, 0x11223344)
+            self.assertEqual(objs.bus.read(4), 0x11223344)
+            self.assertEqual(objs.bus.read(0), 42)
+
+            objs.f_c_i.write_data.val = 0x1122334455667788
+            self.assertEqual(objs.bus.read(8), 0x55667788)
+            objs.f_c_i.write_data.val = 0
+            self.assertEqual(objs.bus.read(12), 0x11223344)
+
+            res = []
+            def result(data, resp):
+                res.append((int(data), int(resp)))
+            objs.bus.async_read(result, 16)
+            objs.bus.async_read(result, 16)
+            rft.testbench.clock(20)
+            self.assertEqual(res, [])
+            objs.f_d_i.write_data.val = 33
+            objs.f_d_i.write_enable.val = 1
+            objs.f_d_i.validate.val = 1
+            rft.testbench.clock(1)
+            objs.f_d_i.write_enable.val = 0
+            objs.f_d_i.validate.val = 0
+            rft.testbench.clock(10)
+            self.assertEqual(res, [(33, 0), (33, 0)])
+
+            self.assertEqual(objs.bus.read(20), 33)
+            with self.assertRaisesRegex(ValueError, 'slave'):
+                objs.bus.read(20)
+
+            with self.assertRaisesRegex(ValueError, 'decode'):
+                objs.bus.read(24)
+            self.assertEqual(objs.bus.read(4), 0x11223344)
+
+    def test_or_tree(self):
+        """test the OR reduction tree read data multiplexer"""
+        self._test_read_mux('or-tree')
+
+    def test_registered_or_tree(self):
+        """test the registered OR reduction tree read data multiplexer"""
+        self._test_read_mux('registered-or-tree')
+        self._test_read_mux('registered-or-tree', **{'decoder-stages': 1})
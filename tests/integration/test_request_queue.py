@@ -0,0 +1,84 @@
+"""Test the AXI4-lite request queues."""
+
+from unittest import TestCase
+from ..testbench import RegisterFileTestbench
+
+class TestRequestQueue(TestCase):
+    """AXI4-lite request queue tests"""
+
+    def _test_request_queue(self, depth):
+        """Tests back-to-back requests on a register file with request queues
+        of the given depth."""
+        rft = RegisterFileTestbench({
+            'metadata': {'name': 'test'},
+            'features': {'request-queue-depth': depth},
+            'fields': [
+                {
+                    'repeat': 4,
+                    'address': 0,
+                    'name': 'a',
+                    'behavior': 'control',
+                },
+                {
+                    'address': 16,
+                    'name': 'b',
+                    'behavior': 'latching',
+                    'bus-read': 'valid-wait',
+                    'ctrl-validate': True,
+                },
+            ]})
+        self.assertEqual(rft.ports, (
+            'bus',
+            'f_a_o.0.data',
+            'f_a_o.1.data',
+            'f_a_o.2.data',
+            'f_a_o.3.data',
+            'f_b_i.validate',
+            'f_b_i.write_data',
+            'f_b_i.write_enable',
+        ))
+        with rft as objs:
+
+            # Issue a bunch of back-to-back writes and reads, and make sure
+            # that they are all handled in order.
+            res = []
+            def write_result(resp):
+                res.append(int(resp))
+            def read_result(data, resp):
+                if int(resp):
+                    res.append(int(resp))
+                else:
+                    res.append((int(data), 0))
+            for index in range(4):
+                objs.bus.async_write(write_result, index * 4, index + 10)
+            rft.testbench.clock(10)
+            for index in range(4):
+                objs.bus.async_read(read_result, index * 4)
+            rft.testbench.clock(10)
+            self.assertEqual(res, [0, 0, 0, 0, (10, 0), (11, 0), (12, 0), (13, 0)])
+
+            # Blocked requests must hold up the requests queued behind them
+            # without losing any.
+            res.clear()
+            objs.bus.async_read(read_result, 16)
+            objs.bus.async_read(read_result, 0)
+            objs.bus.async_read(read_result, 20)
+            objs.bus.async_read(read_result, 4)
+            rft.testbench.clock(20)
+            self.assertEqual(res, [])
+            objs.f_b_i.write_data.val = 33
+            objs.f_b_i.write_enable.val = 1
+            objs.f_b_i.validate.val = 1
+            rft.testbench.clock(1)
+            objs.f_b_i.write_enable.val = 0
+            objs.f_b_i.validate.val = 0
+            rft.testbench.clock(10)
+            self.assertEqual(res, [(33, 0), (10, 0), 3, (11, 0)])
+
+    def test_single_entry(self):
+        """test single-entry request queues"""
+        self._test_request_queue(1)
+
+    def test_multi_entry(self):
+        """test multi-entry request queues"""
+        self._test_request_queue(4)
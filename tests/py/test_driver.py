@@ -0,0 +1,154 @@
+"""Unit tests for the Python driver generator."""
+
+import os
+from os.path import join as pjoin
+import importlib.util
+import tempfile
+from unittest import TestCase
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+from vhdmmio.py import PythonDriverGenerator
+
+class TestPythonDriver(TestCase):
+    """Unit tests for the Python driver generator."""
+
+    _CFG = {
+        'metadata': {'name': 'test'},
+        'fields': [
+            {'address': 0, 'bitrange': '7..0', 'name': 'a', 'behavior': 'control'},
+            {'address': 0, 'bitrange': '15..8', 'name': 'b', 'behavior': 'status'},
+            {'address': 0, 'bitrange': 16, 'name': 'c', 'behavior': 'flag'},
+            {'address': 4, 'bitrange': '63..0', 'name': 'd', 'behavior': 'control'},
+            {'address': 12, 'bitrange': '7..0', 'name': 'e', 'behavior': 'control'},
+            {'address': 12, 'bitrange': '15..8', 'name': 'f', 'behavior': 'latching',
+             'bus-read': 'valid-only', 'after-bus-read': 'invalidate'},
+            {'address': 12, 'bitrange': '23..16', 'name': 'h', 'behavior': 'control'},
+            {'address': 16, 'bitrange': '7..0', 'repeat': 4, 'field-repeat': 1,
+             'stride': 2, 'name': 'k', 'behavior': 'control'},
+            {'address': 48, 'bitrange': '3..0', 'repeat': 3, 'name': 'm',
+             'behavior': 'control'},
+            {'address': '0x1---', 'name': 'g', 'behavior': 'axi'},
+        ]}
+
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.tempdir = tempdir.name
+        regfile = RegisterFile(RegisterFileConfig.load(self._CFG), trusted=True)
+        output_file, = PythonDriverGenerator(regfile).generate(self.tempdir)
+        self.assertEqual(output_file, pjoin(self.tempdir, 'test_mmio.py'))
+        spec = importlib.util.spec_from_file_location('test_mmio', output_file)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+
+    def test_fields(self):
+        """test Python driver field accessors"""
+        with self.module.Test.anonymous() as regs:
+            self.assertEqual(regs.SIZE, 0x2000)
+            words = memoryview(regs._buffer).cast('I') #pylint: disable=W0212
+            try:
+                # Writing the control field writes zero to the flag.
+                words[0] = 0x1FFFF
+                regs.a = 0x123
+                self.assertEqual(words[0], 0x23)
+                self.assertEqual(regs.a, 0x23)
+
+                # Writing the flag preserves the control field.
+                words[0] = 0x1FF42
+                regs.c = 1
+                self.assertEqual(words[0], 0x10042)
+                words[0] = 0xAB00
+                self.assertEqual(regs.b, 0xAB)
+                with self.assertRaises(AttributeError):
+                    regs.b = 1
+
+                # Multi-block registers.
+                regs.d = 0x0123456789ABCDEF
+                self.assertEqual(words[1], 0x89ABCDEF)
+                self.assertEqual(words[2], 0x01234567)
+                self.assertEqual(regs.d, 0x0123456789ABCDEF)
+
+                # Register E has read side effects, so its control fields cannot
+                # be written using a read-modify-write.
+                words[3] = 0x4321
+                self.assertEqual(regs.e, 0x21)
+                with self.assertRaises(AttributeError):
+                    regs.e = 1
+                regs.e_reg = 0x12
+                self.assertEqual(words[3], 0x12)
+
+                # Windows are exposed as memoryviews.
+                regs.g_reg[4:8] = b'\x01\x02\x03\x04'
+                self.assertEqual(words[0x401], 0x04030201)
+            finally:
+                words.release()
+
+    def test_bulk(self):
+        """test Python driver bulk accessors for repeated fields"""
+        with self.module.Test.anonymous() as regs:
+            regs.write_k([1, 2, 3, 0x104])
+            self.assertEqual([regs.k0, regs.k1, regs.k2, regs.k3], [1, 2, 3, 4])
+            self.assertEqual(list(regs.read_k()), [1, 2, 3, 4])
+            regs.write_m([5, 6, 7])
+            self.assertEqual(regs.m0_reg, 0x765)
+            self.assertEqual(list(regs.read_m()), [5, 6, 7])
+            with self.assertRaises(ValueError):
+                regs.write_k([1, 2, 3])
+
+    def test_file(self):
+        """test Python driver on a file-backed mapping"""
+        fname = pjoin(self.tempdir, 'regs.bin')
+        with open(fname, 'wb') as fil:
+            fil.truncate(self.module.Test.SIZE)
+        with self.module.Test.open(fname) as regs:
+            regs.d_reg = 0x1122334455667788
+        with open(fname, 'rb') as fil:
+            data = fil.read()
+        self.assertEqual(data[4:12], bytes.fromhex('8877665544332211'))
+        with self.assertRaises(ValueError):
+            self.module.Test(bytearray(16))
+
+    def test_transaction(self):
+        """test Python driver transactions"""
+        with self.module.Test.anonymous() as regs:
+            words = memoryview(regs._buffer).cast('I') #pylint: disable=W0212
+            try:
+                # Staged fields in the same register are written at once, and
+                # unstaged control fields are preserved.
+                words[0] = 0x42
+                with regs.transaction() as txn:
+                    txn.c = 1
+                    self.assertEqual(words[0], 0x42)
+                self.assertEqual(words[0], 0x10042)
+                with regs.transaction() as txn:
+                    txn.a = 0x11
+                    txn.c = 1
+                    txn.a = 0x33
+                self.assertEqual(words[0], 0x10033)
+
+                # Multi-block registers are read and written in block order.
+                regs.d = 0x0123456789ABCDEF
+                txn = regs.transaction()
+                txn.d = 0xFEDCBA9876543210
+                txn.flush()
+                self.assertEqual(regs.d, 0xFEDCBA9876543210)
+
+                # Register E has read side effects, so its control fields can
+                # only be written together.
+                words[3] = 0
+                with self.assertRaises(ValueError):
+                    with regs.transaction() as txn:
+                        txn.e = 1
+                with regs.transaction() as txn:
+                    txn.e = 1
+                    txn.h = 2
+                self.assertEqual(words[3], 0x20001)
+
+                # Transactions are discarded when an exception occurs.
+                with self.assertRaises(KeyError):
+                    with regs.transaction() as txn:
+                        txn.k0 = 5
+                        raise KeyError()
+                self.assertEqual(regs.k0, 0)
+            finally:
+                words.release()
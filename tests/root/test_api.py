@@ -0,0 +1,67 @@
+"""Unit tests for the in-memory generation API."""
+
+import contextlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+import yaml
+from vhdmmio import run_cli
+from vhdmmio.api import elaborate, generate_strings
+from vhdmmio.config import RegisterFileConfig
+
+_CONFIG = {
+    'metadata': {'name': 'test'},
+    'fields': [
+        {'address': 0, 'name': 'ctrl', 'behavior': 'control'},
+        {'address': 4, 'name': 'stat', 'behavior': 'status'},
+    ]}
+
+class TestApi(TestCase):
+    """Unit tests for the in-memory generation API."""
+
+    def test_elaborate(self):
+        """test elaborating the different kinds of descriptions"""
+        regfile = elaborate(_CONFIG)
+        self.assertEqual(regfile.name, 'test')
+        self.assertIs(elaborate(regfile), regfile)
+        self.assertEqual(elaborate(RegisterFileConfig.load(_CONFIG)).name, 'test')
+
+    def test_matches_cli(self):
+        """test that the in-memory outputs match the files written by the CLI"""
+        outputs = generate_strings(
+            _CONFIG, vhd=True, pkg=True, html=True, c_header=True, python=True)
+        self.assertEqual(sorted(outputs), [
+            'index.html', 'style.css', 'test.gen.h', 'test.gen.vhd',
+            'test_mmio.py', 'test_pkg.gen.vhd', 'vhdmmio_pkg.gen.vhd'])
+        with tempfile.TemporaryDirectory() as tempdir:
+            source = os.path.join(tempdir, 'test.mmio.yaml')
+            with open(source, 'w') as fil:
+                yaml.safe_dump(_CONFIG, fil)
+            out = os.path.join(tempdir, 'out')
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(run_cli([
+                    source, '-V', out, '-P', out, '-H', out, '-c', out,
+                    '--python', out]), 0)
+            for name, contents in outputs.items():
+                with open(os.path.join(out, name), 'r') as fil:
+                    self.assertEqual(fil.read(), contents, name)
+
+    def test_no_files(self):
+        """test that the in-memory API does not write any files"""
+        with tempfile.TemporaryDirectory() as tempdir:
+            cwd = os.getcwd()
+            try:
+                os.chdir(tempdir)
+                with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                    outputs = generate_strings([_CONFIG], pkg=True, html=True)
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(tempdir), [])
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertIn('entity test is', outputs['test.gen.vhd'])
+
+    def test_duplicate_names(self):
+        """test register files with the same name"""
+        with self.assertRaisesRegex(ValueError, 'multiple register files generate'):
+            generate_strings([_CONFIG, _CONFIG])
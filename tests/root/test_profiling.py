@@ -0,0 +1,88 @@
+"""Tests for the profiling hooks."""
+
+import os
+from os.path import join as pjoin
+import json
+import tempfile
+from unittest import TestCase
+from vhdmmio import run_cli
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+from vhdmmio.vhdl import VhdlEntityGenerator
+from vhdmmio.profiling import Profiler
+from vhdmmio import profiling
+
+class TestProfiling(TestCase):
+    """Tests for the profiling hooks."""
+
+    _CFG = {
+        'metadata': {'name': 'test'},
+        'fields': [
+            {'address': 0, 'bitrange': '7..0', 'repeat': 4, 'name': 'a',
+             'behavior': 'control'},
+            {'address': 4, 'bitrange': '63..0', 'name': 'b', 'behavior': 'status'},
+        ]}
+
+    def test_api(self):
+        """test the profiling API"""
+        self.assertIsNone(profiling.active())
+        with tempfile.TemporaryDirectory() as tempdir:
+            with Profiler() as profiler:
+                self.assertIs(profiling.active(), profiler)
+                regfile = RegisterFile(RegisterFileConfig.load(self._CFG), trusted=True)
+                VhdlEntityGenerator(regfile).generate(tempdir)
+            self.assertIsNone(profiling.active())
+        report = profiler.report()
+        phases = {(entry['phase'], entry['regfile']) for entry in report['phases']}
+        for phase in ('load', 'elaborate', 'vhdl', 'decoder', 'vhdl-write'):
+            self.assertIn((phase, 'test'), phases)
+        for entry in report['phases']:
+            self.assertEqual(entry['calls'], 1)
+            self.assertGreaterEqual(entry['wall_time'], 0.0)
+            self.assertGreater(entry['peak_memory'], 0)
+        counts, = report['counts']
+        self.assertEqual(counts['regfile'], 'test')
+        self.assertEqual(counts['counts']['fields'], 5)
+        self.assertEqual(counts['counts']['blocks'], 3)
+        self.assertEqual(counts['counts']['template expansions'], 2)
+        self.assertIn('test           elaborate', profiler.summary())
+        self.assertIn('test: 3 blocks', profiler.summary())
+
+        # Nothing is recorded without an active profiler.
+        with profiling.phase('x') as phase:
+            phase.regfile = 'y'
+        profiling.count('z')
+
+    def test_nesting(self):
+        """test nested profiling phases"""
+        with Profiler(trace_memory=False) as profiler:
+            with profiling.phase('outer', 'a'):
+                with profiling.phase('inner'):
+                    profiling.count('things', 2)
+        report = profiler.report()
+        self.assertEqual(
+            sorted((entry['phase'], entry['regfile']) for entry in report['phases']),
+            [('inner', 'a'), ('outer', 'a')])
+        self.assertIsNone(report['peak_memory'])
+        self.assertEqual(report['counts'], [{'regfile': 'a', 'counts': {'things': 2}}])
+
+        merged = Profiler()
+        merged.merge(report)
+        merged.merge(report)
+        self.assertEqual(merged.report()['counts'][0]['counts']['things'], 4)
+
+    def test_cli(self):
+        """test the --profile command line option"""
+        with tempfile.TemporaryDirectory() as base:
+            with open(pjoin(base, 'test.mmio.yaml'), 'w') as fil:
+                fil.write('metadata:\n  name: test\nfields:\n'
+                          '  - address: 0\n    name: a\n    behavior: control\n')
+            cwd = os.getcwd()
+            try:
+                os.chdir(base)
+                self.assertEqual(run_cli(['-V', '--profile']), 0)
+                with open('vhdmmio-profile.json', 'r') as fil:
+                    report = json.load(fil)
+            finally:
+                os.chdir(cwd)
+        self.assertIn('elaborate', {entry['phase'] for entry in report['phases']})
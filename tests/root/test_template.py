@@ -5,6 +5,7 @@ import os
 import tempfile
 
 from vhdmmio.template import TemplateEngine, TemplateSyntaxError, annotate_block
+from vhdmmio.template import CompiledTemplate, compile_template
 
 class TestTemplateEngine(TestCase):
     """Unit-tests for vhdmmio.template."""
@@ -210,6 +211,83 @@ class TestTemplateEngine(TestCase):
                 '$endif',
             ])
 
+    def test_compiled(self):
+        """test compiled templates"""
+        template = '\n'.join([
+            '$if a',
+            '  |$a + 1$',
+            '$else',
+            '  |$syntax error$',
+            '$endif',
+        ])
+        compiled = compile_template(template)
+        self.assertIsInstance(compiled, CompiledTemplate)
+        self.assertEqual(
+            compile_template(template.split('\n')).directives, compiled.directives)
+
+        # Template strings may be generated, so they are not cached.
+        self.assertIsNot(compile_template(template), compiled)
+
+        engine = TemplateEngine()
+        for value in range(1, 4):
+            engine['a'] = value
+            self.assertEqual(engine.apply_str_to_str(compiled), '%d\n' % (value + 1))
+            self.assertEqual(engine.apply_str_to_str(template), '%d\n' % (value + 1))
+
+        # Syntax errors should only be reported when the expression is
+        # actually evaluated.
+        engine['a'] = 0
+        with self.assertRaisesRegex(
+                TemplateSyntaxError,
+                r"on <unknown> line 4: error in inline expression: invalid syntax"):
+            engine.apply_str_to_str(compiled)
+
+    def test_file_caching(self):
+        """test caching of compiled template files"""
+        engine = TemplateEngine()
+        engine['a'] = 1
+        with tempfile.TemporaryDirectory() as base:
+            template_filename = base + os.sep + 'template'
+            with open(template_filename, 'w') as template_file:
+                template_file.write('$a$')
+            self.assertEqual(engine.apply_file_to_str(template_filename), '1\n')
+            compiled = engine._load_template_file(template_filename) #pylint: disable=W0212
+            self.assertIs(engine._load_template_file(template_filename), compiled) #pylint: disable=W0212
+
+            # Modifying the file must invalidate the cache entry.
+            with open(template_filename, 'w') as template_file:
+                template_file.write('$a + 1$')
+            stat = os.stat(template_filename)
+            os.utime(template_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(engine.apply_file_to_str(template_filename), '2\n')
+
+    def test_memoization(self):
+        """test memoization of pure template expressions"""
+        evaluations = []
+
+        class Counted:
+            """Object that counts how often its property is evaluated."""
+            @property
+            def value(self):
+                """Counted property."""
+                evaluations.append('value')
+                return 'v'
+
+        def func():
+            evaluations.append('func')
+            return 'f'
+
+        engine = TemplateEngine()
+        engine['a'] = Counted()
+        engine['func'] = func
+        template = '$a.value$ $func()$\n$if a.value\n$a.value$ $func()$\n$endif'
+        self.assertEqual(engine.apply_str_to_str(template), 'v f\nv f\n')
+        self.assertEqual(sorted(evaluations), ['func', 'func', 'value'])
+
+        # Memoized results must not carry over to the next application.
+        self.assertEqual(engine.apply_str_to_str(template), 'v f\nv f\n')
+        self.assertEqual(len(evaluations), 6)
+
     def test_inline(self):
         """test template inline expansion"""
         engine = TemplateEngine()
@@ -478,3 +556,41 @@ class TestTemplateEngine(TestCase):
 
             with open(output_filename, 'r') as output_file:
                 self.assertEqual(output_file.read(), 'test\n')
+
+    def test_streaming(self):
+        """test streaming template output"""
+        engine = TemplateEngine()
+        engine['a'] = 3
+        engine.append_block('BLOCK', '@ Comment that is long enough to be wrapped '
+                            'over multiple lines by the template engine.')
+        engine.append_block('BLOCK', 'x <= $a$;@y <= $a$;')
+        template = '\n'.join([
+            'begin',
+            '$ BLOCK',
+            'end',
+            '',
+            '',
+        ])
+        expected = engine.apply_str_to_str(template, wrap=30)
+        self.assertEqual(
+            '\n'.join(engine.apply_str_to_lines(template, wrap=30)) + '\n',
+            expected)
+        self.assertEqual(list(engine.apply_str_to_lines('')), [''])
+
+        with tempfile.TemporaryDirectory() as base:
+            output_filename = base + os.sep + 'output'
+
+            self.assertTrue(engine.apply_str_to_file(
+                template, output_filename, wrap=30, stream=True))
+            with open(output_filename, 'r') as output_file:
+                self.assertEqual(output_file.read(), expected)
+            self.assertFalse(engine.apply_str_to_file(
+                template, output_filename, wrap=30, stream=True))
+
+            with self.assertRaisesRegex(
+                    TemplateSyntaxError,
+                    r"on <unknown> line 1: \$if without \$endif"):
+                engine.apply_str_to_file('$if True\nchanged', output_filename, stream=True)
+            with open(output_filename, 'r') as output_file:
+                self.assertEqual(output_file.read(), expected)
+            self.assertEqual(os.listdir(base), ['output'])
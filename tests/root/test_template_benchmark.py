@@ -0,0 +1,43 @@
+"""Benchmark for the directive processing of vhdmmio.template."""
+
+from unittest import TestCase
+import logging
+import time
+
+from vhdmmio.template import TemplateEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+class TestTemplateBenchmark(TestCase):
+    """Benchmark for the directive processing of vhdmmio.template."""
+
+    @staticmethod
+    def _expand(num_lines):
+        """Expands a synthetic block of `num_lines` lines, each containing an
+        inline expression within a conditional section, similar to the field
+        logic blocks of large register files. Returns the runtime of the
+        expansion in seconds and the output."""
+        engine = TemplateEngine()
+        engine['value'] = "'1'"
+        engine.append_block('FIELD_LOGIC', '\n'.join(
+            '$if True\nsig_%d <= $value$;\n$endif' % index
+            for index in range(num_lines)))
+        start = time.perf_counter()
+        output = engine.apply_str_to_str(
+            'begin\n$ FIELD_LOGIC\nend', postprocess=False)
+        return time.perf_counter() - start, output
+
+    def test_block_expansion(self):
+        """benchmark expansion of a 100k-line block"""
+        small_runtime, _ = self._expand(10000)
+        runtime, output = self._expand(100000)
+        self.assertEqual(len([line for line in output.split('\n') if line]), 100002)
+        self.assertIn("  sig_99999 <= '1';", output)
+        _LOGGER.info(
+            'expanded 10k lines in %.3f s, 100k lines in %.3f s',
+            small_runtime, runtime)
+
+        # Processing time should be linear in the size of the output, so
+        # expanding ten times as many lines should take about ten times as
+        # long. Allow for a lot of slack to account for noise.
+        self.assertLess(runtime, small_runtime * 30)
@@ -0,0 +1,335 @@
+"""Unit tests for the Python register file model."""
+
+from unittest import TestCase
+import time
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+from vhdmmio.sim import RegisterFileModel
+
+def _model(cfg, **kwargs):
+    """Constructs a register file model from the given configuration
+    dictionary."""
+    return RegisterFileModel(
+        RegisterFile(RegisterFileConfig.load(cfg), trusted=True), **kwargs)
+
+class TestRegisterFileModel(TestCase):
+    """Unit tests for the Python register file model."""
+
+    def test_primitive(self):
+        """test modeling primitive fields"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'fields': [
+                {
+                    'address': 0,
+                    'name': 'a',
+                    'behavior': 'status',
+                },
+                {
+                    'address': 4,
+                    'name': 'b',
+                    'behavior': 'control',
+                    'reset': 'generic',
+                },
+                {
+                    'address': 8,
+                    'bitrange': '63..0',
+                    'name': 'c',
+                    'behavior': 'status',
+                },
+                {
+                    'address': 16,
+                    'name': 'd',
+                    'behavior': 'latching',
+                    'bus-read': 'valid-wait',
+                    'ctrl-validate': True,
+                    'ctrl-invalidate': True,
+                },
+                {
+                    'address': 20,
+                    'name': 'e',
+                    'behavior': 'latching',
+                    'bus-read': 'valid-only',
+                    'after-bus-read': 'invalidate',
+                    'reset': 33,
+                },
+            ]}, generics={'b': 42})
+
+        model.poke('a.write_data', 33)
+        self.assertEqual(model.read(0), 33)
+        self.assertEqual(model.peek('b.data'), 42)
+        model.write(4, 0x11223344)
+        self.assertEqual(model.read(4), 0x11223344)
+        self.assertEqual(model.peek('b.data'), 0x11223344)
+        model.write(4, 0xFFFFFFFF, strb=0b0100)
+        self.assertEqual(model.read(4), 0x11FF3344)
+
+        model.poke('c.write_data', 0x1122334455667788)
+        self.assertEqual(model.read(8), 0x55667788)
+        model.poke('c.write_data', 0)
+        self.assertEqual(model.read(12), 0x11223344)
+
+        res = []
+        def result(data, resp):
+            res.append((data, resp))
+        model.async_read(result, 16)
+        model.async_read(result, 16)
+        model.clock(20)
+        self.assertEqual(res, [])
+        model.poke('d.write_data', 33)
+        model.poke('d.write_enable', 1)
+        model.poke('d.validate', 1)
+        model.clock()
+        model.poke('d.write_enable', 0)
+        model.poke('d.validate', 0)
+        model.clock()
+        self.assertEqual(res, [(33, 0), (33, 0)])
+
+        self.assertEqual(model.read(20), 33)
+        with self.assertRaisesRegex(ValueError, 'slave'):
+            model.read(20)
+        with self.assertRaisesRegex(ValueError, 'decode'):
+            model.read(24)
+        model.poke('d.invalidate', 1)
+        model.clock()
+        model.poke('d.invalidate', 0)
+        with self.assertRaisesRegex(TimeoutError, 'timeout'):
+            model.read(16, timeout=10)
+        with self.assertRaisesRegex(KeyError, 'no input signal'):
+            model.poke('a.data', 0)
+
+    def test_counter(self):
+        """test modeling counters and strobe internals"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'fields': [
+                {
+                    'address': 0,
+                    'bitrange': '3..0',
+                    'name': 'a',
+                    'behavior': 'counter',
+                    'overflow-internal': 'b',
+                    'underflow-internal': 'c',
+                },
+                {
+                    'address': 4,
+                    'bitrange': '3..0',
+                    'name': 'b',
+                    'behavior': 'internal-counter',
+                    'internal': 'b',
+                },
+                {
+                    'address': 4,
+                    'bitrange': '7..4',
+                    'name': 'c',
+                    'behavior': 'internal-counter',
+                    'internal': 'c',
+                },
+            ]})
+        model.poke('a.increment', 1)
+        model.clock(10)
+        model.poke('a.increment', 0)
+        self.assertEqual(model.read(0), 10)
+        self.assertEqual(model.read(4), 0x00)
+        model.write(0, 5)
+        self.assertEqual(model.read(0), 5)
+        model.write(0, 6)
+        self.assertEqual(model.read(0), 15)
+        self.assertEqual(model.read(4), 0x10)
+        model.poke('a.increment', 1)
+        model.clock(10)
+        model.poke('a.increment', 0)
+        self.assertEqual(model.read(0), 9)
+        self.assertEqual(model.read(4), 0x11)
+        model.write(4, 0x01)
+        self.assertEqual(model.read(4), 0x10)
+
+    def test_multi_word(self):
+        """test modeling multi-word registers"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'fields': [
+                {
+                    'address': 0,
+                    'bitrange': '63..0',
+                    'name': 'a',
+                    'behavior': 'internal-control',
+                    'internal': 'x',
+                    'endianness': 'little',
+                },
+                {
+                    'address': 8,
+                    'bitrange': '63..0',
+                    'name': 'b',
+                    'behavior': 'internal-status',
+                    'internal': 'x',
+                    'endianness': 'big',
+                },
+            ]})
+        model.write(0, 0x11223344)
+        self.assertEqual(model.read(8), 0)
+        model.write(4, 0x55667788)
+        self.assertEqual(model.read(8), 0x55667788)
+        self.assertEqual(model.read(12), 0x11223344)
+        with self.assertRaisesRegex(ValueError, 'slave'):
+            model.read(12)
+
+    def test_interrupts(self):
+        """test modeling interrupts and interrupt fields"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'interrupts': [
+                {
+                    'repeat': 4,
+                    'name': 'x',
+                },
+                {
+                    'name': 'y',
+                    'internal': 'y',
+                    'active': 'rising',
+                },
+            ],
+            'internal-io': [
+                {
+                    'direction': 'input',
+                    'internal': 'y',
+                },
+            ],
+            'fields': [
+                {
+                    'address': 0,
+                    'bitrange': 0,
+                    'repeat': 4,
+                    'name': 'x_flag',
+                    'behavior': 'interrupt-flag',
+                    'interrupt': 'x',
+                },
+                {
+                    'address': 4,
+                    'bitrange': 0,
+                    'repeat': 4,
+                    'name': 'x_enable',
+                    'behavior': 'interrupt-enable',
+                    'interrupt': 'x',
+                },
+                {
+                    'address': 8,
+                    'bitrange': 0,
+                    'name': 'y_flag',
+                    'behavior': 'volatile-interrupt-flag',
+                    'interrupt': 'y',
+                },
+            ]})
+        model.write(4, 0x5)
+        model.poke('x.request', 0xF)
+        model.clock()
+        self.assertEqual(model.read(0), 0x5)
+        self.assertEqual(model.peek('irq'), 1)
+        model.poke('x.request', 0)
+        model.write(0, 0x1)
+        self.assertEqual(model.read(0), 0x4)
+        model.write(0, 0xF)
+        model.clock()
+        self.assertEqual(model.peek('irq'), 0)
+
+        model.poke('y', 1)
+        model.clock(5)
+        self.assertEqual(model.peek('irq'), 1)
+        self.assertEqual(model.read(8), 1)
+        self.assertEqual(model.read(8), 0)
+        model.clock()
+        self.assertEqual(model.peek('irq'), 0)
+
+    def test_axi(self):
+        """test modeling deferring AXI fields"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'features': {'max-outstanding': 4},
+            'fields': [
+                {
+                    'address': '0x1---',
+                    'name': 'a',
+                    'behavior': 'axi',
+                },
+                {
+                    'address': 0,
+                    'name': 'b',
+                    'behavior': 'control',
+                },
+            ]})
+        slave = model.field('a').slave
+        model.write(0x1014, 0xDEADBEEF)
+        self.assertEqual(slave.memory, {0x14: 0xDEADBEEF})
+        self.assertEqual(model.read(0x1014), 0xDEADBEEF)
+
+        # Multiple outstanding requests; the write to the control register
+        # must wait for the deferred writes to complete.
+        slave.latency = 5
+        res = []
+        for index in range(4):
+            model.async_write(res.append, 0x1000 + index * 4, index)
+        model.async_write(lambda resp: res.append(('b', resp)), 0, 7)
+        start = model.cycle
+        model.clock(10)
+        self.assertEqual(res, [0, 0, 0, 0, ('b', 0)])
+        self.assertLess(model.cycle - start, 4 * 5)
+        self.assertEqual(model.peek('b.data'), 7)
+        self.assertEqual(model.read(0x100C), 3)
+
+    def test_unsupported(self):
+        """test register files that cannot be modeled"""
+        field = {'address': 0, 'name': 'a', 'behavior': 'control'}
+        for entity, features, option in (
+                ({'bus-protocol': 'axi4'}, {}, 'entity.bus-protocol'),
+                ({}, {'decoder-stages': 1}, 'features.decoder-stages'),
+                ({}, {'read-mux': 'registered-or-tree'}, 'features.read-mux'),
+                ({}, {'request-queue-depth': 2}, 'features.request-queue-depth')):
+            with self.assertRaisesRegex(ValueError, 'cannot be simulated: %s' % option):
+                _model({
+                    'metadata': {'name': 'test'},
+                    'entity': entity,
+                    'features': features,
+                    'fields': [field]})
+
+        with self.assertRaisesRegex(TypeError, 'no mapping exists from type CustomBehavior'):
+            _model({
+                'metadata': {'name': 'test'},
+                'fields': [{
+                    'address': 0, 'name': 'a', 'behavior': 'custom',
+                    'read': '$data$ := (others => \'0\');\n$ack$ := true;'}]})
+
+    def test_benchmark(self):
+        """benchmark bus accesses on the register file model"""
+        model = _model({
+            'metadata': {'name': 'test'},
+            'fields': [
+                {
+                    'address': 0,
+                    'repeat': 32,
+                    'field-repeat': 1,
+                    'name': 'a',
+                    'behavior': 'control',
+                },
+                {
+                    'address': 128,
+                    'repeat': 32,
+                    'field-repeat': 1,
+                    'name': 'b',
+                    'behavior': 'counter',
+                },
+            ]})
+        model.poke('b0.increment', 1)
+        start = time.perf_counter()
+        for index in range(10000):
+            model.write((index % 32) * 4, index)
+            model.read(128 + (index % 32) * 4)
+        runtime = time.perf_counter() - start
+        self.assertEqual(model.peek('a15.data'), 9999)
+        count = model.cycle - 1
+        self.assertEqual(model.read(128), count)
+
+        # The GHDL testbench needs several FIFO round trips between the Python
+        # and simulator processes for every bus access, so the model should
+        # handle thousands of accesses per second to be worthwhile. Allow for
+        # a lot of slack to account for slow machines.
+        self.assertLess(runtime, 20000 / 5000)
@@ -1,4 +1,4 @@
-"""Submodule for abstractions of AXI4-Lite busses in interactive
+"""Submodule for abstractions of AXI4(-Lite) busses in interactive
 testbenches."""
 
 from .streams import StreamSourceMock, StreamSinkMock
@@ -11,8 +11,9 @@ class AXI4LMasterMock:
         AXI4L slave. Returns an object with an object that can be used to
         control the master. The request and response records can be referred to
         in `add_body()` blocks using `<name>_req` and `<name>_resp`.
-        `bus_width` must be 32 or 64 to specify the data width of the bus."""
-        if bus_width not in [32, 64]:
+        `bus_width` must be 32, 64, 128, 256, or 512 to specify the data width
+        of the bus."""
+        if bus_width not in [32, 64, 128, 256, 512]:
             raise ValueError('unsupported bus width: %r' % bus_width)
 
         super().__init__()
@@ -131,6 +132,128 @@ class AXI4LMasterMock:
         return int(data, 2)
 
 
+class AXI4MasterMock(AXI4LMasterMock):
+    """Represents a mockup AXI4 master."""
+
+    _BURST_TYPES = {'FIXED': '00', 'INCR': '01', 'WRAP': '10'}
+
+    def __init__(self, hooks, bus_width=32): #pylint: disable=W0231
+        """Constructs a mockup AXI4 master from the given dictionary of
+        testbench signal hooks for a flattened AXI4 slave interface, keyed by
+        the AXI4 signal names (`awvalid`, `awready`, etc.). `bus_width` must be
+        32, 64, 128, 256, or 512 to specify the data width of the bus."""
+        if bus_width not in [32, 64, 128, 256, 512]:
+            raise ValueError('unsupported bus width: %r' % bus_width)
+
+        # Note that the AXI4L constructor is intentionally not called; we use
+        # existing testbench signals instead of adding our own.
+        self._testbench = hooks['awvalid'].testbench
+        self._name = None
+        self._bus_width = bus_width
+
+        self._aw = StreamSourceMock(
+            hooks['awvalid'], hooks['awready'], hooks['awid'], hooks['awaddr'],
+            hooks['awlen'], hooks['awsize'], hooks['awburst'], hooks['awprot'])
+
+        self._w = StreamSourceMock(
+            hooks['wvalid'], hooks['wready'],
+            hooks['wdata'], hooks['wstrb'], hooks['wlast'])
+
+        self._b = StreamSinkMock(
+            hooks['bvalid'], hooks['bready'], hooks['bid'], hooks['bresp'])
+
+        self._ar = StreamSourceMock(
+            hooks['arvalid'], hooks['arready'], hooks['arid'], hooks['araddr'],
+            hooks['arlen'], hooks['arsize'], hooks['arburst'], hooks['arprot'])
+
+        self._r = StreamSinkMock(
+            hooks['rvalid'], hooks['rready'], hooks['rid'],
+            hooks['rdata'], hooks['rresp'], hooks['rlast'])
+
+        self.interrupt = hooks['uirq']
+
+    def _size(self):
+        """Returns the `awsize`/`arsize` value for full-width beats."""
+        return (self._bus_width // 8).bit_length() - 1
+
+    def async_burst_write(self, callback, addr, data, burst='INCR', strb='1',
+                          prot='0', ident=0):
+        """Performs an asynchronous burst write of the words in the `data`
+        list, which calls `callback(ident, resp)` when done. `burst` must be
+        `'FIXED'`, `'INCR'`, or `'WRAP'`."""
+        self._aw.send(
+            ident, addr, len(data) - 1, self._size(),
+            self._BURST_TYPES[burst], prot)
+        for index, word in enumerate(data):
+            self._w.send(word, strb, int(index == len(data) - 1))
+        self._b.handle(callback)
+
+    def async_burst_read(self, callback, addr, count, burst='INCR', prot='0',
+                         ident=0):
+        """Performs an asynchronous burst read of `count` words, which calls
+        `callback(ident, data, resp, last)` for each beat. `burst` must be
+        `'FIXED'`, `'INCR'`, or `'WRAP'`."""
+        self._ar.send(
+            ident, addr, count - 1, self._size(),
+            self._BURST_TYPES[burst], prot)
+        remain = [count]
+        def handler(*args):
+            callback(*args)
+            remain[0] -= 1
+            return remain[0] > 0
+        self._r.handle(handler)
+
+    def async_write(self, callback, addr, data, strb='1', prot='0'):
+        """Performs an asynchronous single-beat write, which calls
+        `callback(resp)` when done."""
+        self.async_burst_write(
+            lambda _, resp: callback(resp), addr, [data], 'INCR', strb, prot)
+
+    def async_read(self, callback, addr, prot='0'):
+        """Performs an asynchronous single-beat read, which calls
+        `callback(data, resp)` when done."""
+        self.async_burst_read(
+            lambda _, data, resp, __: callback(data, resp), addr, 1, 'INCR', prot)
+
+    def burst_write(self, addr, data, burst='INCR', strb='1', prot='0',
+                    ident=0, timeout=1000):
+        """Performs a burst write of the words in the `data` list. A
+        `ValueError` is raised when the response is nonzero or has the wrong
+        ID. A `TimeoutError` is raised when no response was received within the
+        given timeout."""
+        result = []
+        def handler(bid, resp):
+            result.append((int(bid), resp.to_x01()))
+        self.async_burst_write(handler, addr, data, burst, strb, prot, ident)
+        self._b.wait(timeout)
+        if result[0][0] != ident:
+            raise ValueError('wrong response ID: %d' % result[0][0])
+        self._check_resp(result[0][1])
+
+    def burst_read(self, addr, count, burst='INCR', prot='0', ident=0,
+                   timeout=1000):
+        """Performs a burst read of `count` words, returned as a list of
+        integers. A `ValueError` is raised when any response is nonzero, has
+        the wrong ID, or has the last flag set incorrectly. A `TimeoutError`
+        is raised when the burst did not complete within the given timeout."""
+        result = []
+        def handler(rid, data, resp, last):
+            result.append((int(rid), data.to_x01(), resp.to_x01(), int(last)))
+        self.async_burst_read(handler, addr, count, burst, prot, ident)
+        self._r.wait(timeout)
+        values = []
+        for index, (rid, data, resp, last) in enumerate(result):
+            if rid != ident:
+                raise ValueError('wrong response ID: %d' % rid)
+            if last != int(index == count - 1):
+                raise ValueError('incorrect last flag for beat %d' % index)
+            self._check_resp(resp)
+            if 'X' in data:
+                raise ValueError('result is undefined: %s' % data)
+            values.append(int(data, 2))
+        return values
+
+
 class AXI4LSlaveMock:
     """Represents a mockup AXI4L slave."""
 
@@ -139,9 +262,9 @@ class AXI4LSlaveMock:
         AXI4L master in the UUT. Returns an object with an object that can be
         used to control the slave. The request and response records can be
         referred to in `add_body()` blocks using `<name>_req` and
-        `<name>_resp`. `bus_width` must be 32 or 64 to specify the data width
-        of the bus."""
-        if bus_width not in [32, 64]:
+        `<name>_resp`. `bus_width` must be 32, 64, 128, 256, or 512 to specify
+        the data width of the bus."""
+        if bus_width not in [32, 64, 128, 256, 512]:
             raise ValueError('unsupported bus width: %r' % bus_width)
 
         super().__init__()
@@ -221,10 +344,7 @@ class AXI4LSlaveMock:
 
     def handle_write_default(self, addr, _, data, strb):
         """Default write handler."""
-        if self._bus_width == 32:
-            addr = addr[:-2]
-        else:
-            addr = addr[:-3]
+        addr = addr[:-(self._bus_width.bit_length() - 4)]
         if 'X' in addr:
             raise ValueError('AXI slave mock %s found X in write address' % self._name)
         addr = int(addr, 2)
@@ -258,10 +378,7 @@ class AXI4LSlaveMock:
 
     def handle_read_default(self, addr, _):
         """Default read handler."""
-        if self._bus_width == 32:
-            addr = addr[:-2]
-        else:
-            addr = addr[:-3]
+        addr = addr[:-(self._bus_width.bit_length() - 4)]
         if 'X' in addr:
             raise ValueError('AXI slave mock %s found X in read address' % self._name)
         addr = int(addr, 2)
@@ -276,10 +393,7 @@ class AXI4LSlaveMock:
         """Writes to the mockup internal memory. Writing the special values
         `'decode'` or `'error'` cause respectively a decode or slave error to
         be returned when the address is accessed."""
-        if self._bus_width == 32:
-            addr >>= 2
-        else:
-            addr >>= 3
+        addr >>= self._bus_width.bit_length() - 4
         self._memory[addr] = value
 
     def read_bits(self, addr):
@@ -287,10 +401,7 @@ class AXI4LSlaveMock:
         if the value has never been written, the special code `'decode'` when
         the address is emulating a decode error, or the special code `'error'`
         when the address is emulating a slave error."""
-        if self._bus_width == 32:
-            addr >>= 2
-        else:
-            addr >>= 3
+        addr >>= self._bus_width.bit_length() - 4
         return self._memory.get(addr, None)
 
     def read(self, addr):
@@ -0,0 +1,135 @@
+"""Submodule for running testbenches with GHDL on top of a persistent,
+precompiled work library containing the VHDL sources that are common to all
+testbenches, such that only the per-test sources need to be analyzed."""
+
+import os
+import sys
+import shutil
+import hashlib
+import subprocess
+import tempfile
+import functools
+import vhdeps.vhdl
+
+_CACHE_DIR = os.environ.get(
+    'VHDMMIO_GHDL_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'vhdmmio', 'ghdl'))
+
+_GHDL_FLAGS = ('-g', '--std=08', '--ieee=synopsys')
+
+
+@functools.lru_cache(maxsize=None)
+def _ghdl_version():
+    """Returns the version string reported by GHDL, which is part of the key
+    for the library cache."""
+    return subprocess.run(
+        ['ghdl', '--version'], stdout=subprocess.PIPE, check=True).stdout
+
+
+def _analyze(workdir, fname, lib):
+    """Analyzes the given VHDL file into library `lib` in `workdir`."""
+    subprocess.run(
+        ['ghdl', '-a', *_GHDL_FLAGS, '--workdir=%s' % workdir, '--work=%s' % lib, fname],
+        cwd=workdir, check=True)
+
+
+def precompile(vhds):
+    """Analyzes the given `vhdeps.vhdl.VhdFile`s, specified in compile order,
+    into GHDL libraries in the cache directory, unless this has already been
+    done for files with the same names, libraries and contents. Returns the
+    path to the library directory. The source files are copied into the
+    library directory and analyzed using relative paths, since GHDL may need
+    them again during elaboration."""
+    digest = hashlib.sha256()
+    digest.update(_ghdl_version())
+    digest.update(' '.join(_GHDL_FLAGS).encode())
+    for vhd in vhds:
+        digest.update(vhd.lib.encode() + b'\0')
+        digest.update(os.path.basename(vhd.fname).encode() + b'\0')
+        with open(vhd.fname, 'rb') as fil:
+            digest.update(fil.read())
+        digest.update(b'\0')
+    libdir = os.path.join(_CACHE_DIR, digest.hexdigest()[:16])
+    if os.path.isdir(libdir):
+        return libdir
+
+    # Build the library in a temporary directory and move it into place
+    # atomically, such that concurrent test processes never observe a partial
+    # library.
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    tempdir = tempfile.mkdtemp(prefix='tmp-', dir=_CACHE_DIR)
+    try:
+        for vhd in vhds:
+            fname = os.path.basename(vhd.fname)
+            shutil.copyfile(vhd.fname, os.path.join(tempdir, fname))
+            _analyze(tempdir, fname, vhd.lib)
+        os.rename(tempdir, libdir)
+    except OSError:
+        # Another process beat us to it.
+        if not os.path.isdir(libdir):
+            raise
+    finally:
+        if os.path.isdir(tempdir):
+            shutil.rmtree(tempdir)
+    return libdir
+
+
+def _simulate(workdir, top, lib, timeout):
+    """Runs the elaborated toplevel entity `top` from library `lib` with the
+    given simulation timeout, forwarding GHDL's output to stdout. Returns 0 if
+    the simulation passed, 1 if it timed out, or 2 if it failed, like vhdeps
+    does."""
+    with subprocess.Popen(
+            ['ghdl', '-r', *_GHDL_FLAGS, '--workdir=%s' % workdir, '--work=%s' % lib,
+             top, '--stop-time=%s' % timeout.replace(' ', '')],
+            cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            universal_newlines=True) as process:
+        timed_out = False
+        for line in process.stdout:
+            sys.stdout.write(line)
+            if 'simulation stopped by --stop-time' in line:
+                timed_out = True
+    if timed_out:
+        return 1
+    if process.returncode != 0:
+        return 2
+    return 0
+
+
+def run(top, includes, precompiled):
+    """Runs the toplevel entity `top` with GHDL. `includes` is the list of
+    files and directories to analyze for the simulation; `precompiled` is the
+    list of files that are common to many simulations, which are analyzed only
+    once into a cached library. The simulation timeout is taken from the
+    `simulation timeout` pragma of the toplevel file. Returns the exit code of
+    the simulation, using the same codes as vhdeps: 0 for pass, 1 for timeout,
+    2 for analysis or simulation failure, and 3 for elaboration failure."""
+    vhd_list = vhdeps.vhdl.VhdList()
+    for include in list(includes) + list(precompiled):
+        if os.path.isdir(include):
+            vhd_list.add_dir(include)
+        else:
+            vhd_list.add_file(include)
+    vhd_list.determine_compile_order([top])
+    top_vhd = next(vhd for vhd in vhd_list.order if top in vhd.entity_defs)
+    precompiled = {os.path.realpath(fname) for fname in precompiled}
+    libdir = precompile([
+        vhd for vhd in vhd_list.order if os.path.realpath(vhd.fname) in precompiled])
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for fname in os.listdir(libdir):
+            shutil.copy(os.path.join(libdir, fname), workdir)
+        try:
+            for vhd in vhd_list.order:
+                if os.path.realpath(vhd.fname) not in precompiled:
+                    _analyze(workdir, vhd.fname, vhd.lib)
+        except subprocess.CalledProcessError:
+            return 2
+        try:
+            subprocess.run(
+                ['ghdl', '-e', *_GHDL_FLAGS, '--workdir=%s' % workdir,
+                 '--work=%s' % top_vhd.lib, top],
+                cwd=workdir, check=True)
+        except subprocess.CalledProcessError:
+            return 3
+        return _simulate(workdir, top, top_vhd.lib, top_vhd.get_timeout())
@@ -5,10 +5,12 @@ import re
 import os
 import sys
 import signal
+from contextlib import contextmanager
 from threading import Thread
 from tempfile import TemporaryDirectory
 import vhdeps
 from vhdmmio.template import TemplateEngine
+from . import ghdl
 
 class _Signal:
     """Representation of a logical signal inside the testbench, part of either
@@ -126,6 +128,8 @@ class _Output(_Signal):
     @property
     def val(self):
         """Returns the current value of this signal as a bitstring."""
+        if self.testbench.batching:
+            raise ValueError('cannot read outputs while batching, use expect() instead')
         if self._cache_val is None or self._cache_cycle < self.testbench.cycle:
             data = self._communicate('G%s' % self.rnge)
             if not data or data[0] != 'D' or len(data) != self.width + 1:
@@ -134,6 +138,18 @@ class _Output(_Signal):
             self._cache_cycle = self.testbench.cycle
         return self._cache_val
 
+    def expect(self, value):
+        """Checks that the signal currently has the given value, where `-`
+        bits are don't-cares. When batching, the check is queued and evaluated
+        when the batch is sent; otherwise it is evaluated immediately. Raises
+        an `AssertionError` if the value does not match."""
+        value = self.convert_value(value)
+        if self.testbench.batching:
+            self.testbench.queue_expect(self, value)
+        else:
+            with self.testbench.batch():
+                self.testbench.queue_expect(self, value)
+
     def wait(self, cycles, value=None):
         """Waits for at most `cycles` cycles for the signal to change (default)
         or to get the given `value` (if specified). Raises `TimeoutError` if
@@ -166,6 +182,16 @@ class _Output(_Signal):
         self.testbench.configure_interrupt(self.offset)
 
 
+class _Batch:
+    """Commands queued by `Testbench.batch()` that have not been sent yet."""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+        self.checks = []
+        self.cycles = 0
+
+
 class Testbench:
     """Testbench builder/runner class."""
 
@@ -178,6 +204,7 @@ class Testbench:
         self._input_bits = 0
         self._output_bits = 0
         self._includes = []
+        self._precompiled = []
         self._activity_dump = False
         self._com_debug = False
         self._gui = False
@@ -185,6 +212,7 @@ class Testbench:
         self._assigns = []
 
         # Runtime variables.
+        self._batch = None
         self._interrupts = {}
         self._in_isr = False
         self._cycle = None
@@ -268,6 +296,13 @@ class Testbench:
         self._assert_not_running()
         self._includes.append(os.path.realpath(fname))
 
+    def add_precompiled(self, fname):
+        """Adds a VHDL file that is common to many testbenches. Such files are
+        analyzed only once into a GHDL library that is cached across tests and
+        sessions, keyed on the contents of the files."""
+        self._assert_not_running()
+        self._precompiled.append(os.path.realpath(fname))
+
     def with_activity_dump(self):
         """Enables logging of communication with the testbench. Sometimes
         useful for debugging."""
@@ -310,14 +345,19 @@ class Testbench:
 
         vhdeps_died = [False]
         def run():
-            args = ['ghdl', 'runner_tc', '-i', runner]
-            if self._gui:
-                args.append('--gui')
-            for include in self._includes:
-                args.append('-i')
-                args.append(include)
-            code = vhdeps.run_cli(args)
-            vhdeps_died[0] = True
+            try:
+                if self._precompiled and not self._gui:
+                    code = ghdl.run('runner_tc', [runner] + self._includes, self._precompiled)
+                else:
+                    args = ['ghdl', 'runner_tc', '-i', runner]
+                    if self._gui:
+                        args.append('--gui')
+                    for include in self._includes + self._precompiled:
+                        args.append('-i')
+                        args.append(include)
+                    code = vhdeps.run_cli(args)
+            finally:
+                vhdeps_died[0] = True
             if code:
                 raise ValueError('vhdeps exit code was %d' % code)
 
@@ -360,12 +400,75 @@ class Testbench:
         self._assert_running()
         return self._cycle
 
+    @property
+    def batching(self):
+        """Returns whether commands are currently being queued by `batch()`
+        instead of being sent to the VHDL world immediately."""
+        return self._batch is not None and not self._in_isr
+
+    @contextmanager
+    def batch(self):
+        """Context manager that queues all input signal changes, clock
+        cycles, and `expect()` checks issued within it, and sends them to the
+        VHDL world as a single message when the context is exited. This avoids
+        the FIFO round trip per command for long sequences. Output signals
+        cannot be read while batching, and waiting for signals or resetting is
+        not supported. Interrupts are still handled while the batch executes,
+        but note that input signals always return the last queued value.
+        Raises an `AssertionError` describing all failed checks once the batch
+        completes."""
+        self._assert_running()
+        if self._batch is not None:
+            raise ValueError('already batching')
+        batch = _Batch()
+        self._batch = batch
+        try:
+            yield self
+        finally:
+            self._batch = None
+        if not batch.commands:
+            return
+        result = self._communicate('B' + ''.join(batch.commands))
+        if result[0] != 'B':
+            raise RuntimeError('communication error')
+        result = result[1:]
+        errors = []
+        for output, value, cycle in batch.checks:
+            match = result[0]
+            actual = result[1:output.width + 1]
+            result = result[output.width + 1:]
+            if len(actual) != output.width or match not in '01':
+                raise RuntimeError('communication error')
+            if match == '0':
+                errors.append('outputs(%d downto %d) is %s instead of %s in cycle %d' % (
+                    output.offset + output.width - 1, output.offset, actual, value, cycle))
+        if result:
+            raise RuntimeError('communication error')
+        if errors:
+            raise AssertionError('; '.join(errors))
+
+    def queue_expect(self, output, value):
+        """Queues a check for the given `_Output` against the given bitstring
+        within the current batch."""
+        self._batch.commands.append('A%s%s' % (output.rnge, value))
+        self._batch.checks.append((output, value, self._cycle + self._batch.cycles))
+
     def _communicate(self, command):
         """Sends `command` to the VHDL world and fetches the response. If this
         is a C response (clocked), the reported number of cycles are added to
         the cycle counter and returned as an `int`. Otherwise, the result is
         returned as string without modification. Neither the command nor the
-        result include the terminating newline."""
+        result include the terminating newline. When batching, set and clock
+        commands are queued instead, and `None` is returned."""
+        if self.batching:
+            if command[0] == 'S':
+                self._batch.commands.append(command)
+                return None
+            if command[0] == 'C':
+                self._batch.commands.append(command)
+                self._batch.cycles += int(command[1:])
+                return None
+            raise ValueError('command cannot be batched: %s' % command)
         if self._in_isr:
             if command[0] not in 'GSIX':
                 raise ValueError('invalid command in interrupt mode: %s' % command)
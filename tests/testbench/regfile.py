@@ -8,7 +8,7 @@ from vhdmmio.config import RegisterFileConfig
 from vhdmmio.core import RegisterFile
 from vhdmmio.vhdl import VhdlEntityGenerator, VhdlPackageGenerator
 from .main import Testbench
-from .axi import AXI4LMasterMock, AXI4LSlaveMock
+from .axi import AXI4LMasterMock, AXI4MasterMock, AXI4LSlaveMock
 
 
 class AttributeDict:
@@ -54,6 +54,7 @@ class RegisterFileTestbench:
         self._testbench = Testbench()
         self._testbench.add_use('use work.%s_pkg.all;' % self._regfile.name)
         self._tempdir = None
+        self._pkgdir = None
 
         decl = []
         inst = []
@@ -120,12 +121,9 @@ class RegisterFileTestbench:
                 elif subtype.name.startswith('axi4l'):
 
                     # Get width and direction.
-                    bus_width, is_cmd = {
-                        'axi4l32_m2s': (32, True),
-                        'axi4l64_m2s': (64, True),
-                        'axi4l32_s2m': (32, False),
-                        'axi4l64_s2m': (64, False),
-                    }[subtype.name]
+                    bus_width, is_cmd = subtype.name[5:].split('_')
+                    bus_width = int(bus_width)
+                    is_cmd = is_cmd == 'm2s'
 
                     # Determine if we need to mock a bus master or slave.
                     if mode == 'i':
@@ -189,6 +187,22 @@ class RegisterFileTestbench:
 
                 ports.append('.'.join(map(str, tb_path)))
 
+        # The AXI4 slave interface is always flattened, so it shows up as
+        # individual std_logic(_vector) ports. Gather them into a single AXI4
+        # master mockup, named after the bus prefix.
+        entity = self._regfile.cfg.entity
+        if entity.bus_protocol == 'axi4':
+            prefix = entity.bus_prefix
+            hooks = {}
+            for name in list(self._tb_obs):
+                if name.startswith(prefix):
+                    hooks[name[len(prefix):]] = self._tb_obs.pop(name)
+                    ports.remove(name)
+            bus_name = prefix.rstrip('_')
+            self._tb_obs[bus_name] = AXI4MasterMock(
+                hooks, self._regfile.cfg.features.bus_width)
+            ports.append(bus_name)
+
         self._ports = tuple(sorted(ports))
 
         if axi_mocks:
@@ -207,8 +221,13 @@ class RegisterFileTestbench:
     def __enter__(self):
         self._tempdir = tempfile.TemporaryDirectory()
         self._entity_generator.generate(self._tempdir.name)
-        VhdlPackageGenerator().generate(self._tempdir.name)
         self._testbench.add_include(self._tempdir.name)
+
+        # The vhdmmio package is the same for all register files, so it is
+        # generated separately and precompiled.
+        self._pkgdir = tempfile.TemporaryDirectory()
+        for fname in VhdlPackageGenerator().generate(self._pkgdir.name):
+            self._testbench.add_precompiled(fname)
         try:
             self._testbench.__enter__()
             self._testbench.reset()
@@ -216,6 +235,9 @@ class RegisterFileTestbench:
             if os.path.isdir('/tmp/vhdmmio-parse-failed'):
                 shutil.rmtree('/tmp/vhdmmio-parse-failed')
             shutil.copytree(self._tempdir.name, '/tmp/vhdmmio-parse-failed')
+            shutil.copy(
+                os.path.join(self._pkgdir.name, 'vhdmmio_pkg.gen.vhd'),
+                '/tmp/vhdmmio-parse-failed')
             print('offending VHDL source tree was written to /tmp/vhdmmio-parse-failed')
         return AttributeDict(self._tb_obs)
 
@@ -224,6 +246,9 @@ class RegisterFileTestbench:
         if self._tempdir is not None:
             self._tempdir.cleanup()
             self._tempdir = None
+        if self._pkgdir is not None:
+            self._pkgdir.cleanup()
+            self._pkgdir = None
 
     @property
     def regfile(self):
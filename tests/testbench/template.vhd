@@ -104,23 +104,28 @@ $endif
       write(data, integer'image(val));
     end procedure;
 
-    procedure send_slv(x: std_logic_vector) is
+    procedure write_slv(l: inout line; x: std_logic_vector) is
     begin
       for i in x'range loop
         case x(i) is
-          when 'U' => write(data, character'('U'));
-          when 'Z' => write(data, character'('Z'));
-          when 'L' => write(data, character'('L'));
-          when 'H' => write(data, character'('H'));
-          when 'W' => write(data, character'('W'));
-          when '0' => write(data, character'('0'));
-          when '1' => write(data, character'('1'));
-          when 'X' => write(data, character'('X'));
-          when '-' => write(data, character'('-'));
+          when 'U' => write(l, character'('U'));
+          when 'Z' => write(l, character'('Z'));
+          when 'L' => write(l, character'('L'));
+          when 'H' => write(l, character'('H'));
+          when 'W' => write(l, character'('W'));
+          when '0' => write(l, character'('0'));
+          when '1' => write(l, character'('1'));
+          when 'X' => write(l, character'('X'));
+          when '-' => write(l, character'('-'));
         end case;
       end loop;
     end procedure;
 
+    procedure send_slv(x: std_logic_vector) is
+    begin
+      write_slv(data, x);
+    end procedure;
+
     procedure send_done is
     begin
 $if com_debug
@@ -210,6 +215,69 @@ $endif
     variable xcnt       : natural;
     variable slv        : slv_ptr;
 
+    -- Handles a batch of set (S), clock (C), and expect (A) commands received
+    -- as a single message. The response contains a match flag and the actual
+    -- value for each expect command, in order.
+    procedure handle_batch is
+      variable batch  : line;
+      variable bindex : natural;
+      variable result : line;
+      variable cmd    : character;
+    begin
+      while index <= data.all'high loop
+        cmd := data.all(index);
+        index := index + 1;
+        case cmd is
+          when 'S' =>
+            hi := recv_nat;
+            lo := recv_nat;
+            assert hi >= lo severity failure;
+            assert hi < $in_bits$ severity failure;
+            inputs(hi downto lo) <= recv_slv(hi - lo + 1);
+
+          when 'C' =>
+            cnt := recv_nat;
+            for i in 1 to cnt loop
+              -- Interrupts that fire during the clock cycle use the line
+              -- buffer, so save the remainder of the batch.
+              batch := data;
+              bindex := index;
+              data := null;
+              send_clock;
+              deallocate(data);
+              data := batch;
+              index := bindex;
+            end loop;
+
+          when 'A' =>
+            hi := recv_nat;
+            lo := recv_nat;
+            assert hi >= lo severity failure;
+            assert hi < $out_bits$ severity failure;
+            slv := new std_logic_vector(hi downto lo);
+            slv.all := recv_slv(hi - lo + 1);
+            if std_match(outputs(hi downto lo), slv.all) then
+              write(result, character'('1'));
+            else
+              write(result, character'('0'));
+            end if;
+            write_slv(result, outputs(hi downto lo));
+            deallocate(slv);
+
+          when others =>
+            assert false severity failure;
+
+        end case;
+      end loop;
+      recv_done;
+      send_init('B');
+      if result /= null then
+        write(data, result.all);
+        deallocate(result);
+      end if;
+      send_done;
+    end procedure;
+
   begin
 $if com_debug
     report "open req..." severity note;
@@ -290,6 +358,7 @@ $endif
         when 'S' => handle_set;
         when 'G' => handle_get;
         when 'I' => handle_set_interrupt;
+        when 'B' => handle_batch;
 
         when 'Q' => -- quit
           recv_done;
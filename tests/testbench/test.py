@@ -13,8 +13,8 @@ class TestTestbench(TestCase):
     def test_basic(self):
         """testbench self-test: basic functionality"""
         testbench = Testbench()
-        testbench.add_include(os.path.dirname(__file__)
-                              + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
+        testbench.add_precompiled(os.path.dirname(__file__)
+                                  + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
         test_in = testbench.add_input('test_in', 8)
         test_out = testbench.add_output('test_out', 8)
         testbench.add_body('test_out <= std_logic_vector(unsigned(test_in) + 1);')
@@ -31,11 +31,42 @@ class TestTestbench(TestCase):
             self.assertEqual(test_out.val, '00100010')
             self.assertEqual(int(test_out), 34)
 
+    def test_batch(self):
+        """testbench self-test: batched commands"""
+        testbench = Testbench()
+        testbench.add_precompiled(os.path.dirname(__file__)
+                                  + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
+        test_in = testbench.add_input('test_in', 8)
+        test_out = testbench.add_output('test_out', 8)
+        test_odd = testbench.add_output('test_odd')
+        testbench.add_body('test_out <= std_logic_vector(unsigned(test_in) + 1);')
+        testbench.add_body('test_odd <= test_in(0);')
+        with testbench:
+            odd = []
+            test_odd.set_interrupt('1', lambda: odd.append(int(test_out)))
+            with testbench.batch():
+                for value in range(100):
+                    test_in.val = value
+                    testbench.clock()
+                    test_out.expect(value + 1)
+                with self.assertRaisesRegex(ValueError, 'batching'):
+                    int(test_out)
+            self.assertEqual(testbench.cycle, 100)
+            self.assertEqual(odd, [2])
+            self.assertEqual(int(test_out), 100)
+            test_out.expect('0110----')
+            with self.assertRaisesRegex(AssertionError, 'cycle 101'):
+                with testbench.batch():
+                    testbench.clock()
+                    test_out.expect(33)
+            with self.assertRaisesRegex(AssertionError, '01100100 instead of 00100001'):
+                test_out.expect(33)
+
     def test_streams(self):
         """testbench self-test: streams"""
         testbench = Testbench()
-        testbench.add_include(os.path.dirname(__file__)
-                              + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
+        testbench.add_precompiled(os.path.dirname(__file__)
+                                  + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
         test_source = StreamSourceMock(
             testbench.add_input('source_valid'),
             testbench.add_output('source_ready'),
@@ -61,8 +92,8 @@ class TestTestbench(TestCase):
     def test_axi(self):
         """testbench self-test: AXI4-lite"""
         testbench = Testbench()
-        testbench.add_include(os.path.dirname(__file__)
-                              + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
+        testbench.add_precompiled(os.path.dirname(__file__)
+                                  + '/../../vhdmmio/vhdl/vhdmmio_pkg.template.vhd')
         master = AXI4LMasterMock(testbench, 'master')
         slave = AXI4LSlaveMock(testbench, 'slave')
         testbench.add_body('slave_req <= master_req;')
@@ -0,0 +1,76 @@
+"""Unit tests for generating VHDL for regular arrays of fields."""
+
+import os
+import tempfile
+from unittest import TestCase
+from vhdmmio.config import RegisterFileConfig
+from vhdmmio.core import RegisterFile
+from vhdmmio.vhdl import VhdlEntityGenerator
+
+class TestVhdlArrays(TestCase):
+    """Unit tests for generating VHDL for regular arrays of fields."""
+
+    @staticmethod
+    def _regfile(address='0x1000', repeat=4, behavior='control', **features):
+        """Constructs a register file with an array of fields and a status
+        field. `behavior` is either the name of the behavior of the array, or
+        a dictionary with the behavior configuration keys."""
+        if not isinstance(behavior, dict):
+            behavior = {'behavior': behavior}
+        return RegisterFile(RegisterFileConfig.load({
+            'metadata': {'name': 'test'},
+            'features': features,
+            'fields': [
+                dict({'address': address, 'repeat': repeat, 'stride': 4, 'field-repeat': 1,
+                      'bitrange': '7..0', 'name': 'a'}, **behavior),
+                {'address': 0, 'name': 's', 'behavior': 'status'},
+            ]}), trusted=True)
+
+    @staticmethod
+    def _generate(regfile):
+        """Generates the VHDL entity for the given register file and returns
+        its contents."""
+        with tempfile.TemporaryDirectory() as tempdir:
+            VhdlEntityGenerator(regfile).generate(tempdir)
+            with open(os.path.join(tempdir, 'test.gen.vhd'), 'r') as fil:
+                return fil.read()
+
+    def test_array(self):
+        """test detecting regular arrays of fields"""
+        array = self._regfile().field_descriptors[0].array
+        self.assertEqual(array.base, (0x1000, 0xFFFFFFFC))
+        self.assertEqual(array.stride, 16)
+        self.assertEqual(array.count, 4)
+        self.assertEqual(array.address, (0x1000, 0xFFFFFFCC))
+
+        # The field index must map to a contiguous set of address bits that
+        # are zero for the first field.
+        self.assertIsNone(self._regfile(address='0x1010').field_descriptors[0].array)
+        self.assertIsNone(self._regfile(repeat=3).field_descriptors[0].array)
+        self.assertIsNone(self._regfile(repeat=1).field_descriptors[0].array)
+        self.assertIsNone(self._regfile().field_descriptors[1].array)
+
+    def test_generate(self):
+        """test that the VHDL output does not grow with the repeat count"""
+        small = self._generate(self._regfile(repeat=4))
+        large = self._generate(self._regfile(repeat=64))
+        self.assertIn('f_a_r((to_integer(unsigned(r_addr(5 downto 4))))).d', small)
+        self.assertIn('f_a_r((to_integer(unsigned(w_addr(9 downto 4))))).d', large)
+        self.assertLess(abs(len(large) - len(small)), 100)
+
+        # The field index is also derived from the address when the address
+        # decoder is pipelined or a read data multiplexer is used.
+        for features in ({'decoder-stages': 2}, {'read-mux': 'registered-or-tree'}):
+            small = self._generate(self._regfile(repeat=4, **features))
+            large = self._generate(self._regfile(repeat=64, **features))
+            self.assertIn('f_a_r((to_integer(unsigned(r_addr(5 downto 4))))).d', small)
+            self.assertNotIn('f_a_r((3)).d', small)
+            self.assertLess(abs(len(large) - len(small)), 100)
+
+        # Arrays of custom fields are always unrolled.
+        custom = self._generate(self._regfile(
+            repeat=4, behavior={
+                'behavior': 'custom',
+                'interfaces': [{'output': 'x:8'}],
+                'write': '$s.x$ := $data$;\n$ack$ := true;'}))
+        self.assertNotIn('to_integer(unsigned(w_addr', custom)
@@ -0,0 +1,22 @@
+"""Unit tests for generating VHDL for custom fields."""
+
+from unittest import TestCase
+from vhdmmio.api import generate_strings
+
+class TestVhdlCustom(TestCase):
+    """Unit tests for generating VHDL for custom fields."""
+
+    def test_axi4lite_interfaces(self):
+        """test custom field AXI4-lite interfaces of all widths"""
+        for width in (32, 64, 128, 256, 512):
+            package = generate_strings({
+                'metadata': {'name': 'test'},
+                'fields': [{
+                    'address': 0, 'name': 'a', 'behavior': 'custom',
+                    'interfaces': [
+                        {'input': 'req', 'type': 'axi4l-req-%d' % width},
+                        {'output': 'resp', 'type': 'axi4l-resp-%d' % width}],
+                    'read': '$data$ := (others => \'0\');\n$ack$ := true;'}],
+            }, trusted=True)['test_pkg.gen.vhd']
+            self.assertIn('req : axi4l%d_m2s_type;' % width, package)
+            self.assertIn('resp : axi4l%d_s2m_type;' % width, package)
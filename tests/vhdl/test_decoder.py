@@ -1,6 +1,8 @@
 """Unit tests for the VHDL address decoder generator."""
 
 from unittest import TestCase
+import random
+import re
 from vhdmmio.vhdl.address_decoder import AddressDecoder
 from vhdmmio.core.address import MaskedAddress
 from vhdmmio.template import TemplateEngine
@@ -11,8 +13,9 @@ class TestVhdlDecoder(TestCase):
     maxDiff = None
 
     def _test_decoder(self, addresses, match=None,
-                      optimize=False, allow_overlap=False, allow_duplicate=False):
-        dec = AddressDecoder('address', 32, optimize, allow_overlap, allow_duplicate)
+                      optimize=False, allow_overlap=False, allow_duplicate=False,
+                      minimize=False):
+        dec = AddressDecoder('address', 32, optimize, allow_overlap, allow_duplicate, minimize)
         for address in addresses:
             dec[MaskedAddress.parse_config(address)] = str(address)
         result = str(dec)
@@ -224,6 +227,250 @@ class TestVhdlDecoder(TestCase):
             'end if;',
         ])
 
+    def test_minimized(self):
+        """tests minimized address decoder construction"""
+        self._test_decoder(['4|3', '0|3'], minimize=True, match=[
+            'if address(31 downto 2) = "000000000000000000000000000000" then',
+            '  -- address = 000000000000000000000000000000--',
+            '',
+            '  0|3',
+            '',
+            'end if;',
+            '',
+            'if address(31 downto 2) = "000000000000000000000000000001" then',
+            '  -- address = 000000000000000000000000000001--',
+            '',
+            '  4|3',
+            '',
+            'end if;',
+        ])
+
+        self._test_decoder(['0|3', '4|3', '8|3', '0x40|0xF'], optimize=True, minimize=True, match=[
+            'if address(6) = \'0\' and@address(3 downto 2) = "00" then',
+            '  -- address = 000000000000000000000000000000--',
+            '',
+            '  0|3',
+            '',
+            'end if;',
+            '',
+            'if address(6) = \'0\' and@address(2) = \'1\' then',
+            '  -- address = 000000000000000000000000000001--',
+            '',
+            '  4|3',
+            '',
+            'end if;',
+            '',
+            'if address(6) = \'0\' and@address(3 downto 2) = "10" then',
+            '  -- address = 000000000000000000000000000010--',
+            '',
+            '  8|3',
+            '',
+            'end if;',
+            '',
+            'if address(6) = \'1\' then',
+            '  -- address = 0000000000000000000000000100----',
+            '',
+            '  0x40|0xF',
+            '',
+            'end if;',
+        ])
+
+        self._test_decoder(['8|3'], optimize=True, minimize=True, match=[
+            '-- address = 000000000000000000000000000010--',
+            '',
+            '8|3',
+        ])
+
+        with self.assertRaisesRegex(ValueError, 'overlap'):
+            self._test_decoder([3, '3|3'], minimize=True)
+
+    def test_minimized_random(self):
+        """tests minimized address decoder terms for random address maps"""
+        #pylint: disable=W0212
+        def matches(address, value):
+            return all(
+                char in ('-', '01'[(value >> bit) & 1])
+                for bit, char in enumerate(reversed(address)))
+
+        rand = random.Random(42)
+        for _ in range(50):
+            allow_overlap = rand.random() < 0.5
+            addresses = set()
+            while len(addresses) < rand.randint(1, 12):
+                address = ''.join(rand.choice('01-' if allow_overlap else '01') for _ in range(8))
+                if not allow_overlap:
+                    address = address[:rand.randint(4, 8)].ljust(8, '-')
+                    if any(all(a == b or '-' in (a, b) for a, b in zip(address, other))
+                           for other in addresses):
+                        continue
+                addresses.add(address)
+            dec = AddressDecoder('address', 8, optimize=True, allow_overlap=allow_overlap,
+                                 minimize=True)
+            terms = dec._minimize_addresses(list(addresses))
+            self.assertEqual(sorted(address for address, _ in terms), sorted(addresses))
+
+            # Every address must trigger exactly the actions it would trigger
+            # without minimization, and unused addresses at most one action.
+            for value in range(256):
+                expected = {address for address in addresses if matches(address, value)}
+                actual = {address for address, term in terms if matches(term, value)}
+                if expected:
+                    self.assertEqual(actual, expected)
+                else:
+                    self.assertLessEqual(len(actual), 1)
+
+    @staticmethod
+    def _evaluate(code, num_bits):
+        """Evaluates the given generated decoder for every address, assuming
+        that its actions are of the form `hit('<name>');`. Returns a list with
+        the names of the actions executed in order for each address."""
+        def expression(vhdl):
+            vhdl = re.sub(r'address\((\d+) downto (\d+)\)', r'bits(\1, \2)', vhdl)
+            vhdl = re.sub(r'address\((\d+)\)', r'bits(\1, \1)', vhdl)
+            vhdl = re.sub(r"'([01])'", r'"\1"', vhdl)
+            return vhdl.replace(' = ', ' == ').replace(' and@', ' and ')
+
+        # Translate the VHDL to Python. The stack contains the number of the
+        # case variable and whether a when branch has been opened yet for
+        # each case statement, or None for if statements.
+        lines = []
+        stack = []
+        num_cases = 0
+        depth = 0
+
+        def emit(line, body=False):
+            lines.append('  ' * depth + line)
+            if body:
+                lines.append('  ' * (depth + 1) + 'pass')
+
+        for line in code.split('\n'):
+            line = line.strip()
+            match = re.match(r'(if|elsif|case|when) (.*) (then|is|=>)(?: --.*)?$', line)
+            keyword = match.group(1) if match else line
+            if keyword == 'if':
+                emit('if %s:' % expression(match.group(2)), True)
+                stack.append(None)
+                depth += 1
+            elif keyword in ('elsif', 'else'):
+                depth -= 1
+                if keyword == 'else':
+                    emit('else:', True)
+                else:
+                    emit('elif %s:' % expression(match.group(2)), True)
+                depth += 1
+            elif keyword == 'case':
+                emit('case%d = %s' % (num_cases, expression(match.group(2))))
+                stack.append([num_cases, False])
+                num_cases += 1
+            elif keyword == 'when':
+                case = stack[-1]
+                if case[1]:
+                    depth -= 1
+                if match.group(2) == 'others':
+                    emit('else:' if case[1] else 'if True:', True)
+                else:
+                    emit('%s case%d == %s:' % (
+                        'elif' if case[1] else 'if', case[0], match.group(2)), True)
+                case[1] = True
+                depth += 1
+            elif keyword in ('end if;', 'end case;'):
+                if stack.pop() is None or keyword == 'end case;':
+                    depth -= 1
+            elif line.startswith('hit('):
+                emit(line.rstrip(';'))
+        code = compile('\n'.join(lines), '<decoder>', 'exec')
+
+        results = []
+        for value in range(1 << num_bits):
+            hits = []
+            exec(code, { #pylint: disable=W0122
+                'bits': lambda high, low, value=value: format(
+                    value >> low & ((1 << (high - low + 1)) - 1), '0%db' % (high - low + 1)),
+                'hit': hits.append})
+            results.append(hits)
+        return results
+
+    def test_minimized_overlap_order(self):
+        """tests that minimized decoders execute overlapping actions in the
+        same order as tree decoders"""
+        rand = random.Random(42)
+        for _ in range(30):
+
+            # Generate address maps of aligned blocks of different sizes,
+            # which are either nested in one another or disjoint.
+            addresses = set()
+            while len(addresses) < rand.randint(2, 8):
+                addresses.add(''.join(
+                    rand.choice('01') for _ in range(rand.randint(1, 6))).ljust(6, '-'))
+
+            results = []
+            for optimize, minimize in ((False, False), (False, True), (True, True)):
+                dec = AddressDecoder('address', 6, optimize, True, False, minimize)
+                for address in addresses:
+                    masked = MaskedAddress(
+                        int(address.replace('-', '0'), 2),
+                        int(address.replace('0', '1').replace('-', '0'), 2))
+                    dec[masked] = "hit('%s');" % address
+                results.append(self._evaluate(str(dec), 6))
+            self.assertEqual(results[1], results[0])
+
+            # With optimization, unused addresses may trigger an action, but
+            # used addresses must trigger the same actions in the same order.
+            for tree, optimized in zip(results[0], results[2]):
+                if tree:
+                    self.assertEqual(optimized, tree)
+
+    def test_pipelined(self):
+        """tests pipelined address decoder construction"""
+        dec = self._test_decoder([3, '3|3', '8|3'], allow_overlap=True)
+        self.assertEqual(dec.generate_pipelined('sel_o', 'sel_i'), (3, '\n'.join([
+            'if address(31 downto 4) = "0000000000000000000000000000" then',
+            '  case address(3 downto 2) is',
+            '    when "00" =>',
+            '      if address(1 downto 0) = "11" then',
+            '        -- address = 00000000000000000000000000000011',
+            '',
+            '        sel_o(0) := \'1\';',
+            '',
+            '      end if;',
+            '',
+            '      -- address = 000000000000000000000000000000--',
+            '',
+            '      sel_o(1) := \'1\';',
+            '',
+            '    when "10" =>',
+            '      -- address = 000000000000000000000000000010--',
+            '',
+            '      sel_o(2) := \'1\';',
+            '',
+            '    when others =>',
+            '      null;',
+            '  end case;',
+            'end if;',
+        ]), '\n'.join([
+            'if sel_i(0) = \'1\' then',
+            '  -- address = 00000000000000000000000000000011',
+            '',
+            '  3',
+            '',
+            'end if;',
+            '',
+            'if sel_i(1) = \'1\' then',
+            '  -- address = 000000000000000000000000000000--',
+            '',
+            '  3|3',
+            '',
+            'end if;',
+            '',
+            'if sel_i(2) = \'1\' then',
+            '  -- address = 000000000000000000000000000010--',
+            '',
+            '  8|3',
+            '',
+            'end if;',
+        ])))
+        self.assertIsNone(self._test_decoder([]).generate_pipelined('sel_o', 'sel_i'))
+
     def test_template(self):
         """tests adding decoders to templates"""
         tple = TemplateEngine()
@@ -14,16 +14,334 @@
 
 """Main module for vhdmmio.
 
-Use `run_cli()` to run vhdmmio as if it was run from the command line."""
+Use `run_cli()` to run vhdmmio as if it was run from the command line, or
+`vhdmmio.api.generate_strings()` to generate its outputs in memory."""
 
 import sys
 import os
+import io
 import argparse
+import contextlib
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from vhdmmio.version import __version__
-from vhdmmio.vhdl import VhdlEntitiesGenerator, VhdlPackageGenerator
+from vhdmmio.vhdl import VhdlEntityGenerator, VhdlPackageGenerator
 from vhdmmio.html import HtmlDocumentationGenerator
+from vhdmmio.c import CHeaderGenerator
+from vhdmmio.py import PythonDriverGenerator
 from vhdmmio.config import RegisterFileConfig
 from vhdmmio.core import RegisterFile
+from vhdmmio.cache import BuildCache
+from vhdmmio.profiling import Profiler
+from vhdmmio import profiling
+
+def _vhd_key(cache, digest, args):
+    """Returns the build cache key for the VHDL outputs of a register file, or
+    `None` if there is no cache or no VHDL output was requested."""
+    if cache is None or args.vhd is None:
+        return None
+    return cache.key(
+        'vhd', digest, output_dir=args.vhd,
+        annotate=args.vhd_annotate, trusted=args.trusted)
+
+
+def _c_key(cache, digest, args):
+    """Returns the build cache key for the C header output of a register file,
+    or `None` if there is no cache or no C header output was requested."""
+    if cache is None or args.c_header is None:
+        return None
+    return cache.key('c', digest, output_dir=args.c_header, trusted=args.trusted)
+
+
+def _py_key(cache, digest, args):
+    """Returns the build cache key for the Python driver output of a register
+    file, or `None` if there is no cache or no Python driver output was
+    requested."""
+    if cache is None or args.python is None:
+        return None
+    return cache.key('py', digest, output_dir=args.python, trusted=args.trusted)
+
+
+def _html_key(cache, digests, args):
+    """Returns the build cache key for the HTML documentation, or `None` if
+    there is no cache or no HTML output was requested."""
+    if cache is None or not args.html:
+        return None
+    return cache.key('html', *digests, output_dir=args.html, trusted=args.trusted)
+
+
+def _run_single(input_file, args, cache):
+    """Loads, elaborates, and generates the VHDL files and HTML documentation
+    section for a single register file description. This is the unit of work
+    for `run_cli()` when it runs with multiple jobs. Returns a five-tuple of
+    the captured standard output, the generated HTML section (or `None` if
+    HTML generation is disabled), the error message (or `None` if there was no
+    error), the digest of the configuration (or `None` if the build cache is
+    disabled), and the list of `(key, output_files)` pairs to record in the
+    build cache. Exceptions are converted to strings here, such that they can
+    be reported by the parent process in a deterministic order."""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            cfg = RegisterFileConfig.load(input_file, cache=args.cache)
+            digest = None if cache is None else cache.digest(cfg)
+            records = []
+            vhd_key = _vhd_key(cache, digest, args)
+            vhd_up_to_date = vhd_key is not None and cache.is_up_to_date(vhd_key)
+            c_key = _c_key(cache, digest, args)
+            c_up_to_date = c_key is not None and cache.is_up_to_date(c_key)
+            py_key = _py_key(cache, digest, args)
+            py_up_to_date = py_key is not None and cache.is_up_to_date(py_key)
+            section = None
+            if (vhd_up_to_date and not args.html
+                    and (c_up_to_date or args.c_header is None)
+                    and (py_up_to_date or args.python is None)):
+                print('VHDL files for %s are up to date' % input_file)
+                if c_up_to_date:
+                    print('C header for %s is up to date' % input_file)
+                if py_up_to_date:
+                    print('Python driver for %s is up to date' % input_file)
+                return output.getvalue(), section, None, digest, records
+            register_file = RegisterFile(cfg, trusted=args.trusted)
+            if vhd_up_to_date:
+                print('VHDL files for %s are up to date' % input_file)
+            elif args.vhd is not None:
+                output_files = VhdlEntityGenerator(register_file).generate(
+                    args.vhd, annotate=args.vhd_annotate)
+                if vhd_key is not None:
+                    records.append((vhd_key, output_files))
+            if c_up_to_date:
+                print('C header for %s is up to date' % input_file)
+            elif args.c_header is not None:
+                output_files = CHeaderGenerator(register_file).generate(args.c_header)
+                if c_key is not None:
+                    records.append((c_key, output_files))
+            if py_up_to_date:
+                print('Python driver for %s is up to date' % input_file)
+            elif args.python is not None:
+                output_files = PythonDriverGenerator(register_file).generate(args.python)
+                if py_key is not None:
+                    records.append((py_key, output_files))
+            if args.html:
+                section = HtmlDocumentationGenerator([]).generate_section(register_file)
+        return output.getvalue(), section, None, digest, records
+    except Exception as exc: #pylint: disable=W0703
+        if args.stacktrace:
+            error = traceback.format_exc().rstrip()
+        else:
+            error = '%s: %s' % (str(type(exc).__name__), str(exc))
+        return output.getvalue(), None, error, None, []
+
+
+def _run_job(input_file, args, cache):
+    """Entry point for the worker processes used by `_run_parallel()`. Runs
+    `_run_single()`, profiling it if requested, and returns its result
+    extended with the profile report (or `None` if profiling is disabled)."""
+    if args.profile is None:
+        return _run_single(input_file, args, cache) + (None,)
+    with Profiler() as profiler:
+        result = _run_single(input_file, args, cache)
+    return result + (profiler.report(),)
+
+
+def _run_parallel(input_files, args, cache):
+    """Handles the register file descriptions in `input_files` using a pool of
+    `args.jobs` worker processes. Each register file is loaded, elaborated, and
+    generated independently. Output and error messages are printed in the
+    same order as the input files, regardless of the order in which the jobs
+    complete. `cache` is the `BuildCache` to use, or `None` if the build cache
+    is disabled. Returns the exit code for the process."""
+    with ProcessPoolExecutor(max_workers=args.jobs or None) as executor:
+        results = list(executor.map(
+            _run_job, input_files,
+            [args] * len(input_files), [cache] * len(input_files)))
+
+    # Merge the profiles of the worker processes.
+    profiler = profiling.active()
+    if profiler is not None:
+        for *_, report in results:
+            profiler.merge(report)
+    results = [result[:-1] for result in results]
+
+    # Report errors in input file order.
+    errors = [error for _, _, error, _, _ in results if error is not None]
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 1
+
+    # Print that the front-end is complete.
+    if not results:
+        print('Warning: no register files found!')
+    elif len(results) == 1:
+        print('Loaded 1 register file')
+    else:
+        print('Loaded %d register files' % len(results))
+
+    # Handle the VHDL package generator.
+    if args.pkg is not None:
+        VhdlPackageGenerator().generate(args.pkg)
+
+    # Print the output of the VHDL register file generators.
+    for output, _, _, _, records in results:
+        print(output, end='')
+        for key, output_files in records:
+            cache.record(key, output_files)
+
+    # Handle the HTML documentation generator.
+    if args.html:
+        html_key = _html_key(cache, [digest for _, _, _, digest, _ in results], args)
+        if html_key is not None and cache.is_up_to_date(html_key):
+            print('HTML documentation in %s is up to date' % args.html)
+        else:
+            gen = HtmlDocumentationGenerator([])
+            output_files = gen.generate(
+                args.html, sections=[section for _, section, _, _, _ in results])
+            if html_key is not None:
+                cache.record(html_key, output_files)
+
+    if cache is not None:
+        cache.save()
+
+    return 0
+
+
+def _run(args):
+    """Runs the vhdmmio CLI for the given parsed command-line arguments.
+    Returns the exit code for the process."""
+    try:
+
+        # Look for input files.
+        input_files = []
+        for input_path in args.source:
+            if os.path.isfile(input_path):
+                input_files.append(input_path)
+            elif not os.path.isdir(input_path):
+                print('Error: could not find input file/directory %s' % input_path)
+                return 1
+            for root, _, files in os.walk(input_path):
+                for name in files:
+                    if name.endswith('.mmio.yaml') or name.endswith('.mmio.json'):
+                        input_files.append(os.path.join(root, name))
+
+        # Open the build cache if requested.
+        cache = None
+        if args.cache is not None:
+            cache = BuildCache(args.cache)
+
+        # Handle the register files in parallel if requested.
+        if args.jobs != 1 and len(input_files) > 1:
+            return _run_parallel(input_files, args, cache)
+
+        # Load the input files.
+        register_files_cfgs = [
+            RegisterFileConfig.load(input_file, cache=args.cache)
+            for input_file in input_files]
+
+        # Figure out which outputs are up to date according to the build
+        # cache.
+        digests = [None] * len(register_files_cfgs)
+        if cache is not None:
+            digests = list(map(cache.digest, register_files_cfgs))
+        vhd_keys = [_vhd_key(cache, digest, args) for digest in digests]
+        vhd_up_to_date = [
+            key is not None and cache.is_up_to_date(key)
+            for key in vhd_keys]
+        c_keys = [_c_key(cache, digest, args) for digest in digests]
+        c_up_to_date = [
+            key is not None and cache.is_up_to_date(key)
+            for key in c_keys]
+        py_keys = [_py_key(cache, digest, args) for digest in digests]
+        py_up_to_date = [
+            key is not None and cache.is_up_to_date(key)
+            for key in py_keys]
+        html_key = _html_key(cache, digests, args)
+        html_up_to_date = html_key is not None and cache.is_up_to_date(html_key)
+
+        # Compile the register files. Elaboration is skipped for register
+        # files for which all requested outputs are up to date.
+        register_files = [
+            None if vhd_ok and (c_ok or args.c_header is None)
+            and (py_ok or args.python is None)
+            and (html_up_to_date or not args.html)
+            else RegisterFile(cfg, trusted=args.trusted)
+            for cfg, vhd_ok, c_ok, py_ok in zip(
+                register_files_cfgs, vhd_up_to_date, c_up_to_date, py_up_to_date)]
+
+        # Print that the front-end is complete.
+        if not register_files:
+            print('Warning: no register files found!')
+        elif len(register_files) == 1:
+            print('Loaded 1 register file')
+        else:
+            print('Loaded %d register files' % len(register_files))
+
+        # Handle the VHDL package generator.
+        if args.pkg is not None:
+            gen = VhdlPackageGenerator()
+            gen.generate(args.pkg)
+
+        # Handle the VHDL register file generator.
+        if args.vhd is not None:
+            for input_file, register_file, key, up_to_date in zip(
+                    input_files, register_files, vhd_keys, vhd_up_to_date):
+                if up_to_date:
+                    print('VHDL files for %s are up to date' % input_file)
+                    continue
+                output_files = VhdlEntityGenerator(register_file).generate(
+                    args.vhd, annotate=args.vhd_annotate)
+                if key is not None:
+                    cache.record(key, output_files)
+
+        # Handle the C header generator.
+        if args.c_header is not None:
+            for input_file, register_file, key, up_to_date in zip(
+                    input_files, register_files, c_keys, c_up_to_date):
+                if up_to_date:
+                    print('C header for %s is up to date' % input_file)
+                    continue
+                output_files = CHeaderGenerator(register_file).generate(args.c_header)
+                if key is not None:
+                    cache.record(key, output_files)
+
+        # Handle the Python driver generator.
+        if args.python is not None:
+            for input_file, register_file, key, up_to_date in zip(
+                    input_files, register_files, py_keys, py_up_to_date):
+                if up_to_date:
+                    print('Python driver for %s is up to date' % input_file)
+                    continue
+                output_files = PythonDriverGenerator(register_file).generate(args.python)
+                if key is not None:
+                    cache.record(key, output_files)
+
+        # Handle the HTML documentation generator.
+        if args.html:
+            if html_up_to_date:
+                print('HTML documentation in %s is up to date' % args.html)
+            else:
+                gen = HtmlDocumentationGenerator(register_files)
+                output_files = gen.generate(args.html)
+                if html_key is not None:
+                    cache.record(html_key, output_files)
+
+        # Save the build cache.
+        if cache is not None:
+            cache.save()
+
+        return 0
+
+    except Exception as exc: #pylint: disable=W0703
+        if args.stacktrace:
+            raise
+        print('%s: %s' % (str(type(exc).__name__), str(exc)), file=sys.stderr)
+        return 1
+
+    except KeyboardInterrupt as exc:
+        if args.stacktrace:
+            raise
+        return 1
+
 
 def run_cli(args=None):
     """Runs the vhdmmio CLI. The command-line arguments are taken from `args`
@@ -59,6 +377,19 @@ def run_cli(args=None):
         'just \'@\', so generated files are placed next to their YAML '
         'description by default.')
 
+    parser.add_argument(
+        '-c', '--c-header', metavar='dir', const='@', nargs='?',
+        help='Generate C/C++ header files with register offsets, field masks, '
+        'and static inline accessor functions. [dir] is interpreted the same '
+        'way as for --vhd, so headers are placed next to their YAML '
+        'description by default.')
+
+    parser.add_argument(
+        '--python', metavar='dir', const='@', nargs='?',
+        help='Generate Python driver modules that access the registers '
+        'through an mmap of /dev/mem, a UIO device, or a regular file. [dir] '
+        'is interpreted the same way as for --vhd.')
+
     parser.add_argument(
         '-H', '--html', metavar='dir', const='vhdmmio-doc', nargs='?',
         help='Generate HTML documentation for the register files. [dir] '
@@ -76,10 +407,38 @@ def run_cli(args=None):
         help='Annotate VHDL files with template line number information. You '
         'would only do this when you need to debug vhdmmio itself.')
 
+    parser.add_argument(
+        '-C', '--cache', metavar='dir', const='.vhdmmio-cache', nargs='?',
+        help='Use a persistent build cache stored in the given directory, '
+        'which defaults to \'./.vhdmmio-cache\'. Register files whose '
+        'normalized description, vhdmmio version, and generator options did '
+        'not change since the previous run are then skipped entirely, as long '
+        'as their previously generated files were not modified. The parsed '
+        'register file descriptions are cached there as well, such that '
+        'unmodified files need not be parsed again. Regardless of this '
+        'option, output files are only rewritten when their contents change.')
+
+    parser.add_argument(
+        '-j', '--jobs', metavar='N', type=int, default=1,
+        help='Load, elaborate, and generate the register files using N '
+        'worker processes. 0 uses one process per CPU. When more than one '
+        'job is used, the VHDL files of correct register file descriptions '
+        'may be written even if another description contains errors.')
+
     parser.add_argument(
         '--stacktrace', action='store_true',
         help='Print complete Python stack traces instead of just the message.')
 
+    parser.add_argument(
+        '--profile', metavar='file', const='vhdmmio-profile.json', nargs='?',
+        help='Record the wall time and peak memory usage of each phase of '
+        'the generation process per register file, as well as statistics such '
+        'as the number of fields, blocks, and template expansions. A summary '
+        'is printed when vhdmmio completes, and the complete report is '
+        'written to the given JSON file, which defaults to '
+        '\'vhdmmio-profile.json\'. Note that tracing memory usage slows '
+        'vhdmmio down considerably.')
+
     parser.add_argument(
         '-v', '--version', action='version', version='vhdmmio ' + __version__,
         help='Prints the current version of vhdmmio and exits.')
@@ -92,67 +451,19 @@ def run_cli(args=None):
         if not args.source:
             args.source = ['.']
 
+        if args.jobs < 0:
+            parser.error('the number of jobs cannot be negative')
+
     except SystemExit as exc:
         return exc.code
 
-    try:
-
-        # Look for input files.
-        input_files = []
-        for input_path in args.source:
-            if os.path.isfile(input_path):
-                input_files.append(input_path)
-            elif not os.path.isdir(input_path):
-                print('Error: could not find input file/directory %s' % input_path)
-                return 1
-            for root, _, files in os.walk(input_path):
-                for name in files:
-                    if name.endswith('.mmio.yaml') or name.endswith('.mmio.json'):
-                        input_files.append(os.path.join(root, name))
-
-        # Load the input files.
-        register_files_cfgs = list(map(RegisterFileConfig.load, input_files))
-
-        # Compile the register files.
-        register_files = [
-            RegisterFile(cfg, trusted=args.trusted)
-            for cfg in register_files_cfgs]
-
-        # Print that the front-end is complete.
-        if not register_files:
-            print('Warning: no register files found!')
-        elif len(register_files) == 1:
-            print('Loaded 1 register file')
-        else:
-            print('Loaded %d register files' % len(register_files))
-
-        # Handle the VHDL package generator.
-        if args.pkg is not None:
-            gen = VhdlPackageGenerator()
-            gen.generate(args.pkg)
-
-        # Handle the VHDL register file generator.
-        if args.vhd is not None:
-            gen = VhdlEntitiesGenerator(register_files)
-            gen.generate(args.vhd, annotate=args.vhd_annotate)
-
-        # Handle the HTML documentation generator.
-        if args.html:
-            gen = HtmlDocumentationGenerator(register_files)
-            gen.generate(args.html)
-
-        return 0
-
-    except Exception as exc: #pylint: disable=W0703
-        if args.stacktrace:
-            raise
-        print('%s: %s' % (str(type(exc).__name__), str(exc)), file=sys.stderr)
-        return 1
-
-    except KeyboardInterrupt as exc:
-        if args.stacktrace:
-            raise
-        return 1
+    if args.profile is None:
+        return _run(args)
+    with Profiler() as profiler:
+        code = _run(args)
+    print(profiler.summary())
+    profiler.save(args.profile)
+    return code
 
 def _init():
     if __name__ == '__main__':
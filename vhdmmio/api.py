@@ -0,0 +1,76 @@
+"""Module for generating the vhdmmio outputs in memory, for use by build
+systems that construct register file descriptions in Python. For example:
+
+    outputs = generate_strings({
+        'metadata': {'name': 'example'},
+        'fields': [{'address': 0, 'name': 'ctrl', 'behavior': 'control'}],
+    }, html=True)
+    vhdl = outputs['example.gen.vhd']
+
+Nothing is read from or written to the filesystem, except for vhdmmio's own
+templates."""
+
+from .config import RegisterFileConfig
+from .core import RegisterFile
+from .vhdl import VhdlEntityGenerator, VhdlPackageGenerator
+from .html import HtmlDocumentationGenerator
+from .c import CHeaderGenerator
+from .py import PythonDriverGenerator
+
+__all__ = ['elaborate', 'generate_strings']
+
+
+def elaborate(description, trusted=False):
+    """Returns the `RegisterFile` for the given register file description,
+    which can be a `RegisterFileConfig`, or anything that
+    `RegisterFileConfig.load()` accepts, such as a dictionary. `RegisterFile`s
+    are returned as they are. `trusted` is passed to `RegisterFile`; it must
+    be set to allow custom fields to be used."""
+    if isinstance(description, RegisterFile):
+        return description
+    if not isinstance(description, RegisterFileConfig):
+        description = RegisterFileConfig.load(description)
+    return RegisterFile(description, trusted)
+
+
+def generate_strings(descriptions, vhd=True, pkg=False, html=False,
+                     c_header=False, python=False, annotate=False, trusted=False):
+    """Generates the outputs for the given register file description, or list
+    of descriptions, in memory. The descriptions are interpreted using
+    `elaborate()`. The flags select the outputs that are generated, similar
+    to the command-line options:
+
+     - `vhd`: the VHDL entity and package for each register file;
+     - `pkg`: the common `vhdmmio_pkg.gen.vhd` VHDL package;
+     - `html`: the HTML documentation for all register files;
+     - `c_header`: a C/C++ header file for each register file;
+     - `python`: a Python driver module for each register file.
+
+    `annotate` adds template source annotations to the generated VHDL, and
+    `trusted` is passed to `elaborate()`. Returns a dictionary mapping the
+    names of the files that would be written by the command-line tool
+    (without directory) to their contents."""
+    if not isinstance(descriptions, (list, tuple)):
+        descriptions = [descriptions]
+    regfiles = [elaborate(description, trusted) for description in descriptions]
+
+    outputs = {}
+
+    def add(generated):
+        for name, contents in generated.items():
+            if name in outputs:
+                raise ValueError('multiple register files generate %s' % name)
+            outputs[name] = contents
+
+    for regfile in regfiles:
+        if vhd:
+            add(VhdlEntityGenerator(regfile).generate_strings(annotate=annotate))
+        if c_header:
+            add(CHeaderGenerator(regfile).generate_strings())
+        if python:
+            add(PythonDriverGenerator(regfile).generate_strings())
+    if pkg:
+        add(VhdlPackageGenerator.generate_strings())
+    if html:
+        add(HtmlDocumentationGenerator(regfiles).generate_strings())
+    return outputs
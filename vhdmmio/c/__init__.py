@@ -0,0 +1,207 @@
+"""Module for generating C/C++ header files for register files."""
+
+import os
+from os.path import join as pjoin
+from ..version import __version__
+from ..template import TemplateEngine
+from ..utils import expand_output_dir
+from .. import profiling
+from ..software import SoftwareRegister
+
+_MODULE_DIR = os.path.dirname(__file__)
+
+_BUS_TYPES = {32: 'uint32_t', 64: 'uint64_t'}
+
+
+def _word_type(width):
+    """Returns the smallest C integer type that can hold the given number of
+    bits, or `None` if there is no such type."""
+    if width <= 32:
+        return 'uint32_t'
+    if width <= 64:
+        return 'uint64_t'
+    return None
+
+
+def _literal(value, width):
+    """Formats an unsigned integer literal for a word of the given width."""
+    if width <= 32:
+        return '0x%08Xu' % value
+    return '0x%016Xull' % value
+
+
+class _RegisterInfo(SoftwareRegister):
+    """Information about a `LogicalRegister` derived for the C generator."""
+
+    def __init__(self, register, prefix):
+        super().__init__(register)
+        self.word_type = _word_type(self.width)
+        self.bus_type = _BUS_TYPES.get(self.bus_width, None)
+        self.prefix = prefix.upper()
+        self.macro = '%s_%s' % (self.prefix, register.mnemonic)
+        self.func = '%s_%s' % (prefix.lower(), register.mnemonic.lower())
+
+        # Accessor functions can only be generated when the logical register
+        # fits in a C integer type. Registers that map a range of addresses
+        # (for instance AXI fields) only get offset definitions.
+        self.accessible = (
+            self.word_type is not None
+            and self.bus_type is not None
+            and self.span is None)
+
+
+class CHeaderGenerator:
+    """Generator for the C/C++ header file for a single register file."""
+
+    def __init__(self, regfile):
+        """Constructs a C header generator for the given register file."""
+        super().__init__()
+        self._regfile = regfile
+        self._prefix = regfile.name
+
+        self._tple = TemplateEngine()
+        self._tple['version'] = __version__
+        self._tple['r'] = regfile
+        self._tple['brief'] = regfile.brief.replace('$', '$$')
+        self._tple['guard'] = '%s_GEN_H' % regfile.name.upper()
+
+        with profiling.phase('c-header', regfile.name):
+            for register in regfile.registers:
+                info = _RegisterInfo(register, self._prefix)
+                self._tple.append_block('DEFINES', self._generate_defines(info))
+                if info.accessible:
+                    self._tple.append_block('ACCESSORS', self._generate_accessors(info))
+
+    @staticmethod
+    def _generate_defines(info):
+        """Generates the offset, mask, shift, and width definitions for the
+        given register."""
+        register = info.register
+        lines = ['@ Register `%s`: %s' % (register.name, register.brief.replace('$', '$$'))]
+        _, conditions = register.blocks[0].doc_address()
+        if conditions:
+            lines.append('@')
+            lines.append('@ Only accessible when %s.' % ' and '.join(conditions))
+        lines.append('#define %s_OFFSET 0x%08Xu' % (info.macro, register.blocks[0].address.address))
+        if len(register.blocks) > 1:
+            for block in register.blocks:
+                lines.append('#define %s_%s_OFFSET 0x%08Xu' % (
+                    info.prefix, block.mnemonic, block.address.address))
+        if info.span is not None:
+            lines.append('#define %s_SIZE 0x%08Xu' % (info.macro, info.span))
+        for field in register.fields:
+            macro = '%s_%s' % (info.macro, field.mnemonic)
+            if info.word_type is not None:
+                lines.append('#define %s_MASK %s' % (
+                    macro, _literal(info.field_mask(field), info.width)))
+            lines.append('#define %s_SHIFT %d' % (macro, field.bitrange.low))
+            lines.append('#define %s_WIDTH %d' % (macro, field.bitrange.width))
+        return lines
+
+    @staticmethod
+    def _generate_accessors(info):
+        """Generates the static inline accessor functions for the given
+        register."""
+        register = info.register
+        word = info.word_type
+        bus = info.bus_type
+        lines = []
+
+        def ptr(block, qual='volatile'):
+            return '(%s %s *)((%s uint8_t *)base + 0x%08Xu)' % (
+                qual, bus, qual, block.address.address)
+
+        # Whole-register accessors. Multi-block registers are accessed in
+        # block order, which is what the hardware needs to guarantee
+        # atomicity.
+        if register.can_read():
+            lines.append('static inline %s %s_read(const volatile void *base) {' % (
+                word, info.func))
+            if len(register.blocks) == 1:
+                lines.append('  return *%s;' % ptr(register.blocks[0], 'const volatile'))
+            else:
+                lines.append('  %s value = 0;' % word)
+                for block in register.blocks:
+                    lines.append('  value |= (%s)*%s << %d;' % (
+                        word, ptr(block, 'const volatile'), block.offset))
+                lines.append('  return value;')
+            lines.append('}')
+            lines.append('')
+        if register.can_write():
+            lines.append('static inline void %s_write(volatile void *base, %s value) {' % (
+                info.func, word))
+            if len(register.blocks) == 1:
+                lines.append('  *%s = value;' % ptr(register.blocks[0]))
+            else:
+                for block in register.blocks:
+                    lines.append('  *%s = (%s)(value >> %d);' % (ptr(block), bus, block.offset))
+            lines.append('}')
+            lines.append('')
+
+        # Field accessors.
+        for field in register.fields:
+            macro = '%s_%s' % (info.macro, field.mnemonic)
+            func = '%s_%s' % (info.func, field.mnemonic.lower())
+            lines.append('static inline %s %s_get(%s reg) {' % (word, func, word))
+            lines.append('  return (reg & %s_MASK) >> %s_SHIFT;' % (macro, macro))
+            lines.append('}')
+            lines.append('')
+            lines.append('static inline %s %s_set(%s reg, %s value) {' % (word, func, word, word))
+            lines.append('  return (reg & ~%s_MASK) | ((value << %s_SHIFT) & %s_MASK);' % (
+                macro, macro, macro))
+            lines.append('}')
+            lines.append('')
+            if field in info.readable_fields():
+                lines.append('static inline %s %s_read(const volatile void *base) {' % (
+                    word, func))
+                lines.append('  return %s_get(%s_read(base));' % (func, info.func))
+                lines.append('}')
+                lines.append('')
+            if field in info.writable_fields():
+                keep = info.keep_mask([field])
+                if keep is None:
+                    lines.append(
+                        '@ `%s` cannot be written without side effects on other fields.'
+                        % field.name)
+                    lines.append('')
+                    continue
+                lines.append('static inline void %s_write(volatile void *base, %s value) {' % (
+                    func, word))
+                if keep:
+                    lines.append('  %s reg = %s_read(base) & %s;' % (
+                        word, info.func, _literal(keep, info.width)))
+                    lines.append('  %s_write(base, %s_set(reg, value));' % (info.func, func))
+                else:
+                    lines.append('  %s_write(base, %s_set(0, value));' % (info.func, func))
+                lines.append('}')
+                lines.append('')
+        return lines
+
+    def generate(self, output_dir):
+        """Generates the header file for this register file in the specified
+        directory. The `@` symbol in `output_dir` is expanded the same way as
+        for `VhdlEntityGenerator`. Returns the list of generated files."""
+        output_dir = expand_output_dir(output_dir, self._regfile.cfg.source_directory)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        output_file = os.path.join(output_dir, self._regfile.name + '.gen.h')
+        with profiling.phase('c-header', self._regfile.name):
+            written = self._tple.apply_file_to_file(
+                pjoin(_MODULE_DIR, 'header.template.h'),
+                output_file,
+                comment='// ')
+        if written:
+            print('Wrote %s' % output_file)
+        else:
+            print('%s is up to date' % output_file)
+        return [output_file]
+
+    def generate_strings(self):
+        """Generates the header file for this register file in memory, without
+        touching the filesystem. Returns a dictionary mapping the name of the
+        file that `generate()` would write (without directory) to its
+        contents."""
+        with profiling.phase('c-header', self._regfile.name):
+            return {self._regfile.name + '.gen.h': self._tple.apply_file_to_str(
+                pjoin(_MODULE_DIR, 'header.template.h'),
+                comment='// ')}
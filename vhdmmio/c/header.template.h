@@ -0,0 +1,30 @@
+@ Generated using vhdmmio $version$. Do not modify by hand.
+@
+@ C/C++ header file for register file `$r.name$`: $brief$
+@
+@ All offsets are byte offsets relative to the base address of the register
+@ file. The accessor functions take a pointer to this base address. They never
+@ access a register more than once per block; when only a part of a register
+@ is written, the other fields are masked out by writing zero where the field
+@ behavior allows this, or by a single read-modify-write otherwise.
+
+#ifndef $guard$
+#define $guard$
+
+#include <stdint.h>
+
+$DEFINES
+
+$if defined('ACCESSORS')
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+$ACCESSORS
+
+#ifdef __cplusplus
+}
+#endif
+
+$endif
+#endif
@@ -0,0 +1,106 @@
+"""Module for the persistent build cache used by the vhdmmio CLI to skip
+regenerating outputs for register files that did not change."""
+
+import os
+import json
+import hashlib
+from .version import __version__
+
+__all__ = ['BuildCache']
+
+
+def _hash_file(filename):
+    """Returns the SHA-256 hex digest of the contents of the given file, or
+    `None` if the file cannot be read."""
+    try:
+        with open(filename, 'rb') as fil:
+            return hashlib.sha256(fil.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class BuildCache:
+    """Persistent build cache, stored as an index file in a cache directory.
+
+    The cache maps keys to the set of files that were generated for that key,
+    along with the hashes of their contents. A key is a hash of everything the
+    generated output depends on: the normalized register file configuration,
+    the vhdmmio version, and the generator options (see `key()`). If the key
+    for a generator invocation is known and all the files recorded for it still
+    exist with the recorded contents, the invocation can be skipped
+    entirely. The cache is a plain picklable object, so it can be handed to
+    worker processes for querying; recording must happen in the parent
+    process."""
+
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, directory='.vhdmmio-cache'):
+        super().__init__()
+        self._directory = directory
+        self._index = {}
+        try:
+            with open(os.path.join(directory, self.INDEX_FILENAME), 'r', encoding='utf-8') as fil:
+                index = json.load(fil)
+            if index.get('version') == __version__:
+                self._index = index.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @property
+    def directory(self):
+        """The directory in which the cache is stored."""
+        return self._directory
+
+    @staticmethod
+    def digest(cfg):
+        """Returns a hash of the normalized form of the given
+        `RegisterFileConfig`. The source filename is included, since it ends
+        up in the generated output for custom fields."""
+        data = json.dumps([cfg.source_file, cfg.serialize()], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def key(kind, *digests, **options):
+        """Computes a cache key for the generator identified by `kind` (for
+        instance `'vhd'` or `'html'`), operating on the register file
+        configurations identified by `digests` (see `digest()`) with the
+        generator options specified through the keyword arguments. The current
+        working directory and vhdmmio version are always included in the key,
+        since relative output paths and the generated code depend on them."""
+        data = json.dumps({
+            'kind': kind,
+            'version': __version__,
+            'cwd': os.getcwd(),
+            'digests': digests,
+            'options': options,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def is_up_to_date(self, key):
+        """Returns whether the outputs recorded for the given key all still
+        exist and have the recorded contents."""
+        outputs = self._index.get(key, None)
+        if outputs is None:
+            return False
+        for filename, digest in outputs.items():
+            if _hash_file(filename) != digest:
+                return False
+        return True
+
+    def record(self, key, output_files):
+        """Records that the given list of output files was generated for the
+        given key. Any previous entries that refer to one of these files are
+        dropped, since they are no longer valid."""
+        outputs = {filename: _hash_file(filename) for filename in output_files}
+        for other_key, other_outputs in list(self._index.items()):
+            if any(filename in outputs for filename in other_outputs):
+                del self._index[other_key]
+        self._index[key] = outputs
+
+    def save(self):
+        """Writes the cache index to the cache directory."""
+        if not os.path.exists(self._directory):
+            os.makedirs(self._directory)
+        filename = os.path.join(self._directory, self.INDEX_FILENAME)
+        with open(filename, 'w', encoding='utf-8') as fil:
+            json.dump({'version': __version__, 'entries': self._index}, fil, sort_keys=True)
@@ -15,22 +15,23 @@ class Axi(Configurable):
     different AXI4L bus.
 
     The width of the outgoing AXI4L bus is set to the width of the field, which
-    must therefore be 32 or 64 bits. The *word* address for the outgoing bus is
-    taken from the [subaddress](fieldconfig.md#subaddress); the 2 or 3 LSBs of
-    the address (depending on the bus width) are always zero. For example, a
-    field with address `0x0---` in a 32-bit system has a 10-bit subaddress,
-    therefore allowing access to 4kiB of address space on the child AXI4L port.
+    must therefore be 32, 64, 128, 256, or 512 bits. The *word* address for the
+    outgoing bus is taken from the [subaddress](fieldconfig.md#subaddress); the
+    2 to 6 LSBs of the address (depending on the bus width) are always zero.
+    For example, a field with address `0x0---` in a 32-bit system has a 10-bit
+    subaddress, therefore allowing access to 4kiB of address space on the child
+    AXI4L port.
 
-    Note that going from a 64-bit bus to a 32-bit bus always "stretches" the
-    address space of the 32-bit bus, since only half the bus width can be
+    Note that going from a wider bus to a narrower bus always "stretches" the
+    address space of the narrower bus, since only part of the bus width can be
     utilized. While it would technically be possible to avoid this by just
     doing two transfers on the slave bus for each AXI field access, this adds
     a bunch of complexity, ambiguity, and may prevent read-volatile fields on
     the child bus from being accessed without side effects, so this feature was
-    not implemented. Going from a 32-bit bus to a 64-bit bus on the other hand
+    not implemented. Going from a narrower bus to a wider bus on the other hand
     is perfectly fine, since this just makes the logical register for the AXI
     field wider than the bus, following `vhdmmio`'s normal rules. Just make
-    sure that bit 2 of the field's address is zero.
+    sure that the field's address is aligned to the width of the field.
 
     `axi` fields support multiple outstanding requests. The amount of
     outstanding requests supported is controlled centrally in the register file
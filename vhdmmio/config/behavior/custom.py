@@ -113,8 +113,14 @@ class CustomInterfaceConfig(Configurable):
         yield 'boolean', 'this interface is a VHDL `boolean`.'
         yield 'axi4l-req-32', 'this interface is a 32-bit AXI4-lite request structure.'
         yield 'axi4l-req-64', 'this interface is a 64-bit AXI4-lite request structure.'
+        yield 'axi4l-req-128', 'this interface is a 128-bit AXI4-lite request structure.'
+        yield 'axi4l-req-256', 'this interface is a 256-bit AXI4-lite request structure.'
+        yield 'axi4l-req-512', 'this interface is a 512-bit AXI4-lite request structure.'
         yield 'axi4l-resp-32', 'this interface is a 32-bit AXI4-lite response structure.'
         yield 'axi4l-resp-64', 'this interface is a 64-bit AXI4-lite response structure.'
+        yield 'axi4l-resp-128', 'this interface is a 128-bit AXI4-lite response structure.'
+        yield 'axi4l-resp-256', 'this interface is a 256-bit AXI4-lite response structure.'
+        yield 'axi4l-resp-512', 'this interface is a 512-bit AXI4-lite response structure.'
 
 
 @behavior(
@@ -60,3 +60,31 @@ class EntityConfig(Configurable):
                '`vhdmmio_pkg.vhd` are used.')
         yield (True, 'the bus is flattened; the standard AXI4-lite signal '
                'names are used.')
+
+    @choice
+    def bus_protocol():
+        """This key specifies the protocol of the slave bus interface.
+        Regardless of this setting, the register file internally processes
+        requests one word at a time, as AXI4-lite transactions."""
+        yield ('axi4-lite', 'the register file has an AXI4-lite slave '
+               'interface.')
+        yield ('axi4', 'the register file has an AXI4 (full) slave interface '
+               'with support for `INCR`, `WRAP`, and `FIXED` bursts. The beats '
+               'of a burst are fed to the register logic one by one, allowing '
+               'bulk accesses to run at one beat per cycle. The write response '
+               'of a burst reports the most severe error encountered for any '
+               'of its beats. Bursts are handled one at a time per direction, '
+               'and `wlast` is ignored in favor of the burst length. Locked '
+               'and exclusive accesses are not supported, so the `awlock`, '
+               '`awcache`, `awqos`, and `awregion` signals (and their read '
+               'counterparts) are omitted. The AXI4 interface is always '
+               'flattened; in addition to the AXI4-lite signals listed for '
+               '`bus-prefix`, `awid`, `awlen`, `awsize`, `awburst`, `wlast`, '
+               '`bid`, `arid`, `arlen`, `arsize`, `arburst`, `rid`, and '
+               '`rlast` are generated.')
+
+    @choice_default(1)
+    def bus_id_width():
+        """This key specifies the width of the ID signals of the AXI4 slave
+        interface. It has no effect when `bus-protocol` is `axi4-lite`."""
+        yield (1, 32), 'the width of the AXI4 ID signals.'
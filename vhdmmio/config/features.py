@@ -11,9 +11,15 @@ class FeatureConfig(Configurable):
     @choice
     def bus_width():
         """This key specifies the width of the generated AXI4-lite slave
-        bus."""
+        bus. Using a wider bus allows wide registers, such as descriptors or
+        statistics tables, to be accessed in a single transfer, and avoids
+        the need for width converters when the register file is attached to
+        a wide interconnect."""
         yield 32, 'the bus uses 32-bit data words.'
         yield 64, 'the bus uses 64-bit data words.'
+        yield 128, 'the bus uses 128-bit data words.'
+        yield 256, 'the bus uses 256-bit data words.'
+        yield 512, 'the bus uses 512-bit data words.'
 
     @choice
     def endianness():
@@ -56,3 +62,78 @@ class FeatureConfig(Configurable):
         get its own 30-bit address comparator. Setting this flag to `yes`
         allows `vhdmmio` to assign undefined behavior to unused addresses,
         which lets it minimize the width of these comparators."""
+
+    @choice
+    def decoder():
+        """This key specifies the structure of the generated address
+        decoders. Addresses that map to a register are decoded the same way
+        regardless of this option; only the structure of the generated logic
+        differs."""
+        yield ('tree', 'the decoders are generated as a tree of nested case '
+               'and if statements, splitting the address along the bit '
+               'ranges shared by the registers.')
+        yield ('minimized', 'the decoders are generated as a flat list of '
+               'if statements, one per register, each with a minimized '
+               'address comparator. When `optimize` is set, the unused '
+               'addresses are used as a don\'t-care set to reduce each '
+               'comparator to only the address bits that are needed to '
+               'discriminate between the registers, similar to the expand '
+               'step of the Espresso logic minimizer. This generally '
+               'results in shallower decoding logic for sparse or irregular '
+               'address maps. Without `optimize`, the comparators match all '
+               'address bits.')
+
+    @choice
+    def decoder_stages():
+        """This key specifies the number of pipeline stages inserted between
+        the read and write address decoders and the field logic. When
+        pipelining is enabled, the address of an incoming request is first
+        decoded into a one-hot register select vector, which then passes
+        through the given number of register stages before the field logic
+        handles the request. This removes the address comparators from the
+        critical path of the field and response logic, which can
+        significantly improve the maximum clock frequency for register files
+        with many registers. Using more than one stage only makes sense when
+        the synthesis tool is allowed to retime the decoder logic across the
+        pipeline registers. The AXI4-lite handshakes remain correct; the
+        request is simply held in the request holding registers until it is
+        handled."""
+        yield 0, 'the address decoders are not pipelined.'
+        yield ((1, None), 'the address decoders are pipelined with this many '
+               'register stages. Each stage adds a cycle of latency to every '
+               'access, and back-to-back accesses in the same direction are '
+               'no longer handled every cycle.')
+
+    @choice
+    def read_mux():
+        """This key specifies how the read data returned to the bus is
+        selected from the read data of the addressed block."""
+        yield ('decoder', 'the read data is assigned within the read address '
+               'decoder. Depending on the synthesis tool, this may result in '
+               'a priority chain with a logic depth that grows linearly with '
+               'the number of registers.')
+        yield ('or-tree', 'each block assigns its read data to its own '
+               'holding variable, which is zero unless the block is being '
+               'read. The read data is then formed by a balanced OR reduction '
+               'tree over these variables, such that the logic depth of the '
+               'read data path is logarithmic in the number of blocks.')
+        yield ('registered-or-tree', 'as above, but the per-block read data '
+               'is registered before it enters the OR reduction tree. This '
+               'cuts the read data path in two, at the cost of a cycle of '
+               'latency for every read.')
+
+    @choice
+    def request_queue_depth():
+        """This key specifies the depth of the request queues inserted in
+        front of the AXI4-lite request holding registers. Without queues, the
+        register file can only accept a new request on a channel when the
+        previous request has been handled, which is not the case as long as
+        the master has not yet accepted the response to the previous request.
+        With queues, the master can issue further requests while earlier
+        responses are still pending, such that masters that do not wait for
+        the response before issuing the next request can sustain one
+        transaction per cycle. The requests are still handled in order.
+        This option has no effect when `bus-protocol` is set to `axi4`."""
+        yield 0, 'no request queues are generated.'
+        yield ((1, None), 'each request channel is given a queue with room '
+               'for this many requests, in addition to the holding register.')
@@ -320,7 +320,20 @@ class FieldConfig(Configurable):
         By default, the individual fields are placed in the same register,
         as if they were concatenated in LSB to MSB order. This can be
         customized using the `field-repeat`, `stride`, and `field-stride`
-        keys."""
+        keys.
+
+        The VHDL generator normally generates the bus logic for each field in
+        the array separately. However, when each field gets its own logical
+        register of a single bus word without sharing it with other fields,
+        the behavior does not defer requests, `repeat` and `stride` are powers
+        of two, and the address of the first field is aligned to the size of
+        the array, the logic is generated only
+        once, indexed by the address bits that select the field. The size of
+        the generated entity then does not depend on the repeat count. This
+        is never done for `custom` fields, since their templates may depend
+        on the field index being a constant. Note that vhdmmio itself and the
+        other generators (documentation, C header, and Python module) still
+        handle each field individually."""
         yield None, 'the descriptor describes a single field.'
         yield (1, None), 'the descriptor describes an array field of the given size.'
 
@@ -11,8 +11,23 @@ import os
 from os.path import join as pjoin
 import copy
 import json
+import pickle
+import hashlib
 import yaml
 from .loader import Loader
+from .. import profiling
+from ..version import __version__
+
+# Use the libyaml-based loader if PyYAML was built with it; it is an order of
+# magnitude faster than the pure-Python loader.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', None) or getattr(yaml, 'SafeLoader', None)
+
+
+def _load_yaml(data):
+    """Parses the given YAML string using the fastest safe loader available."""
+    if _YAML_LOADER is None:
+        return yaml.load(data)
+    return yaml.load(data, Loader=_YAML_LOADER)
 
 class Configurable:
     """Base class for objects that can be configured with/deserialized from
@@ -24,11 +39,7 @@ class Configurable:
         self._frozen = False
 
         # Save the source file and directory, if any.
-        self._source_file = source_file
-        if source_file is not None:
-            self._source_directory = os.path.dirname(source_file)
-        else:
-            self._source_directory = None
+        self._set_source_file(source_file)
 
         # Save the parent.
         self._parent = parent
@@ -57,6 +68,14 @@ class Configurable:
             if kwarg_key.replace('_', '-') in dictionary:
                 raise TypeError('unexpected keyword argument %s' % kwarg_key)
 
+    def _set_source_file(self, source_file):
+        """Sets the source file and directory of this configurable."""
+        self._source_file = source_file
+        if source_file is not None:
+            self._source_directory = os.path.dirname(source_file)
+        else:
+            self._source_directory = None
+
     @property
     def parent(self):
         """Returns the parent of this configurable. This is always another
@@ -99,7 +118,7 @@ class Configurable:
 
     # Convenience mehods for reading and writing configuration files and such.
     @classmethod
-    def load(cls, obj, parent=None):
+    def load(cls, obj, parent=None, cache=None):
         """Constructs this object from one of the following:
 
          - A YAML or JSON filename (if the file extension is `.json` JSON is
@@ -107,9 +126,25 @@ class Configurable:
          - A file-like object reading a YAML file;
          - A dictionary representation of the JSON or YAML file.
 
+        If `cache` is specified, it names a directory in which objects loaded
+        from files are cached in pickled form, keyed by the contents of the
+        file and the vhdmmio version. Loading the same file again then skips
+        parsing and validation entirely.
+
         Returns the constructed object if the input is valid."""
 
-        loader = yaml.safe_load if hasattr(yaml, 'safe_load') else yaml.load
+        with profiling.phase('load', obj if isinstance(obj, str) else None) as phase:
+            result = cls._load(obj, parent, cache)
+            metadata = getattr(result, 'metadata', None)
+            if metadata is not None:
+                phase.regfile = metadata.name
+            return result
+
+    @classmethod
+    def _load(cls, obj, parent, cache):
+        """Implementation of `load()`."""
+
+        loader = _load_yaml
 
         if isinstance(obj, dict):
             return cls(parent, copy.deepcopy(obj))
@@ -117,16 +152,72 @@ class Configurable:
         if isinstance(obj, str):
             if obj.lower().endswith('.json'):
                 loader = json.loads
-            with open(obj, 'r', encoding="utf-8") as fil:
-                return cls(
-                    parent, loader(fil.read()),
-                    source_file=obj)
+            with open(obj, 'rb') as fil:
+                data = fil.read()
+
+            # Objects with a parent refer to it, so they cannot be cached on
+            # their own.
+            cache_file = None
+            if cache is not None and parent is None:
+                cache_file = cls._cache_filename(cache, loader, data)
+                result = cls._read_cache(cache_file)
+                if result is not None:
+                    profiling.count('config cache hits')
+                    result._set_source_file(obj) #pylint: disable=W0212
+                    return result
+
+            result = cls(parent, loader(data.decode('utf-8')), source_file=obj)
+            if cache_file is not None:
+                cls._write_cache(cache_file, result)
+            return result
 
         if hasattr(obj, 'read'):
             return cls(parent, loader(obj.read()))
 
         raise TypeError('unsupported input for load() API')
 
+    @classmethod
+    def _cache_filename(cls, cache, loader, data):
+        """Returns the filename within cache directory `cache` for the object
+        of this class loaded from file contents `data` using `loader`."""
+        digest = hashlib.sha256()
+        digest.update(('%s\0%s.%s\0%s\0' % (
+            __version__, cls.__module__, cls.__qualname__,
+            'json' if loader is json.loads else 'yaml')).encode('utf-8'))
+        digest.update(data)
+        return pjoin(cache, 'configs', digest.hexdigest() + '.pickle')
+
+    @classmethod
+    def _read_cache(cls, cache_file):
+        """Returns the object cached in the given file, or `None` if the file
+        does not exist or is not usable."""
+        try:
+            with open(cache_file, 'rb') as fil:
+                result = pickle.load(fil)
+        except Exception: #pylint: disable=W0703
+            return None
+        if not isinstance(result, cls):
+            return None
+        return result
+
+    @staticmethod
+    def _write_cache(cache_file, result):
+        """Writes the given object to the given cache file. The file is
+        replaced atomically, since other processes may be loading the same
+        file concurrently. Failures are ignored, since the cache is merely an
+        optimization."""
+        temp_file = '%s.%d.tmp' % (cache_file, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(temp_file, 'wb') as fil:
+                pickle.dump(result, fil, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
     def save(self, obj=None):
         """Serializes this object in one of the following ways:
 
@@ -2,9 +2,76 @@
 create/configure hierarchical object structures in various ways."""
 
 import copy
+from collections.abc import MutableMapping
 from .loader import Loader
 from .utils import ParseError
 
+
+class _PrototypeDict(MutableMapping):
+    """Copy-on-write dictionary formed by updating `prototype` with `entries`,
+    as used for flattening prototype trees in `ListConfig`. `entries` is owned
+    by this object, but `prototype` is never mutated, so it can be shared by
+    all its children. Removing a key only hides it, and looking up a key that
+    comes from the prototype stores a private deep copy of its value in
+    `entries` if the value is mutable. Thus, only the values that the loaders
+    actually take are copied. Prototypes may themselves be `_PrototypeDict`s,
+    which are then read without copying anything."""
+
+    def __init__(self, prototype, entries):
+        super().__init__()
+        self._prototype = prototype
+        self._entries = entries
+        self._removed = set()
+
+    def _lookup(self, key):
+        """Returns the value for `key` without copying it, or raises
+        `KeyError` if there is no such key."""
+        if key in self._entries:
+            return self._entries[key]
+        if key in self._removed:
+            raise KeyError(key)
+        if isinstance(self._prototype, _PrototypeDict):
+            return self._prototype._lookup(key) #pylint: disable=W0212
+        return self._prototype[key]
+
+    def __getitem__(self, key):
+        if key in self._entries:
+            return self._entries[key]
+        value = self._lookup(key)
+        if isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+            self._entries[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries[key] = value
+        self._removed.discard(key)
+
+    def __delitem__(self, key):
+        if key in self._entries:
+            del self._entries[key]
+        elif key in self._removed or key not in self._prototype:
+            raise KeyError(key)
+        self._removed.add(key)
+
+    def __contains__(self, key):
+        if key in self._entries:
+            return True
+        return key not in self._removed and key in self._prototype
+
+    def __iter__(self):
+        # Iterate in the same order as `dict.update()` would.
+        for key in self._prototype:
+            if key not in self._removed:
+                yield key
+        for key in self._entries:
+            if key not in self._prototype:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
 class ListConfig(Loader):
     """Loader for lists of `Configurable`s. This loader takes a single key from
     its configuration dictionary, which must be a list of dictionaries. These
@@ -103,10 +170,8 @@ class ListConfig(Loader):
                     ParseError.invalid('', config_list, [])
 
                 # Merge the dictionary with the prototype, if there is one.
-                if prototype:
-                    updated_prototype = copy.deepcopy(prototype)
-                    updated_prototype.update(subdict)
-                    subdict = updated_prototype
+                if prototype is not None:
+                    subdict = _PrototypeDict(prototype, subdict)
 
                 # Handle the next level of prototypes, if there is one.
                 if self.subkey is not None and self.subkey in subdict:
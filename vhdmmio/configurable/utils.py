@@ -12,6 +12,10 @@ class _UnsetType:
 
     __repr__ = __str__
 
+    def __reduce__(self):
+        # Unpickle to the singleton, such that `is Unset` checks still work.
+        return 'Unset'
+
 Unset = _UnsetType() #pylint: disable=C0103
 
 
@@ -343,16 +343,153 @@ class AddressConflictError(ValueError):
         self.address_b = address_b
 
 
+class _TrieNode:
+    """Node of an `_AddressTrie`. `children` holds the subtries for a zero,
+    one, and don't-care bit respectively, or is `None` if there are none yet.
+    `terminal` is set when an address ends at this node (i.e. all remaining
+    bits are don't-care), and `count` records the number of addresses stored
+    in the subtrie rooted here. Subtries that store only a single address are
+    not expanded; instead, `tail` holds the address."""
+
+    __slots__ = ('children', 'terminal', 'count', 'tail')
+
+    def __init__(self, tail=None):
+        super().__init__()
+        self.children = None
+        self.terminal = False
+        self.count = 0 if tail is None else 1
+        self.tail = tail
+
+
+class _AddressTrie:
+    """Ternary (0/1/don't-care) trie of `MaskedAddress`es, indexed LSB first.
+    Allows address conflicts to be detected in time proportional to the
+    address width for typical address maps, instead of in time proportional
+    to the number of addresses in the map. Paths that lead to only a single
+    address are compressed, so the memory usage is proportional to the number
+    of addresses rather than to the number of addresses times their width."""
+
+    _DONT_CARE = 2
+
+    def __init__(self):
+        super().__init__()
+        self._root = _TrieNode()
+
+    @classmethod
+    def _index(cls, address, bit):
+        """Returns the child index for the given bit of the given address."""
+        if (address.mask >> bit) & 1:
+            return (address.address >> bit) & 1
+        return cls._DONT_CARE
+
+    def _expand(self, node, bit):
+        """Expands the single address stored in the `tail` of the given node at
+        the given bit index by one level."""
+        tail = node.tail
+        node.tail = None
+        if bit == tail.mask.bit_length():
+            node.terminal = True
+            return
+        if node.children is None:
+            node.children = [None, None, None]
+        node.children[self._index(tail, bit)] = _TrieNode(tail)
+
+    def add(self, address):
+        """Adds the given `MaskedAddress` to the trie. The caller must ensure
+        that the address does not conflict with any address already in the
+        trie."""
+        node = self._root
+        if not node.count:
+            self._root = _TrieNode(address)
+            return
+        width = address.mask.bit_length()
+        bit = 0
+        while True:
+            if node.tail is not None:
+                self._expand(node, bit)
+            node.count += 1
+            if bit == width:
+                node.terminal = True
+                return
+            index = self._index(address, bit)
+            if node.children is None:
+                node.children = [None, None, None]
+            child = node.children[index]
+            if child is None:
+                node.children[index] = _TrieNode(address)
+                return
+            node = child
+            bit += 1
+
+    def remove(self, address):
+        """Removes the given `MaskedAddress` from the trie, pruning empty
+        subtries. The address must have been added previously."""
+        node = self._root
+        node.count -= 1
+        if not node.count:
+            self._root = _TrieNode()
+            return
+        width = address.mask.bit_length()
+        bit = 0
+        while True:
+            if bit == width:
+                node.terminal = False
+                return
+            index = self._index(address, bit)
+            child = node.children[index]
+            child.count -= 1
+            if not child.count:
+                node.children[index] = None
+                return
+            node = child
+            bit += 1
+
+    def conflicts(self, address):
+        """Returns whether the given `MaskedAddress` has an address in common
+        with any of the addresses stored in this trie."""
+        if not self._root.count:
+            return False
+        width = address.mask.bit_length()
+        pending = [(self._root, 0)]
+        while pending:
+            node, bit = pending.pop()
+
+            # The bits of a compressed path are compared all at once. The bits
+            # leading up to the node are already known to be compatible.
+            if node.tail is not None:
+                if address.common(node.tail) is not None:
+                    return True
+                continue
+
+            # If an address ends here, it matches anything that got us here.
+            # If the new address ends here, it matches everything in the
+            # subtrie, which is never empty because empty subtries are pruned.
+            if node.terminal or bit == width:
+                return True
+
+            children = node.children
+            if (address.mask >> bit) & 1:
+                indices = ((address.address >> bit) & 1, self._DONT_CARE)
+            else:
+                indices = (0, 1, self._DONT_CARE)
+            for index in indices:
+                child = children[index]
+                if child is not None:
+                    pending.append((child, bit + 1))
+        return False
+
+
 class AddressMap:
     """Specialized mapping object for mapping `MaskedAddress`es to arbitrary
     Python objects (usually representing registers). The mapping object ensures
-    that there are no address conflicts. Note that this is a rather costly
-    operation, since in the worst case all exiting addresses need to be checked
-    for conflicts with the new address."""
+    that there are no address conflicts. The addresses are indexed in a
+    ternary trie, such that conflict detection does not need to check all
+    existing addresses."""
 
     def __init__(self):
         super().__init__()
         self._map = {}
+        self._trie = _AddressTrie()
 
     def __setitem__(self, address, value):
         """Adds an address to the mapping or updates the current value for an
@@ -363,19 +500,24 @@ class AddressMap:
             self._map[address] = value
             return
 
-        # Check for conflicts.
-        for other in self._map:
-            if address.common(other) is not None:
-                raise AddressConflictError(address, other)
+        # Check for conflicts. The trie only tells us whether there is a
+        # conflict; to report it we look for the first conflicting address in
+        # insertion order.
+        if self._trie.conflicts(address):
+            for other in self._map:
+                if address.common(other) is not None:
+                    raise AddressConflictError(address, other)
 
         # Add the new mapping.
         self._map[address] = value
+        self._trie.add(address)
 
     def __getitem__(self, address):
         return self._map[address]
 
     def __delitem__(self, address):
         del self._map[address]
+        self._trie.remove(address)
 
     def __contains__(self, address):
         return address in self._map
@@ -391,9 +533,11 @@ class AddressMap:
         """Chains to `dict.get()`."""
         return self._map.get(*args, **kwargs)
 
-    def pop(self, *args, **kwargs):
+    def pop(self, address, *args):
         """Chains to `dict.pop()`."""
-        return self._map.pop(*args, **kwargs)
+        if address in self._map:
+            self._trie.remove(address)
+        return self._map.pop(address, *args)
 
 
 class AddressManager:
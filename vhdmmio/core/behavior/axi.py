@@ -12,12 +12,12 @@ class AxiBehavior(Behavior):
 
         # Figure out the bus width.
         bus_width = field_descriptor.base_bitrange.width
-        if bus_width not in [32, 64]:
-            raise ValueError('AXI fields must be 32 or 64 bits wide')
+        if bus_width not in [32, 64, 128, 256, 512]:
+            raise ValueError('AXI fields must be 32, 64, 128, 256, or 512 bits wide')
 
         # Figure out the slice of the bus address that is controlled by the
         # subaddress.
-        sub_low = {32: 2, 64: 3}[bus_width]
+        sub_low = bus_width.bit_length() - 4
         sub_high = sub_low + field_descriptor.subaddress.width - 1
         if sub_high > 31:
             raise ValueError(
@@ -84,7 +84,7 @@ class CustomBehavior(Behavior):
             if interface.type == 'boolean':
                 vhdl_type = boolean
             if interface.type.startswith('axi4l'):
-                _, component, width = '-'.split(interface.type)
+                _, component, width = interface.type.split('-')
                 vhdl_type = Axi4Lite(component, int(width))
             assert vhdl_type is not None or interface.type == 'std_logic'
 
@@ -7,6 +7,8 @@ from .mixins import Shaped
 class BitRange(Shaped):
     """Represents a range of bits within a register or number."""
 
+    __slots__ = Shaped.MIXIN_SLOTS + ('_high', '_low')
+
     def __init__(self, high, low=None, **kwargs):
         assert high >= 0
         if low is None:
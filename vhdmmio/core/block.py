@@ -7,6 +7,10 @@ from .address import AddressSignalMap
 class FieldMapping(Unique):
     """Represents a field mapping within a `Block`."""
 
+    __slots__ = (
+        '_block', '_field', '_high', '_low', '_offset', '_read', '_write',
+        '_col_span', '_col_index')
+
     def __init__(self, block, field, high, low, offset):
         super().__init__()
         self._block = block
@@ -86,6 +90,11 @@ class Block(Named, Unique, Accessed):
     to physical registers when only the sub-word LSBs of the address are masked
     out. One or more blocks together form a logical register."""
 
+    __slots__ = Named.MIXIN_SLOTS + Accessed.MIXIN_SLOTS + (
+        '_register', '_index', '_offset', '_internal_address', '_col_count',
+        '_address', '_read_tag', '_write_tag', '_row_headers', '_table',
+        '_mappings')
+
     def __init__(self, resources, register, index, count):
         # Determine the suffix for the block name.
         if count == 1:
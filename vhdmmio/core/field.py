@@ -21,6 +21,10 @@ class Field(Named, Configured, Unique):
     """Represents a parsed field descriptor. That is, a single field or a
     number of fields in an array."""
 
+    __slots__ = Named.MIXIN_SLOTS + Configured.MIXIN_SLOTS + (
+        '_descriptor', '_index', '_address', '_internal_address', '_bitrange',
+        '_registers_assigned', '_register_read', '_register_write')
+
     def __init__(self, resources, descriptor, cfg, index, address, bitrange):
         index_str = '' if cfg.repeat is None else str(index)
         super().__init__(
@@ -1,5 +1,6 @@
 """Submodule for the `FieldDescriptor` class."""
 
+from collections import namedtuple
 from .mixins import Shaped, Named, Configured, Unique
 from .address import MaskedAddress
 from .bitrange import BitRange
@@ -7,6 +8,15 @@ from .field import Field
 from .interface_options import InterfaceOptions
 from .behavior import Behavior
 
+FieldArray = namedtuple('FieldArray', ['base', 'stride', 'count', 'address'])
+"""Symbolic representation of a regular array of fields, as returned by
+`FieldDescriptor.array`. `base` is the internal address of the first field as
+a `MaskedAddress`, `stride` is the distance between the internal addresses of
+successive fields, and `count` is the number of fields. Both `stride` and
+`count` are powers of two, such that `address` is a single `MaskedAddress`
+that matches all the fields, with the field index in the address bits starting
+at `stride.bit_length() - 1`."""
+
 class FieldDescriptor(Named, Shaped, Configured, Unique):
     """Represents a parsed field descriptor. That is, a single field or a
     number of fields in an array."""
@@ -74,6 +84,49 @@ class FieldDescriptor(Named, Shaped, Configured, Unique):
         """VHDL interface configuration."""
         return self._interface_options
 
+    @property
+    def array(self):
+        """`FieldArray` describing the fields of this descriptor if they form
+        a regular array, or `None` otherwise. This is the case when each field
+        is the only field of its logical register(s), those registers consist
+        of a single block without defer tags, and the internal addresses of
+        the fields can be matched by a single `MaskedAddress` of which the
+        field index forms a contiguous set of bits. Such arrays can be handled
+        by a single piece of logic indexed by address bits, instead of by one
+        copy for each field. Note that the fields, registers, and blocks of
+        the array are still elaborated individually."""
+        count = len(self._fields)
+        if count < 2 or count & (count - 1):
+            return None
+        addresses = []
+        for field in self._fields:
+            address = None
+            for register in (field.register_read, field.register_write):
+                if register is None:
+                    continue
+                if len(register.blocks) != 1 or len(register.fields) != 1:
+                    return None
+                block, = register.blocks
+                if block.read_tag is not None or block.write_tag is not None:
+                    return None
+                if address is not None and address != block.internal_address:
+                    return None
+                address = block.internal_address
+            addresses.append(address)
+        base = addresses[0]
+        stride = addresses[1].address - base.address
+        if stride <= 0 or stride & (stride - 1):
+            return None
+        index_mask = stride * (count - 1)
+        if base.address & index_mask or base.mask & index_mask != index_mask:
+            return None
+        for index, address in enumerate(addresses):
+            if address != (base.address + stride * index, base.mask):
+                return None
+        return FieldArray(
+            base, stride, count,
+            MaskedAddress(base.address, base.mask & ~index_mask))
+
     def _compute_field_locations(self):
         """Compute and yield the location information for each field described
         by this descriptor as `(address, bitrange)` two-tuples."""
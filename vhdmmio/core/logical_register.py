@@ -109,6 +109,9 @@ class LogicalRegister(Named, Unique, Accessed):
     more `Field`s that share the same (internal, i.e. including conditions)
     address."""
 
+    __slots__ = Named.MIXIN_SLOTS + Accessed.MIXIN_SLOTS + (
+        '_regfile', '_fields', '_endianness', '_blocks')
+
     def __init__(self, resources, regfile, metadata, mode, fields):
         super().__init__(metadata=metadata, mode=mode)
         with self.context:
@@ -1,4 +1,10 @@
-"""Submodule containing some common mixin classes."""
+"""Submodule containing some common mixin classes.
+
+The mixins declare empty `__slots__`, such that classes using them can still
+use `__slots__` to save memory; Python does not allow multiple base classes
+with nonempty slot layouts. Instead, each mixin lists the attributes it needs
+in `MIXIN_SLOTS`, which slotted classes must include in their own
+`__slots__`."""
 
 from .named import Named
 from .shaped import Shaped
@@ -4,6 +4,10 @@ class Accessed:
     """Mixin for objects which are accessed by a bus. Stores whether the object
     is readable and/or writable."""
 
+    # See `vhdmmio.core.mixins`.
+    __slots__ = ()
+    MIXIN_SLOTS = ('_mode',)
+
     def __init__(self, mode=None, **kwargs):
         super().__init__(**kwargs)
         assert 'R' in mode or 'W' in mode
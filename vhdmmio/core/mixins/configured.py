@@ -5,6 +5,10 @@ from ...configurable import Configurable
 class Configured: #pylint: disable=R0903
     """Mixin for classes which are configured using a `Configurable`."""
 
+    # See `vhdmmio.core.mixins`.
+    __slots__ = ()
+    MIXIN_SLOTS = ('_cfg',)
+
     def __init__(self, cfg=None, **kwargs):
         super().__init__(**kwargs)
         if isinstance(cfg, list):
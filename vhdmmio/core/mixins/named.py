@@ -44,6 +44,10 @@ class Named:
     """Base class for register file components that have a mnemonic, name, and
     documentation attached to them."""
 
+    # See `vhdmmio.core.mixins`.
+    __slots__ = ()
+    MIXIN_SLOTS = ('_mnemonic', '_name', '_brief', '_doc')
+
     def __init__(self, metadata=None, name=None,
                  mnemonic_suffix='', name_suffix='',
                  doc_index='', brief_override=None, doc_override=None,
@@ -5,6 +5,10 @@ class Shaped:
     """Class for objects that can either be a scalar or a vector of a fixed
     size."""
 
+    # See `vhdmmio.core.mixins`.
+    __slots__ = ()
+    MIXIN_SLOTS = ('_shape',)
+
     def __init__(self, shape=None, **kwargs):
         super().__init__(**kwargs)
         self._shape = shape
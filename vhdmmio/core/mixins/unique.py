@@ -4,6 +4,10 @@ class Unique:
     """Mixins for unique objects, for which regular equality equals object ID
     equality. This allows the objects to be hashable."""
 
+    # See `vhdmmio.core.mixins`.
+    __slots__ = ()
+    MIXIN_SLOTS = ()
+
     def __hash__(self):
         return id(self)
 
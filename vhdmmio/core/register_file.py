@@ -6,6 +6,7 @@ from .field_descriptor import FieldDescriptor
 from .logical_register import construct_logical_register
 from .interrupt import Interrupt, InterruptInfo
 from .defer_tag import DeferTagInfo
+from .. import profiling
 
 
 class RegisterFile(Named, Configured, Unique):
@@ -14,7 +15,7 @@ class RegisterFile(Named, Configured, Unique):
     def __init__(self, cfg, trusted):
         self._trusted = trusted
         super().__init__(cfg=cfg, metadata=cfg.metadata)
-        with self.context:
+        with profiling.phase('elaborate', self.name), self.context:
 
             # Create the various resource managers.
             resources = Resources(self)
@@ -76,6 +77,16 @@ class RegisterFile(Named, Configured, Unique):
             self._internals = tuple(resources.internals)
             self._internal_ios = tuple(resources.internals.iter_internal_ios())
 
+            # Record statistics about the register file when profiling.
+            profiler = profiling.active()
+            if profiler is not None:
+                profiler.count('field descriptors', len(self._field_descriptors))
+                profiler.count('fields', sum(
+                    len(descriptor.fields) for descriptor in self._field_descriptors))
+                profiler.count('registers', len(self._registers))
+                profiler.count('blocks', sum(
+                    len(register.blocks) for register in self._registers))
+
     @property
     def trusted(self):
         """Whether source of the configuration used to construct this register
@@ -6,10 +6,14 @@ import shutil
 from markdown2 import Markdown
 from ..version import __version__
 from ..core.address import AddressSignalMap
-from ..template import TemplateEngine, annotate_block
+from ..template import TemplateEngine, annotate_block, compile_template
+from .. import profiling
 
 _MODULE_DIR = os.path.dirname(__file__)
 
+# Templates for the generated files and the names of those files.
+_OUTPUTS = (('base.template.html', 'index.html'), ('style.template.css', 'style.css'))
+
 _SECTION = annotate_block("""
 <div class="content">
   $header$
@@ -40,6 +44,10 @@ $   BODY
 </table>
 """)
 
+# These are applied for every section and register, so compile them only once.
+_SECTION = compile_template(_SECTION)
+_BITMAP_TABLE = compile_template(_BITMAP_TABLE)
+
 
 class DocumentationFlags:
     """Maintains a set of documentation "flags", which can then be coverted to
@@ -512,19 +520,53 @@ class HtmlDocumentationGenerator:
 
         return tple.apply_str_to_str(_SECTION)
 
-    def generate(self, output_dir):
+    def generate_section(self, regfile):
+        """Generates the HTML documentation section for a single register
+        file. This allows the sections to be generated independently, for
+        instance in different processes, and then be passed to `generate()`
+        through its `sections` argument."""
+        with profiling.phase('html', regfile.name):
+            return self._regfile_to_html(regfile)
+
+    def generate(self, output_dir, sections=None):
         """Generates the HTML documentation files for the register files in the
-        given directory."""
+        given directory. If `sections` is specified, it must be an iterable of
+        previously generated register file sections (see
+        `generate_section()`), which are then included after the sections for
+        the register files passed to the constructor. Returns the list of
+        generated files."""
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        tple = self._page_template(sections)
+        output_files = []
+        with profiling.phase('html-write'):
+            for template, output_file in _OUTPUTS:
+                output_file = pjoin(output_dir, output_file)
+                tple.apply_file_to_file(pjoin(_MODULE_DIR, template), output_file)
+                output_files.append(output_file)
+        return output_files
+
+    def generate_strings(self, sections=None):
+        """Generates the HTML documentation files in memory, without touching
+        the filesystem. Returns a dictionary mapping the names of the files
+        that `generate()` would write (without directory) to their contents.
+        `sections` is handled the same way as for `generate()`."""
+        tple = self._page_template(sections)
+        with profiling.phase('html-write'):
+            return {
+                output_file: tple.apply_file_to_str(pjoin(_MODULE_DIR, template))
+                for template, output_file in _OUTPUTS}
+
+    def _page_template(self, sections):
+        """Returns a template engine for the documentation page, containing
+        the sections for the register files passed to the constructor followed
+        by the given previously generated sections."""
         tple = TemplateEngine()
         for regfile in self._regfiles:
-            tple.append_block('BODY', self._regfile_to_html(regfile))
+            tple.append_block('BODY', self.generate_section(regfile))
+        if sections is not None:
+            for section in sections:
+                tple.append_block('BODY', section)
         tple['title'] = 'Register file documentation'
         tple['version'] = __version__
-        tple.apply_file_to_file(
-            pjoin(_MODULE_DIR, 'base.template.html'),
-            pjoin(output_dir, 'index.html'))
-        tple.apply_file_to_file(
-            pjoin(_MODULE_DIR, 'style.template.css'),
-            pjoin(output_dir, 'style.css'))
+        return tple
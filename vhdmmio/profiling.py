@@ -0,0 +1,228 @@
+"""Module for recording where time and memory go in the vhdmmio generation
+pipeline.
+
+The pipeline calls `phase()` and `count()` at interesting points. These do
+nothing unless a `Profiler` is active, which is the case within its `with`
+block. For example:
+
+    with Profiler() as profiler:
+        regfile = RegisterFile(RegisterFileConfig.load('x.mmio.yaml'), False)
+        VhdlEntityGenerator(regfile).generate('out')
+    print(profiler.summary())
+    profiler.save('profile.json')
+"""
+
+import time
+import json
+import contextlib
+import tracemalloc
+from .version import __version__
+
+__all__ = ['Profiler', 'active', 'phase', 'count']
+
+_ACTIVE = None
+
+
+class _Phase:
+    """A phase that is currently being recorded."""
+
+    def __init__(self, name, regfile):
+        super().__init__()
+        self.name = name
+        self.regfile = regfile
+        self.peak = 0
+
+
+class Profiler:
+    """Records the wall time and peak traced memory usage of each phase of the
+    generation pipeline per register file, as well as statistics such as the
+    number of fields, blocks, and template expansions.
+
+    Phases may nest. Their times are inclusive, and the peak memory of a
+    phase includes that of its subphases. Profilers may also nest, in which
+    case only the innermost one records anything. Memory usage is measured using
+    `tracemalloc`, which slows Python down considerably; specify
+    `trace_memory=False` to only measure time."""
+
+    def __init__(self, trace_memory=True):
+        super().__init__()
+        self._trace_memory = trace_memory
+        self._started_tracing = False
+        self._start = None
+        self._wall_time = 0.0
+        self._peak = None
+        self._previous = None
+        self._stack = []
+        self._phases = {}
+        self._counts = {}
+
+    def __enter__(self):
+        global _ACTIVE #pylint: disable=W0603
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._reset_peak()
+        self._start = time.perf_counter()
+        self._previous = _ACTIVE
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, *_):
+        global _ACTIVE #pylint: disable=W0603
+        _ACTIVE = self._previous
+        self._previous = None
+        self._wall_time += time.perf_counter() - self._start
+        if self._trace_memory:
+            self._peak = max(self._peak or 0, self._read_peak())
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _read_peak(self):
+        """Returns the peak traced memory since the last reset, or zero if
+        memory is not being traced."""
+        if not self._trace_memory or not tracemalloc.is_tracing():
+            return 0
+        return tracemalloc.get_traced_memory()[1]
+
+    def _reset_peak(self):
+        """Resets the peak traced memory, if the Python version allows this.
+        Older versions report the peak since tracing started instead."""
+        if self._trace_memory and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def phase(self, name, regfile=None):
+        """Context manager that records a phase called `name` for register
+        file `regfile`. If `regfile` is `None`, the register file of the
+        innermost enclosing phase is used. The context yields an object with a
+        writable `regfile` attribute, for phases that only learn which
+        register file they belong to while running."""
+        if regfile is None and self._stack:
+            regfile = self._stack[-1].regfile
+        current = _Phase(name, regfile)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, self._read_peak())
+        self._reset_peak()
+        self._stack.append(current)
+        start = time.perf_counter()
+        try:
+            yield current
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            current.peak = max(current.peak, self._read_peak())
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, current.peak)
+            self._record(current.name, current.regfile, 1, elapsed, current.peak)
+
+    def _record(self, name, regfile, calls, wall_time, peak):
+        """Adds a measurement to the statistics for the given phase and
+        register file."""
+        entry = self._phases.setdefault((name, regfile), [0, 0.0, None])
+        entry[0] += calls
+        entry[1] += wall_time
+        if peak is not None and self._trace_memory:
+            entry[2] = max(entry[2] or 0, peak)
+
+    def count(self, name, amount=1, regfile=None):
+        """Adds `amount` to the counter called `name` for register file
+        `regfile`. If `regfile` is `None`, the register file of the innermost
+        active phase is used."""
+        if regfile is None and self._stack:
+            regfile = self._stack[-1].regfile
+        counts = self._counts.setdefault(regfile, {})
+        counts[name] = counts.get(name, 0) + amount
+
+    def report(self):
+        """Returns the recorded statistics as a JSON-serializable
+        dictionary."""
+        return {
+            'version': __version__,
+            'wall_time': self._wall_time,
+            'peak_memory': self._peak,
+            'phases': [
+                {
+                    'phase': name,
+                    'regfile': regfile,
+                    'calls': calls,
+                    'wall_time': wall_time,
+                    'peak_memory': peak,
+                }
+                for (name, regfile), (calls, wall_time, peak) in self._phases.items()],
+            'counts': [
+                {'regfile': regfile, 'counts': dict(counts)}
+                for regfile, counts in self._counts.items()],
+        }
+
+    def merge(self, report):
+        """Merges a report returned by `report()`, for instance from a worker
+        process, into the statistics of this profiler. The wall time of the
+        report is not added, since it overlaps with that of this profiler."""
+        for entry in report['phases']:
+            self._record(
+                entry['phase'], entry['regfile'], entry['calls'],
+                entry['wall_time'], entry['peak_memory'])
+        for entry in report['counts']:
+            for name, amount in entry['counts'].items():
+                self.count(name, amount, entry['regfile'])
+        if report['peak_memory'] is not None:
+            self._peak = max(self._peak or 0, report['peak_memory'])
+
+    def save(self, filename):
+        """Writes the report to the given file as JSON."""
+        with open(filename, 'w', encoding='utf-8') as fil:
+            json.dump(self.report(), fil, indent=2)
+            fil.write('\n')
+
+    def summary(self):
+        """Returns a human-readable summary of the recorded statistics."""
+        report = self.report()
+
+        def mib(value):
+            return '-' if value is None else '%.1f' % (value / 1048576)
+
+        lines = ['Profile: %.3f s wall time, %s MiB peak traced memory' % (
+            report['wall_time'], mib(report['peak_memory']))]
+        rows = [('register file', 'phase', 'calls', 'time [s]', 'peak [MiB]')]
+        for entry in sorted(
+                report['phases'], key=lambda entry: (str(entry['regfile']), entry['phase'])):
+            rows.append((
+                '-' if entry['regfile'] is None else entry['regfile'],
+                entry['phase'],
+                str(entry['calls']),
+                '%.3f' % entry['wall_time'],
+                mib(entry['peak_memory'])))
+        widths = [max(len(row[idx]) for row in rows) for idx in range(len(rows[0]))]
+        for row in rows:
+            lines.append('  '.join(
+                cell.ljust(width) if idx < 2 else cell.rjust(width)
+                for idx, (cell, width) in enumerate(zip(row, widths))).rstrip())
+        for entry in sorted(report['counts'], key=lambda entry: str(entry['regfile'])):
+            lines.append('%s: %s' % (
+                '-' if entry['regfile'] is None else entry['regfile'],
+                ', '.join(
+                    '%d %s' % (amount, name)
+                    for name, amount in sorted(entry['counts'].items()))))
+        return '\n'.join(lines)
+
+
+def active():
+    """Returns the active `Profiler`, or `None` if profiling is disabled."""
+    return _ACTIVE
+
+
+def phase(name, regfile=None):
+    """Returns a context manager that records the phase called `name` for
+    register file `regfile` with the active profiler, or that does nothing if
+    profiling is disabled. See `Profiler.phase()`."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext(_Phase(name, regfile))
+    return _ACTIVE.phase(name, regfile)
+
+
+def count(name, amount=1, regfile=None):
+    """Adds `amount` to the counter called `name` of the active profiler, if
+    any. See `Profiler.count()`."""
+    if _ACTIVE is not None:
+        _ACTIVE.count(name, amount, regfile)
@@ -0,0 +1,335 @@
+"""Module for generating Python drivers for register files."""
+
+import os
+from os.path import join as pjoin
+from ..version import __version__
+from ..template import TemplateEngine
+from ..utils import expand_output_dir
+from .. import profiling
+from ..software import SoftwareRegister
+
+_MODULE_DIR = os.path.dirname(__file__)
+
+
+def _escape(text):
+    """Escapes the characters that have a special meaning to the template
+    engine in the given text."""
+    return text.replace('$', '$$').replace('@', '@@')
+
+
+def _class_name(name):
+    """Converts a register file name to a Python class name."""
+    return ''.join(part[:1].upper() + part[1:] for part in name.split('_'))
+
+
+class PythonDriverGenerator:
+    """Generator for the Python driver module for a single register file."""
+
+    def __init__(self, regfile):
+        """Constructs a Python driver generator for the given register
+        file."""
+        super().__init__()
+        self._regfile = regfile
+        bus_width = regfile.cfg.features.bus_width
+        if bus_width not in (32, 64):
+            raise ValueError(
+                'Python drivers can only be generated for 32- or 64-bit buses')
+        self._word_size = bus_width // 8
+
+        size = self._word_size
+        for register in regfile.registers:
+            for block in register.blocks:
+                address = block.address
+                size = max(size, (address.address | (~address.mask & 0xFFFFFFFF)) + 1)
+        size = -(-size // self._word_size) * self._word_size
+
+        self._tple = TemplateEngine()
+        self._tple['version'] = __version__
+        self._tple['r'] = regfile
+        self._tple['brief'] = regfile.brief.replace('@', '@@')
+        self._tple['cls'] = _class_name(regfile.name)
+        self._tple['word_size'] = self._word_size
+        self._tple['size'] = '0x%X' % size
+
+        self._infos = {}
+        with profiling.phase('python', regfile.name):
+            for register in regfile.registers:
+                info = SoftwareRegister(register)
+                self._infos[register] = info
+                self._tple.append_block('ACCESSORS', self._generate_register(info))
+            for descriptor in regfile.field_descriptors:
+                if descriptor.is_vector():
+                    self._tple.append_block('ACCESSORS', self._generate_bulk(descriptor))
+
+    def _index(self, block):
+        """Returns the word index for the given block."""
+        return block.address.address // self._word_size
+
+    def _read_expr(self, info):
+        """Returns the Python expression that reads the given register."""
+        if len(info.register.blocks) == 1:
+            return 'self._words[%d]' % self._index(info.register.blocks[0])
+        return 'self._get_%s()' % info.register.name
+
+    def _write_stmt(self, info, expr):
+        """Returns the Python statement that writes `expr` to the given
+        register."""
+        if len(info.register.blocks) == 1:
+            return 'self._words[%d] = %s' % (self._index(info.register.blocks[0]), expr)
+        return 'self._set_%s(%s)' % (info.register.name, expr)
+
+    def _generate_register(self, info):
+        """Generates the properties for the given register and its fields."""
+        register = info.register
+        lines = ['@ Register `%s` (%s): %s' % (
+            register.name, register.mnemonic, _escape(register.brief))]
+        _, conditions = register.blocks[0].doc_address()
+        if conditions:
+            lines.append('@')
+            lines.append('@ Only accessible when %s.' % _escape(' and '.join(conditions)))
+
+        # Registers that map a range of addresses (for instance AXI fields)
+        # are exposed as a memoryview of the range.
+        if info.span is not None:
+            lines.append('def _get_%s(self):' % register.name)
+            lines.append('    return self._bytes[0x%X:0x%X]' % (
+                info.offset, info.offset + info.span))
+            lines.append('')
+            lines.append('%s = property(_get_%s, doc=%r)' % (
+                register.name, register.name, _escape(register.brief)))
+            lines.append('')
+            return lines
+
+        # Whole-register accessors. Multi-block registers are accessed in
+        # block order, which is what the hardware needs to guarantee
+        # atomicity.
+        word_mask = '0x%X' % ((1 << info.bus_width) - 1)
+        getter = setter = 'None'
+        if register.can_read():
+            getter = '_get_%s' % register.name
+            lines.append('def %s(self):' % getter)
+            if len(register.blocks) == 1:
+                lines.append('    return %s' % self._read_expr(info))
+            else:
+                for block in register.blocks:
+                    lines.append('    value %s self._words[%d] << %d' % (
+                        '|=' if block.index else '=', self._index(block), block.offset))
+                lines.append('    return value')
+            lines.append('')
+        if register.can_write():
+            setter = '_set_%s' % register.name
+            lines.append('def %s(self, value):' % setter)
+            if len(register.blocks) == 1:
+                lines.append('    %s' % self._write_stmt(info, 'value'))
+            else:
+                for block in register.blocks:
+                    lines.append('    self._words[%d] = (value >> %d) & %s' % (
+                        self._index(block), block.offset, word_mask))
+            lines.append('')
+        lines.append('%s = property(%s, %s, doc=%r)' % (
+            register.name, getter, setter, _escape(register.brief)))
+        lines.append('')
+        if register.can_write():
+            lines.extend(self._generate_flush(info))
+
+        # Field accessors.
+        for field in register.fields:
+            mask = '0x%X' % ((1 << field.bitrange.width) - 1)
+            getter = setter = 'None'
+            if field in info.readable_fields():
+                getter = '_get_%s' % field.name
+                lines.append('def %s(self):' % getter)
+                lines.append('    return (%s >> %d) & %s' % (
+                    self._read_expr(info), field.bitrange.low, mask))
+                lines.append('')
+            if field in info.writable_fields():
+                keep = info.keep_mask([field])
+                if keep is None:
+                    lines.append(
+                        '@ `%s` cannot be written without side effects on other fields.'
+                        % field.name)
+                else:
+                    setter = '_set_%s' % field.name
+                    value = '(value & %s) << %d' % (mask, field.bitrange.low)
+                    if keep:
+                        value = '(%s & 0x%X) | (%s)' % (self._read_expr(info), keep, value)
+                    lines.append('def %s(self, value):' % setter)
+                    lines.append('    %s' % self._write_stmt(info, value))
+                lines.append('')
+            if getter != 'None' or setter != 'None':
+                lines.append('%s = property(%s, %s, doc=%r)' % (
+                    field.name, getter, setter, _escape(field.brief)))
+                lines.append('')
+        return lines
+
+    def _generate_flush(self, info):
+        """Generates the method that writes the fields staged by a
+        transaction to the given register, and the staging properties of the
+        transaction class for the register and its fields."""
+        register = info.register
+        preserve = info.preserve_mask()
+        lines = ['def _flush_%s(self, mask, value):' % register.name]
+        if preserve and info.can_preserve():
+            lines.append('    preserve = 0x%X & ~mask' % preserve)
+            lines.append('    if preserve:')
+            lines.append('        value |= %s & preserve' % self._read_expr(info))
+        elif preserve:
+            lines.append('    if 0x%X & ~mask:' % preserve)
+            lines.append('        raise ValueError(')
+            lines.append('            \'fields %s of register `%s` must be written together\')' % (
+                ', '.join('`%s`' % field.name for field in info.writable_fields()
+                          if info.field_mask(field) & preserve), register.name))
+        lines.append('    %s' % self._write_stmt(info, 'value'))
+        lines.append('')
+
+        # Staging properties for the transaction class.
+        stage = ['def _stage_%s(self, value):' % register.name]
+        stage.append('    self._stage(%s._flush_%s, 0x%X, value)' % (
+            self._tple['cls'], register.name, (1 << info.width) - 1))
+        stage.append('')
+        stage.append('%s = property(None, _stage_%s, doc=%r)' % (
+            register.name, register.name, _escape(register.brief)))
+        stage.append('')
+        for field in info.writable_fields():
+            stage.append('def _stage_%s(self, value):' % field.name)
+            stage.append('    self._stage(%s._flush_%s, 0x%X, value << %d)' % (
+                self._tple['cls'], register.name, info.field_mask(field), field.bitrange.low))
+            stage.append('')
+            stage.append('%s = property(None, _stage_%s, doc=%r)' % (
+                field.name, field.name, _escape(field.brief)))
+            stage.append('')
+        self._tple.append_block('TRANSACTION', stage)
+
+        return lines
+
+    def _strided_slice(self, infos):
+        """Returns the slice notation that selects the words of the given
+        registers from the word view if they are single-block registers with
+        a constant stride, or `None` if this is not the case."""
+        if len(set(infos)) != len(infos):
+            return None
+        if any(len(info.register.blocks) != 1 or info.span is not None for info in infos):
+            return None
+        indices = [self._index(info.register.blocks[0]) for info in infos]
+        step = indices[1] - indices[0]
+        if step == 0 or indices != list(range(indices[0], indices[-1] + step, step)):
+            return None
+        stop = indices[-1] + step
+        return '%d:%s:%d' % (indices[0], '' if stop < 0 else stop, step)
+
+    def _generate_bulk(self, descriptor):
+        """Generates the bulk accessor methods for the given repeated field
+        descriptor. Bulk accessors are only generated for fields that fit in a
+        bus word, when all fields reside in a single register, or when each
+        field resides in its own single-block register with a constant
+        stride."""
+        fields = descriptor.fields
+        name = descriptor.name
+        count = len(fields)
+        if descriptor.base_bitrange.width > self._regfile.cfg.features.bus_width:
+            return []
+        mask = '0x%X' % ((1 << descriptor.base_bitrange.width) - 1)
+        lines = []
+
+        # Bulk read.
+        registers = [field.register_read for field in fields]
+        if all(register is not None and register.can_read() for register in registers):
+            infos = [self._infos[register] for register in registers]
+            index = self._strided_slice(infos)
+            if len(set(infos)) == 1:
+                lines.append('def read_%s(self):' % name)
+                lines.append('    """Reads all %d `%s` fields using a single register access.' % (
+                    count, name))
+                lines.append('    Returns a NumPy array if NumPy is available, or an')
+                lines.append('    `array.array` otherwise."""')
+                lines.append('    reg = %s' % self._read_expr(infos[0]))
+                lines.append('    return _to_array([')
+                for field in fields:
+                    lines.append('        (reg >> %d) & %s,' % (field.bitrange.low, mask))
+                lines.append('    ])')
+                lines.append('')
+            elif index is not None and all(info.is_read_no_op() for info in infos):
+                low = fields[0].bitrange.low
+                lines.append('def read_%s(self):' % name)
+                lines.append('    """Reads all %d `%s` fields using a single strided slice of the' % (
+                    count, name))
+                lines.append('    mapping. Returns a NumPy array if NumPy is available, or an')
+                lines.append('    `array.array` otherwise."""')
+                lines.append('    words = self._words[%s]' % index)
+                lines.append('    if numpy is not None:')
+                lines.append('        return (numpy.array(words) >> %d) & %s' % (low, mask))
+                lines.append('    return array.array(_TYPECODE, [(word >> %d) & %s for word in words])' % (
+                    low, mask))
+                lines.append('')
+
+        # Bulk write.
+        registers = [field.register_write for field in fields]
+        if all(register is not None and register.can_write() for register in registers):
+            infos = [self._infos[register] for register in registers]
+            index = self._strided_slice(infos)
+            if len(set(infos)) == 1:
+                keep = infos[0].keep_mask(fields)
+            elif index is not None:
+                keeps = {info.keep_mask([field]) for info, field in zip(infos, fields)}
+                keep = keeps.pop() if len(keeps) == 1 else None
+            else:
+                keep = None
+            if keep is not None:
+                lines.append('def write_%s(self, values):' % name)
+                lines.append('    """Writes all %d `%s` fields at once. `values` must be a sequence' % (
+                    count, name))
+                lines.append('    of %d integers."""' % count)
+                lines.append('    if len(values) != %d:' % count)
+                lines.append('        raise ValueError(\'expected %d values for `%s`\')' % (
+                    count, name))
+                if len(set(infos)) == 1:
+                    lines.append('    reg = %s' % (
+                        '%s & 0x%X' % (self._read_expr(infos[0]), keep) if keep else '0'))
+                    for idx, field in enumerate(fields):
+                        lines.append('    reg |= (values[%d] & %s) << %d' % (
+                            idx, mask, field.bitrange.low))
+                    lines.append('    %s' % self._write_stmt(infos[0], 'reg'))
+                else:
+                    low = fields[0].bitrange.low
+                    if keep:
+                        lines.append('    words = self._words[%s]' % index)
+                        lines.append('    self._words[%s] = array.array(_TYPECODE, [' % index)
+                        lines.append('        (word & 0x%X) | ((value & %s) << %d)' % (
+                            keep, mask, low))
+                        lines.append('        for word, value in zip(words, values)])')
+                    else:
+                        lines.append('    self._words[%s] = array.array(_TYPECODE, [' % index)
+                        lines.append('        (value & %s) << %d for value in values])' % (
+                            mask, low))
+                lines.append('')
+        return lines
+
+    def generate(self, output_dir):
+        """Generates the Python driver module for this register file in the
+        specified directory. The `@` symbol in `output_dir` is expanded the
+        same way as for `VhdlEntityGenerator`. Returns the list of generated
+        files."""
+        output_dir = expand_output_dir(output_dir, self._regfile.cfg.source_directory)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        output_file = os.path.join(output_dir, self._regfile.name + '_mmio.py')
+        with profiling.phase('python', self._regfile.name):
+            written = self._tple.apply_file_to_file(
+                pjoin(_MODULE_DIR, 'driver.py.template'),
+                output_file,
+                comment='# ')
+        if written:
+            print('Wrote %s' % output_file)
+        else:
+            print('%s is up to date' % output_file)
+        return [output_file]
+
+    def generate_strings(self):
+        """Generates the Python driver module for this register file in
+        memory, without touching the filesystem. Returns a dictionary mapping
+        the name of the file that `generate()` would write (without directory)
+        to its contents."""
+        with profiling.phase('python', self._regfile.name):
+            return {self._regfile.name + '_mmio.py': self._tple.apply_file_to_str(
+                pjoin(_MODULE_DIR, 'driver.py.template'),
+                comment='# ')}
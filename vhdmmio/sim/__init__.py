@@ -0,0 +1,636 @@
+"""Module for simulating register files in Python, without needing a VHDL
+simulator."""
+
+from collections import OrderedDict, deque
+from ..core.address import AddressSignalMap
+from ..core.subaddress import SubAddress
+from .behavior import Access, FieldModel, AxiSlaveModel
+
+__all__ = ['RegisterFileModel', 'AxiSlaveModel']
+
+
+def _parse_prot_mask(prot_mask):
+    """Converts a `prot` mask string as used by `BusAccessBehavior` (MSB
+    first, with `-` for don't cares) to a `(mask, value)` integer tuple."""
+    mask = 0
+    value = 0
+    for char in prot_mask:
+        mask <<= 1
+        value <<= 1
+        if char != '-':
+            mask |= 1
+            if char == '1':
+                value |= 1
+    return mask, value
+
+
+def _prot_escalates(new_prot, old_prot):
+    """Returns whether a request with `prot` field `new_prot` is less
+    privileged than a previous request with `prot` field `old_prot`, in the
+    same way the hardened VHDL register file decides this."""
+    return bool((not new_prot & 1 and old_prot & 1) or (new_prot & 2 and not old_prot & 2))
+
+
+class InterruptState:
+    """The interrupt registers of a `RegisterFileModel`. Each register is an
+    integer with one bit per interrupt, in the order of the concatenated
+    interrupt vector."""
+
+    __slots__ = ('raw', 'flag', 'enab', 'umsk')
+
+    def __init__(self):
+        super().__init__()
+        self.raw = 0
+        self.flag = 0
+        self.enab = 0
+        self.umsk = 0
+
+
+class _BlockModel:
+    """Address decoding information for a block in either read or write
+    mode."""
+
+    __slots__ = ('address', 'mask', 'index', 'count', 'shift', 'fields', 'deferring')
+
+    def __init__(self, block, fields, direction, bus_width):
+        super().__init__()
+        self.address = block.internal_address.address & block.internal_address.mask
+        self.mask = block.internal_address.mask
+        self.index = block.index
+        self.count = len(block.register.blocks)
+        if block.register.endianness == 'little':
+            self.shift = self.index * bus_width
+        else:
+            self.shift = (self.count - self.index - 1) * bus_width
+
+        # The field logic is attached to the first block for reads and to the
+        # last block for writes, like in the VHDL code.
+        self.fields = []
+        self.deferring = False
+        if self.index == (0 if direction == 'r' else self.count - 1):
+            for field, field_model in fields:
+                bus = field.behavior.bus
+                if direction == 'r':
+                    if not bus.can_read() or field.register_read is not block.register:
+                        continue
+                    prot_mask, prot_value = _parse_prot_mask(bus.read.prot_mask)
+                else:
+                    if not bus.can_write() or field.register_write is not block.register:
+                        continue
+                    prot_mask, prot_value = _parse_prot_mask(bus.write.prot_mask)
+                self.fields.append((
+                    field_model, field.bitrange.low, (1 << field.bitrange.width) - 1,
+                    prot_mask, prot_value))
+                if field_model.deferring:
+                    self.deferring = True
+        self.fields = tuple(self.fields)
+
+
+class RegisterFileModel:
+    """Cycle-based Python model of the VHDL entity generated for a
+    `RegisterFile`. The model follows the order of operations of the generated
+    VHDL process within each cycle, so field behavior, multi-word accesses,
+    blocking, defer tags, interrupts, and internal signals behave the same way.
+    The AXI4-lite handshakes are abstracted away, though: bus requests are
+    handled in the first cycle in which the register file can handle them, and
+    the response is returned at the end of that cycle. Register files that
+    change this timing, by using the AXI4 bus protocol, address decoder
+    pipelining, a read multiplexer other than `decoder`, or request queues,
+    cannot be modeled; a `ValueError` is raised for those.
+
+    Signals are referred to by name using `poke()` and `peek()`:
+
+     - `<field>.<signal>` for field signals, where `<field>` is the name of a
+       single field (so including the index suffix for repeated fields) and
+       `<signal>` is the name of the signal in the VHDL record (`data`,
+       `write_enable`, etc.);
+     - `<interrupt>.request` for the request input of external interrupts;
+     - `<port>` for internal signal I/O ports;
+     - `irq` for the interrupt output of the bus.
+
+    All values are integers. Repeated interrupts and vector internals are
+    represented as integers with one bit per entry."""
+
+    def __init__(self, regfile, generics=None):
+        """Constructs a model for the given `RegisterFile`. `generics` can
+        optionally map field names to the reset values of fields that have
+        their reset value specified by a generic."""
+        super().__init__()
+        self._regfile = regfile
+        self._generics = dict(generics) if generics is not None else {}
+        features = regfile.cfg.features
+
+        # The model only follows the timing of the default bus logic; it
+        # does not include the pipeline stages, queues, and burst logic that
+        # these features add.
+        for option, value, default in (
+                ('entity.bus-protocol', regfile.cfg.entity.bus_protocol, 'axi4-lite'),
+                ('features.decoder-stages', features.decoder_stages, 0),
+                ('features.read-mux', features.read_mux, 'decoder'),
+                ('features.request-queue-depth', features.request_queue_depth, 0)):
+            if value != default:
+                raise ValueError(
+                    'register file %s cannot be simulated: %s must be %s, not %s'
+                    % (regfile.name, option, default, value))
+        self._bus_width = features.bus_width
+        self._bus_mask = (1 << features.bus_width) - 1
+        self._max_outstanding = features.max_outstanding
+        self._harden = regfile.harden
+        self._cycle = 0
+
+        # Internal signal variables, keyed by the name of the corresponding
+        # VHDL variable. This way strobe internals, which have a separate
+        # variable for driving and using the signal, work the same way.
+        self._signals = {}
+        self._strobe_internals = []
+        for internal in regfile.internals:
+            self._signals[internal.use_name] = 0
+            self._signals[internal.drive_name] = 0
+            if internal.is_strobe():
+                self._strobe_internals.append((internal.drive_name, internal.use_name))
+
+        # Inputs and outputs that are not owned by a field model, and the
+        # mapping from port names to their accessors.
+        self._port_inputs = {}
+        self._input_map = {}
+        self._output_map = {}
+
+        # Internal I/O ports.
+        self._internal_inputs = []
+        for internal_io in regfile.internal_ios:
+            internal = internal_io.internal
+            if internal_io.direction == 'output':
+                self._output_map[internal_io.name] = (
+                    lambda name=internal.use_name: self._signals[name])
+                continue
+            self._port_inputs[internal_io.name] = 0
+            self._input_map[internal_io.name] = (self._port_inputs, internal_io.name)
+            self._internal_inputs.append((
+                internal_io.name, internal.drive_name, (1 << internal.width) - 1,
+                internal_io.direction == 'strobe'))
+
+        # Interrupts.
+        self._interrupt_state = InterruptState()
+        self._interrupts = []
+        self._strobe_mask = 0
+        self._umsk_reset = 0
+        self._enab_reset = 0
+        for interrupt in regfile.interrupts:
+            mask = ((1 << interrupt.width) - 1) << interrupt.offset
+            if interrupt.bus_can_clear:
+                self._strobe_mask |= mask
+            if interrupt.unmasked_after_reset:
+                self._umsk_reset |= mask
+            if interrupt.enabled_after_reset:
+                self._enab_reset |= mask
+            if interrupt.is_internal():
+                source = (self._signals, interrupt.internal.use_name)
+            else:
+                key = '%s.request' % interrupt.name
+                self._port_inputs[key] = 0
+                self._input_map[key] = (self._port_inputs, key)
+                source = (self._port_inputs, key)
+            self._interrupts.append((
+                source, interrupt.offset, mask, interrupt.active))
+        self._irq = 0
+        self._output_map['irq'] = lambda: self._irq
+
+        # Construct the field models.
+        self._fields = OrderedDict()
+        fields = []
+        for field_descriptor in regfile.field_descriptors:
+            for field in field_descriptor.fields:
+                field_model = FieldModel.construct(self, field)
+                self._fields[field.name] = field_model
+                fields.append((field, field_model))
+                for name in field_model.inputs:
+                    self._input_map['%s.%s' % (field.name, name)] = (field_model.inputs, name)
+                for name in ('valid', 'ready', 'data'):
+                    try:
+                        field_model.get_output(name)
+                    except KeyError:
+                        continue
+                    self._output_map['%s.%s' % (field.name, name)] = (
+                        lambda field_model=field_model, name=name:
+                        field_model.get_output(name))
+        self._pre_fields = [field_model for _, field_model in fields if field_model.has_pre]
+        self._post_fields = [field_model for _, field_model in fields if field_model.has_post]
+
+        # Construct the address decoding information.
+        self._address_signals = []
+        for signal, offset in regfile.address_info:
+            if signal is not AddressSignalMap.BUS:
+                self._address_signals.append((
+                    signal.use_name, (1 << signal.width) - 1, offset))
+        self._read_blocks = []
+        self._write_blocks = []
+        for register in regfile.registers:
+            for block in register.blocks:
+                if block.can_read():
+                    self._read_blocks.append(_BlockModel(
+                        block, fields, 'r', self._bus_width))
+                if block.can_write():
+                    self._write_blocks.append(_BlockModel(
+                        block, fields, 'w', self._bus_width))
+        self._read_cache = {}
+        self._write_cache = {}
+
+        # Bus state.
+        self._read_queue = deque()
+        self._write_queue = deque()
+        self._read_pending = deque()
+        self._write_pending = deque()
+        self._read_tags = deque()
+        self._write_tags = deque()
+        self._r_hold = 0
+        self._r_multi = 0
+        self._r_prot = 0
+        self._w_hold = 0
+        self._w_hstb = 0
+        self._w_multi = 0
+        self._w_prot = 0
+
+        self.reset()
+
+    @property
+    def regfile(self):
+        """The `RegisterFile` that this object is modeling."""
+        return self._regfile
+
+    @property
+    def generics(self):
+        """Mapping from field names to the values of their reset value
+        generics."""
+        return self._generics
+
+    @property
+    def signals(self):
+        """Mapping from VHDL variable names to the values of the internal
+        signals."""
+        return self._signals
+
+    @property
+    def interrupt_state(self):
+        """The `InterruptState` object holding the interrupt registers."""
+        return self._interrupt_state
+
+    @property
+    def cycle(self):
+        """The number of cycles simulated so far, including reset cycles."""
+        return self._cycle
+
+    def field(self, name):
+        """Returns the `FieldModel` for the field with the given name."""
+        return self._fields[name]
+
+    def poke(self, name, value):
+        """Sets the input signal with the given name to the given integer
+        value."""
+        try:
+            inputs, key = self._input_map[name]
+        except KeyError:
+            raise KeyError('no input signal named %s' % name)
+        inputs[key] = int(value)
+
+    def peek(self, name):
+        """Returns the current value of the signal with the given name as an
+        integer. Both inputs and outputs can be peeked."""
+        accessor = self._output_map.get(name, None)
+        if accessor is not None:
+            return accessor()
+        try:
+            inputs, key = self._input_map[name]
+        except KeyError:
+            raise KeyError('no signal named %s' % name)
+        return inputs[key]
+
+    def get_subaddress(self, subaddress, address):
+        """Computes the value of the given `SubAddress` for the given internal
+        address."""
+        value = 0
+        for component in subaddress.components:
+            target = component.target
+            if isinstance(component, SubAddress.BLANK):
+                continue
+            if isinstance(component, SubAddress.ADDRESS):
+                bits = address >> component.source.low
+            else:
+                bits = self._signals[component.internal.use_name]
+                if component.source is not None:
+                    bits >>= component.source.low
+            value |= (bits & ((1 << target.width) - 1)) << target.low
+        return (value + subaddress.offset) & ((1 << subaddress.width) - 1)
+
+    def async_read(self, callback, address, prot=0):
+        """Queues a read request. `callback(data, resp)` is called with
+        integers when the response is returned."""
+        self._read_queue.append((address & 0xFFFFFFFF, prot, callback))
+
+    def async_write(self, callback, address, data, strb=None, prot=0):
+        """Queues a write request. `strb` defaults to all bytes being written.
+        `callback(resp)` is called with an integer when the response is
+        returned."""
+        if strb is None:
+            strb = (1 << (self._bus_width // 8)) - 1
+        strobe = 0
+        for byte in range(self._bus_width // 8):
+            if strb & (1 << byte):
+                strobe |= 0xFF << (byte * 8)
+        self._write_queue.append((
+            address & 0xFFFFFFFF, data & strobe, strobe, prot, callback))
+
+    @staticmethod
+    def _check_resp(resp):
+        """Raises the appropriate `ValueError` for nonzero `resp` codes."""
+        if resp == 2:
+            raise ValueError('slave error')
+        if resp == 3:
+            raise ValueError('decode error')
+
+    def _wait(self, result, timeout):
+        """Simulates until `result` is nonempty, raising a `TimeoutError` if
+        this takes more than `timeout` cycles."""
+        for _ in range(timeout):
+            self._step(False)
+            if result:
+                return
+        raise TimeoutError('timeout while waiting for bus response')
+
+    def read(self, address, prot=0, timeout=1000):
+        """Performs a read, returning the data as an integer. A `ValueError`
+        is raised when the response code is nonzero."""
+        result = []
+        self.async_read(lambda data, resp: result.append((data, resp)), address, prot)
+        self._wait(result, timeout)
+        data, resp = result[0]
+        self._check_resp(resp)
+        return data
+
+    def write(self, address, data, strb=None, prot=0, timeout=1000):
+        """Performs a write. A `ValueError` is raised when the response code
+        is nonzero."""
+        result = []
+        self.async_write(result.append, address, data, strb, prot)
+        self._wait(result, timeout)
+        self._check_resp(result[0])
+
+    def clock(self, cycles=1):
+        """Simulates the given number of cycles."""
+        for _ in range(cycles):
+            self._step(False)
+
+    def reset(self):
+        """Simulates a reset cycle. Requests that were not yet accepted remain
+        queued, but outstanding deferred requests are dropped."""
+        self._step(True)
+
+    def _internal_address(self, address):
+        """Concatenates the internal signals that form the internal address to
+        the given bus address."""
+        for name, mask, offset in self._address_signals:
+            address |= (self._signals[name] & mask) << offset
+        return address
+
+    @staticmethod
+    def _decode(blocks, cache, address):
+        """Returns the `_BlockModel` for the given internal address, or `None`
+        if there is no such block."""
+        try:
+            return cache[address]
+        except KeyError:
+            pass
+        result = None
+        for block in blocks:
+            if address & block.mask == block.address:
+                result = block
+                break
+        cache[address] = result
+        return result
+
+    def _step(self, reset):
+        """Simulates a single cycle."""
+        self._cycle += 1
+        signals = self._signals
+
+        # Connect internal signal input/strobe ports.
+        for name, drive_name, mask, strobe in self._internal_inputs:
+            if strobe:
+                signals[drive_name] |= self._port_inputs[name] & mask
+            else:
+                signals[drive_name] = self._port_inputs[name] & mask
+
+        # Handle interrupts.
+        if self._interrupts:
+            state = self._interrupt_state
+            req = 0
+            for (inputs, key), offset, mask, active in self._interrupts:
+                value = (inputs[key] << offset) & mask
+                raw = state.raw & mask
+                if active == 'rising':
+                    req |= value & ~raw
+                elif active == 'falling':
+                    req |= raw & ~value
+                elif active == 'edge':
+                    req |= value ^ raw
+                elif active == 'high':
+                    req |= value
+                else:
+                    req |= ~value & mask
+                state.raw = (state.raw & ~mask) | value
+            state.flag &= self._strobe_mask
+            state.flag |= req & state.enab
+            self._irq = int(bool(state.flag & state.umsk))
+
+        # Handle the field logic and bus accesses.
+        for field_model in self._pre_fields:
+            field_model.pre()
+        if not reset:
+            if self._read_queue or self._read_tags:
+                self._handle_read()
+            if self._write_queue or self._write_tags:
+                self._handle_write()
+        for field_model in self._fields.values() if reset else self._post_fields:
+            field_model.post(reset)
+
+        # Clear the holding registers at the end of multi-word accesses.
+        if not self._w_multi:
+            self._w_hstb = 0
+            if self._harden:
+                self._w_hold = 0
+        if not self._r_multi and self._harden:
+            self._r_hold = 0
+
+        # Handle strobe internal signals.
+        for drive_name, use_name in self._strobe_internals:
+            signals[use_name] = signals[drive_name]
+            signals[drive_name] = 0
+
+        # Handle reset for everything that is not owned by the fields.
+        if reset:
+            for internal in self._regfile.internals:
+                signals[internal.use_name] = 0
+            self._read_tags.clear()
+            self._write_tags.clear()
+            self._read_pending.clear()
+            self._write_pending.clear()
+            self._r_hold = 0
+            self._r_multi = 0
+            self._r_prot = 0
+            self._w_hold = 0
+            self._w_hstb = 0
+            self._w_multi = 0
+            self._w_prot = 0
+            self._interrupt_state.flag = 0
+            self._interrupt_state.enab = self._enab_reset
+            self._interrupt_state.umsk = self._umsk_reset
+
+    def _handle_read(self):
+        """Handles the read request and deferred read response logic for the
+        current cycle."""
+        queue = self._read_queue
+        tags = self._read_tags
+        req = lreq = False
+        if queue:
+            if not tags:
+                req = True
+            elif len(tags) < self._max_outstanding:
+                lreq = True
+        rreq = bool(tags)
+
+        address = prot = callback = None
+        if req or lreq:
+            address, prot, callback = queue[0]
+            address = self._internal_address(address)
+
+            # Hardening against privilege escalation.
+            if self._harden and self._r_multi and _prot_escalates(prot, self._r_prot):
+                if req:
+                    queue.popleft()
+                    callback(0, 2)
+                req = lreq = False
+        access = Access(req, lreq, prot, address)
+        data = 0
+
+        # Handle the request.
+        block = None
+        if req or lreq:
+            if req:
+                self._r_prot = prot
+            block = self._decode(self._read_blocks, self._read_cache, address)
+            if block is not None and (req or block.deferring):
+                if req and block.index == 0:
+                    self._r_hold = 0
+                for field_model, low, mask, prot_mask, prot_value in block.fields:
+                    if prot & prot_mask != prot_value:
+                        continue
+                    value = field_model.read(access)
+                    if req:
+                        self._r_hold |= (value & mask) << low
+                if req:
+                    data = self._read_block(block, access)
+
+        # Handle the response for the oldest deferred request.
+        if rreq:
+            tag = tags[0]
+            self._r_hold = 0
+            for field_model, low, mask, _, _ in tag.fields:
+                self._r_hold |= (field_model.read_response(access) & mask) << low
+            data = self._read_block(tag, access)
+
+        # Perform the action dictated by the field logic.
+        if (req and not access.block) or access.defer:
+            queue.popleft()
+            self._read_pending.append(callback)
+        if access.defer:
+            tags.append(block)
+        if rreq and not access.block:
+            tags.popleft()
+        if (rreq or (req and not access.defer)) and not access.block:
+            if access.nack:
+                self._read_pending.popleft()(0, 2)
+            elif access.ack:
+                self._read_pending.popleft()(data, 0)
+            else:
+                self._read_pending.popleft()(0, 3)
+
+    def _read_block(self, block, access):
+        """Handles the block-level logic for a read response from the given
+        block, returning the bus word."""
+        if block.count > 1:
+            if block.index == 0:
+                self._r_multi = 1
+            elif self._r_multi:
+                access.ack = True
+            else:
+                access.nack = True
+        if block.index == block.count - 1:
+            self._r_multi = 0
+        return (self._r_hold >> block.shift) & self._bus_mask
+
+    def _handle_write(self):
+        """Handles the write request and deferred write response logic for the
+        current cycle."""
+        queue = self._write_queue
+        tags = self._write_tags
+        req = lreq = False
+        if queue:
+            if not tags:
+                req = True
+            elif len(tags) < self._max_outstanding:
+                lreq = True
+        rreq = bool(tags)
+
+        address = prot = callback = None
+        if req or lreq:
+            address, data, strobe, prot, callback = queue[0]
+            address = self._internal_address(address)
+
+            # Hardening against privilege escalation.
+            if self._harden and self._w_multi and _prot_escalates(prot, self._w_prot):
+                if req:
+                    queue.popleft()
+                    callback(2)
+                req = lreq = False
+        access = Access(req, lreq, prot, address)
+
+        # Handle the request.
+        block = None
+        if req or lreq:
+            if req:
+                self._w_prot = prot
+            block = self._decode(self._write_blocks, self._write_cache, address)
+            if block is not None:
+                word_mask = self._bus_mask << block.shift
+                self._w_hold = (self._w_hold & ~word_mask) | (data << block.shift)
+                self._w_hstb = (self._w_hstb & ~word_mask) | (strobe << block.shift)
+                self._w_multi = int(block.index < block.count - 1)
+                if req and self._w_multi:
+                    access.ack = True
+                if req or block.deferring:
+                    for field_model, low, mask, prot_mask, prot_value in block.fields:
+                        if prot & prot_mask != prot_value:
+                            continue
+                        field_model.write(
+                            access, (self._w_hold >> low) & mask,
+                            (self._w_hstb >> low) & mask)
+
+        # Handle the response for the oldest deferred request.
+        if rreq:
+            for field_model, _, _, _, _ in tags[0].fields:
+                field_model.write_response(access)
+
+        # Perform the action dictated by the field logic.
+        if (req and not access.block) or access.defer:
+            queue.popleft()
+            self._write_pending.append(callback)
+        if access.defer:
+            tags.append(block)
+        if rreq and not access.block:
+            tags.popleft()
+        if (rreq or (req and not access.defer)) and not access.block:
+            if access.nack:
+                self._write_pending.popleft()(2)
+            elif access.ack:
+                self._write_pending.popleft()(0)
+            else:
+                self._write_pending.popleft()(3)
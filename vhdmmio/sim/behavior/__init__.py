@@ -0,0 +1,6 @@
+"""Submodule for the field behavior models."""
+
+from .base import Access, FieldModel
+from .primitive import PrimitiveFieldModel
+from .interrupt import InterruptFieldModel
+from .axi import AxiSlaveModel, AxiFieldModel
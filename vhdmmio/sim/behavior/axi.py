@@ -0,0 +1,110 @@
+"""Submodule for the AXI field behavior model."""
+
+from collections import deque
+from ...core.behavior import AxiBehavior
+from .base import FieldModel, field_model
+
+
+class AxiSlaveModel:
+    """Default model for the AXI4-lite slave connected to an AXI field. It
+    behaves like a memory that responds after `latency` cycles. Derive from
+    this class and override `handle_read()` and/or `handle_write()` to model
+    something else, and assign an instance to the `slave` attribute of the
+    field model. `irq` is the value of the interrupt signal passed along with
+    the bus."""
+
+    def __init__(self, bus_width):
+        super().__init__()
+        self.bus_width = bus_width
+        self.latency = 1
+        self.memory = {}
+        self.irq = 0
+
+    def handle_read(self, address, prot): #pylint: disable=W0613
+        """Handles a read request. Returns a two-tuple of the read data and the
+        AXI4 response code as integers."""
+        return self.memory.get(address, 0), 0
+
+    def handle_write(self, address, data, strb, prot): #pylint: disable=W0613
+        """Handles a write request. Returns the AXI4 response code as an
+        integer."""
+        mask = 0
+        for byte in range(self.bus_width // 8):
+            if strb & (1 << byte):
+                mask |= 0xFF << (byte * 8)
+        self.memory[address] = (self.memory.get(address, 0) & ~mask) | (data & mask)
+        return 0
+
+
+@field_model(AxiBehavior)
+class AxiFieldModel(FieldModel):
+    """Model of an AXI field. Requests are passed on to the `slave` object,
+    which defaults to an `AxiSlaveModel`, at the moment they are deferred.
+    The responses are returned in order once the latency of the slave has
+    passed."""
+
+    deferring = True
+
+    def __init__(self, model, field):
+        super().__init__(model, field)
+        behavior = field.behavior
+        self._behavior = behavior
+        self._width = field.descriptor.base_bitrange.width
+        self._sub_low = self._width.bit_length() - 4
+        self.slave = AxiSlaveModel(self._width)
+        self._reads = deque()
+        self._writes = deque()
+        self.has_pre = behavior.interrupt_internal is not None
+
+    def _child_address(self, access):
+        """Returns the address for the child bus for the given access."""
+        subaddress = self._model.get_subaddress(self._field.subaddress, access.address)
+        return (subaddress << self._sub_low) & 0xFFFFFFFF
+
+    def pre(self):
+        self.drive_flag(self._behavior.interrupt_internal, self.slave.irq & 1)
+
+    def post(self, reset):
+        if reset:
+            self._reads.clear()
+            self._writes.clear()
+
+    def read(self, access):
+        data, resp = self.slave.handle_read(self._child_address(access), access.prot)
+        self._reads.append((self._model.cycle + self.slave.latency, data, resp))
+        access.defer = True
+        return 0
+
+    def write(self, access, data, strobe):
+        strb = 0
+        for byte in range(self._width // 8):
+            if strobe & (1 << (byte * 8)):
+                strb |= 1 << byte
+        resp = self.slave.handle_write(
+            self._child_address(access), data, strb, access.prot)
+        self._writes.append((self._model.cycle + self.slave.latency, resp))
+        access.defer = True
+
+    @staticmethod
+    def _respond(access, resp):
+        """Updates the response flags of `access` based on the AXI4 response
+        code of the slave."""
+        if resp == 0:
+            access.ack = True
+        elif resp != 3:
+            access.nack = True
+
+    def read_response(self, access):
+        if not self._reads or self._reads[0][0] > self._model.cycle:
+            access.block = True
+            return 0
+        _, data, resp = self._reads.popleft()
+        self._respond(access, resp)
+        return data
+
+    def write_response(self, access):
+        if not self._writes or self._writes[0][0] > self._model.cycle:
+            access.block = True
+            return
+        _, resp = self._writes.popleft()
+        self._respond(access, resp)
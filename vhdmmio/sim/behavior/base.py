@@ -0,0 +1,154 @@
+"""Contains the base class for field behavior models."""
+
+_FIELD_MODEL_CLASS_MAP = []
+
+
+def field_model(behavior_cls):
+    """Decorator generator which registers a field model class."""
+    def decorator(model_cls):
+        _FIELD_MODEL_CLASS_MAP.append((behavior_cls, model_cls))
+        return model_cls
+    return decorator
+
+
+class Access:
+    """Represents the bus access that is being handled in the current cycle.
+    The attributes mirror the request and response variables of the generated
+    VHDL code:
+
+     - `req`: a normal request is being handled.
+     - `lreq`: a lookahead request is being handled; only deferring fields
+       handle these.
+     - `prot`: the `prot` field of the request as an integer.
+     - `address`: the internal address of the request, which includes any
+       paging/condition bits.
+     - `ack`, `nack`, `block`, and `defer`: set by the field models to
+       indicate how the request should be responded to.
+    """
+
+    __slots__ = ('req', 'lreq', 'prot', 'address', 'ack', 'nack', 'block', 'defer')
+
+    def __init__(self, req, lreq, prot, address):
+        super().__init__()
+        self.req = req
+        self.lreq = lreq
+        self.prot = prot
+        self.address = address
+        self.ack = False
+        self.nack = False
+        self.block = False
+        self.defer = False
+
+
+class FieldModel:
+    """Base class for the Python models of the fields of a register file. Each
+    instance models a single field; repeated fields are modeled using one
+    instance per field index."""
+
+    # Whether accesses to this field can be deferred. Only deferring fields
+    # are passed lookahead requests, and they must implement the
+    # `read_response()` and/or `write_response()` methods.
+    deferring = False
+
+    # Whether the `pre()` and `post()` methods need to be called every cycle.
+    # The `post()` method is always called during reset.
+    has_pre = False
+    has_post = False
+
+    def __init__(self, model, field):
+        super().__init__()
+        self._model = model
+        self._field = field
+        self._signals = model.signals
+        self._inputs = {}
+
+    @staticmethod
+    def construct(model, field):
+        """Constructs a `FieldModel` class instance based on the behavior of
+        the given `Field`."""
+        for behavior_cls, model_cls in _FIELD_MODEL_CLASS_MAP:
+            if isinstance(field.behavior, behavior_cls):
+                return model_cls(model, field)
+        raise TypeError(
+            'no mapping exists from type %s to a FieldModel subclass'
+            % type(field.behavior).__name__)
+
+    @property
+    def field(self):
+        """The `Field` that this object is modeling."""
+        return self._field
+
+    @property
+    def inputs(self):
+        """Mapping from the names of the input signals of this field to their
+        current values as integers."""
+        return self._inputs
+
+    def add_input(self, name):
+        """Registers an input signal for this field, initialized to zero."""
+        self._inputs[name] = 0
+
+    def get_output(self, name):
+        """Returns the current value of the given output signal as an integer.
+        Raises a `KeyError` if there is no such output."""
+        raise KeyError(name)
+
+    def drive_flag(self, internal, value):
+        """Drives the bit of the given flag internal signal belonging to this
+        field, which is the internal itself if it is scalar, or the bit indexed
+        by the field index otherwise."""
+        name = internal.drive_name
+        if internal.is_vector():
+            bit = 1 << self._field.index
+            if value:
+                self._signals[name] |= bit
+            else:
+                self._signals[name] &= ~bit
+        else:
+            self._signals[name] = value
+
+    def strobe_flag(self, internal):
+        """Asserts the bit of the given flag internal signal belonging to this
+        field."""
+        name = internal.drive_name
+        if internal.is_vector():
+            self._signals[name] |= 1 << self._field.index
+        else:
+            self._signals[name] = 1
+
+    def use_flag(self, internal):
+        """Returns the bit of the given flag internal signal belonging to this
+        field."""
+        value = self._signals[internal.use_name]
+        if internal.is_vector():
+            return (value >> self._field.index) & 1
+        return value
+
+    def pre(self):
+        """Handles the logic that precedes bus accesses. Only called when
+        `has_pre` is set."""
+
+    def post(self, reset):
+        """Handles the logic that follows bus accesses, including reset. Only
+        called when `has_post` is set, or when `reset` is set."""
+
+    def read(self, access):
+        """Handles a read access to this field, returning the read data as an
+        integer. The flags of the `Access` object should be updated to indicate
+        the result."""
+        raise NotImplementedError()
+
+    def write(self, access, data, strobe):
+        """Handles a write access to this field. The flags of the `Access`
+        object should be updated to indicate the result."""
+        raise NotImplementedError()
+
+    def read_response(self, access):
+        """Handles the response for a deferred read, returning the read data
+        as an integer. Only called for deferring fields."""
+        raise NotImplementedError()
+
+    def write_response(self, access):
+        """Handles the response for a deferred write. Only called for deferring
+        fields."""
+        raise NotImplementedError()
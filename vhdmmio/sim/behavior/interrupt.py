@@ -0,0 +1,60 @@
+"""Submodule for the interrupt field behavior model."""
+
+from ...core.behavior import InterruptBehavior
+from .base import FieldModel, field_model
+
+@field_model(InterruptBehavior)
+class InterruptFieldModel(FieldModel):
+    """Model of an interrupt field. The state of the interrupt is owned by the
+    `InterruptModel`s of the register file model; this class only operates on
+    the bit belonging to this field."""
+
+    def __init__(self, model, field):
+        super().__init__(model, field)
+        cfg = field.behavior.cfg
+        self._cfg = cfg
+        self._irq = model.interrupt_state
+        self._bit = 1 << (field.behavior.interrupt.offset + field.index)
+        self._register = {
+            'raw': 'raw',
+            'enable': 'enab',
+            'flag': 'flag',
+            'unmask': 'umsk',
+            'masked': None,
+        }[cfg.mode]
+
+    def _get(self):
+        """Returns the current value of the interrupt bit for this field."""
+        if self._register is None:
+            value = self._irq.flag & self._irq.umsk
+        else:
+            value = getattr(self._irq, self._register)
+        return int(bool(value & self._bit))
+
+    def _set(self, value):
+        """Updates the interrupt bit for this field."""
+        current = getattr(self._irq, self._register)
+        if value:
+            current |= self._bit
+        else:
+            current &= ~self._bit
+        setattr(self._irq, self._register, current)
+
+    def read(self, access):
+        data = self._get()
+        if self._cfg.bus_read == 'clear':
+            self._set(0)
+        access.ack = True
+        return data
+
+    def write(self, access, data, strobe):
+        bus_write = self._cfg.bus_write
+        if bus_write == 'enabled':
+            self._set((self._get() and not strobe) or data)
+        elif bus_write == 'clear':
+            if data:
+                self._set(0)
+        elif bus_write == 'set':
+            if data:
+                self._set(1)
+        access.ack = True
@@ -0,0 +1,327 @@
+"""Submodule for the primitive field behavior model."""
+
+from types import SimpleNamespace
+from ...core.behavior import PrimitiveBehavior
+from .base import FieldModel, field_model
+
+@field_model(PrimitiveBehavior)
+class PrimitiveFieldModel(FieldModel):
+    """Model of a primitive field. Follows the logic of
+    `vhdl/behavior/primitive.template.vhd` line by line."""
+
+    def __init__(self, model, field):
+        super().__init__(model, field)
+        behavior = field.behavior
+        self._behavior = behavior
+
+        # Take a snapshot of the configuration and the internal signals; the
+        # property accessors of the configurable are too slow to query every
+        # cycle.
+        cfg = SimpleNamespace(**{
+            loader.key.replace('-', '_'): getattr(behavior.cfg, loader.key.replace('-', '_'))
+            for loader in behavior.cfg.loaders})
+        self._cfg = cfg
+        for internal in (
+                'drive', 'full', 'empty', 'monitor', 'overflow', 'underflow',
+                'bit_overflow', 'bit_underflow', 'overrun', 'underrun'):
+            internal += '_internal'
+            setattr(self, '_' + internal, getattr(behavior, internal))
+
+        width = field.descriptor.base_bitrange.width
+        self._width = width
+        self._mask = (1 << width) - 1
+
+        # The accumulator is width + 3 bits wide, like in the VHDL code; the
+        # two bits above the data indicate overflow/underflow and the MSB
+        # indicates which of the two occurred.
+        self._accum = (
+            cfg.hw_write in ('accumulate', 'subtract')
+            or cfg.bus_write in ('accumulate', 'subtract')
+            or cfg.after_bus_read in ('increment', 'decrement')
+            or cfg.ctrl_increment
+            or cfg.ctrl_decrement
+            or cfg.monitor_mode == 'increment')
+        self._accum_mask = (1 << (width + 3)) - 1
+
+        # Register the input signals.
+        if cfg.ctrl_ready:
+            self.add_input('ready')
+        if cfg.hw_write not in ('disabled', 'stream'):
+            self.add_input('write_data')
+            if cfg.hw_write != 'status':
+                self.add_input('write_enable')
+        if cfg.hw_write == 'stream':
+            self.add_input('valid')
+            self.add_input('data')
+        for ctrl_signal in ['lock', 'validate', 'invalidate',
+                            'clear', 'reset', 'increment', 'decrement',
+                            'bit_set', 'bit_clear', 'bit_toggle']:
+            if getattr(cfg, 'ctrl_%s' % ctrl_signal):
+                self.add_input(ctrl_signal)
+
+        # Figure out the output signals.
+        self._outputs = set()
+        if cfg.hw_read not in ('disabled', 'handshake', 'simple'):
+            self._outputs.add('valid')
+        if cfg.hw_read not in ('disabled', 'handshake'):
+            self._outputs.add('data')
+        if cfg.hw_read == 'handshake':
+            self._outputs.add('ready')
+
+        # Determine the reset value.
+        if cfg.reset == 'generic':
+            self._reset_data = model.generics.get(field.name, 0) & self._mask
+            self._reset_valid = 1
+        elif cfg.reset is None:
+            self._reset_data = 0
+            self._reset_valid = 0
+        else:
+            self._reset_data = int(cfg.reset) & self._mask
+            self._reset_valid = 1
+
+        # Determine whether the per-cycle logic is needed.
+        self.has_pre = (
+            self._accum
+            or cfg.hw_write != 'disabled'
+            or cfg.after_bus_write == 'invalidate'
+            or behavior.monitor_internal is not None
+            or any(getattr(cfg, 'ctrl_%s' % ctrl_signal) for ctrl_signal in (
+                'ready', 'validate', 'invalidate', 'clear',
+                'bit_set', 'bit_clear', 'bit_toggle')))
+        self.has_post = (
+            self._accum
+            or cfg.ctrl_reset
+            or behavior.drive_internal is not None
+            or behavior.full_internal is not None
+            or behavior.empty_internal is not None)
+
+        # Internal state.
+        self._data = 0
+        self._valid = 0
+        self._accumulator = 0
+        self._inval = 0
+
+    @property
+    def data(self):
+        """The current value of the data register of this field."""
+        return self._data
+
+    @property
+    def valid(self):
+        """The current value of the valid flag of this field."""
+        return self._valid
+
+    def get_output(self, name):
+        """Returns the current value of the given output signal as an integer.
+        Raises a `KeyError` if there is no such output."""
+        if name not in self._outputs:
+            raise KeyError(name)
+        if name == 'data':
+            return self._data
+        if name == 'valid':
+            return self._valid
+        return 1 - self._valid
+
+    def _accum_add(self, value):
+        """Adds the given value to the accumulator."""
+        self._accumulator = (self._accumulator + value) & self._accum_mask
+
+    def _accum_sub(self, value):
+        """Subtracts the given value from the accumulator."""
+        self._accumulator = (self._accumulator - value) & self._accum_mask
+
+    def _bit_set(self, value):
+        """Sets the bits in `value`, handling the bit overflow internal."""
+        internal = self._bit_overflow_internal
+        if internal is not None and self._data & value:
+            self.strobe_flag(internal)
+        self._data |= value
+
+    def _bit_clear(self, value):
+        """Clears the bits in `value`, handling the bit underflow internal."""
+        internal = self._bit_underflow_internal
+        if internal is not None and value & ~self._data:
+            self.strobe_flag(internal)
+        self._data &= ~value
+
+    def pre(self):
+        cfg = self._cfg
+        inputs = self._inputs
+        mask = self._mask
+
+        if self._accum:
+            self._accumulator = 0
+
+        if cfg.ctrl_invalidate and inputs['invalidate']:
+            self._data = 0
+            self._valid = 0
+
+        if cfg.ctrl_ready and inputs['ready']:
+            self._data = 0
+            self._valid = 0
+
+        if cfg.ctrl_clear and inputs['clear']:
+            self._data = 0
+
+        if cfg.after_bus_write == 'invalidate':
+            if self._inval:
+                self._data = 0
+                self._valid = 0
+            self._inval = 0
+
+        hw_write = cfg.hw_write
+        if hw_write == 'status':
+            self._data = inputs['write_data'] & mask
+            self._valid = 1
+        elif hw_write == 'stream':
+            if inputs['valid'] and not self._valid:
+                self._data = inputs['data'] & mask
+                if cfg.after_hw_write == 'validate':
+                    self._valid = 1
+        elif hw_write != 'disabled':
+            if inputs['write_enable']:
+                write_data = inputs['write_data'] & mask
+                if hw_write == 'enabled':
+                    self._data = write_data
+                elif hw_write == 'accumulate':
+                    self._accum_add(write_data)
+                elif hw_write == 'subtract':
+                    self._accum_sub(write_data)
+                elif hw_write == 'set':
+                    self._bit_set(write_data)
+                elif hw_write == 'reset':
+                    self._bit_clear(write_data)
+                elif hw_write == 'toggle':
+                    self._data ^= write_data
+                if cfg.after_hw_write == 'validate':
+                    self._valid = 1
+
+        if cfg.ctrl_validate and inputs['validate']:
+            self._valid = 1
+
+        if cfg.ctrl_increment:
+            self._accum_add(inputs['increment'] & 1)
+
+        if cfg.ctrl_decrement:
+            self._accum_sub(inputs['decrement'] & 1)
+
+        if cfg.ctrl_bit_set:
+            self._bit_set(inputs['bit_set'] & mask)
+
+        if cfg.ctrl_bit_clear:
+            self._bit_clear(inputs['bit_clear'] & mask)
+
+        if cfg.ctrl_bit_toggle:
+            self._data ^= inputs['bit_toggle'] & mask
+
+        internal = self._monitor_internal
+        if internal is not None:
+            if cfg.monitor_mode == 'status':
+                self._data = self._signals[internal.use_name]
+            elif cfg.monitor_mode == 'bit-set':
+                self._bit_set(self._signals[internal.use_name])
+            elif cfg.monitor_mode == 'increment':
+                if self.use_flag(internal):
+                    self._accum_add(1)
+
+    def read(self, access):
+        cfg = self._cfg
+        internal = self._underrun_internal
+        if internal is not None and not self._valid:
+            self.strobe_flag(internal)
+
+        if cfg.bus_read == 'error':
+            access.nack = True
+            return 0
+
+        data = self._data
+        if cfg.bus_read in ('valid-wait', 'valid-only') and not self._valid:
+            if cfg.bus_read == 'valid-wait':
+                access.block = True
+            else:
+                access.nack = True
+            return data
+
+        access.ack = True
+        after_bus_read = cfg.after_bus_read
+        if after_bus_read in ('invalidate', 'clear'):
+            self._data = 0
+            if after_bus_read == 'invalidate':
+                self._valid = 0
+        elif after_bus_read == 'increment':
+            self._accum_add(1)
+        elif after_bus_read == 'decrement':
+            self._accum_sub(1)
+        return data
+
+    def write(self, access, data, strobe):
+        cfg = self._cfg
+        if cfg.ctrl_lock and self._inputs['lock']:
+            return
+
+        internal = self._overrun_internal
+        if internal is not None and self._valid:
+            self.strobe_flag(internal)
+
+        bus_write = cfg.bus_write
+        if bus_write == 'error':
+            access.nack = True
+            return
+        if bus_write.startswith('invalid'):
+            if self._valid:
+                if bus_write == 'invalid':
+                    access.ack = True
+                elif bus_write == 'invalid-wait':
+                    access.block = True
+                else:
+                    access.nack = True
+                return
+            self._data = data
+        elif bus_write == 'enabled':
+            self._data = data
+        elif bus_write == 'masked':
+            self._data = (self._data & ~strobe) | data
+        elif bus_write == 'accumulate':
+            self._accum_add(data)
+        elif bus_write == 'subtract':
+            self._accum_sub(data)
+        elif bus_write == 'bit-set':
+            self._bit_set(data)
+        elif bus_write == 'bit-clear':
+            self._bit_clear(data)
+        elif bus_write == 'bit-toggle':
+            self._data ^= data
+        access.ack = True
+
+        if cfg.after_bus_write == 'validate':
+            self._valid = 1
+        elif cfg.after_bus_write == 'invalidate':
+            self._valid = 1
+            self._inval = 1
+
+    def post(self, reset):
+        cfg = self._cfg
+
+        if self._accum:
+            self._accum_add(self._data)
+            self._data = self._accumulator & self._mask
+            flags = self._accumulator >> self._width
+            if flags & 3:
+                if flags & 4:
+                    if self._underflow_internal is not None:
+                        self.strobe_flag(self._underflow_internal)
+                elif self._overflow_internal is not None:
+                    self.strobe_flag(self._overflow_internal)
+
+        if cfg.hw_write != 'status':
+            if reset or (cfg.ctrl_reset and self._inputs['reset']):
+                self._data = self._reset_data
+                self._valid = self._reset_valid
+                self._inval = 0
+
+        if self._drive_internal is not None:
+            self._signals[self._drive_internal.drive_name] = self._data
+        if self._full_internal is not None:
+            self.drive_flag(self._full_internal, self._valid)
+        if self._empty_internal is not None:
+            self.drive_flag(self._empty_internal, 1 - self._valid)
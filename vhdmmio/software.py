@@ -0,0 +1,100 @@
+"""Module with helper classes shared by the software driver generators."""
+
+class SoftwareRegister:
+    """Describes how software should access a `LogicalRegister`: its width,
+    the fields that are accessible through it, and how a single field can be
+    written without disturbing the other fields."""
+
+    def __init__(self, register):
+        super().__init__()
+        self._register = register
+        bus_width = register.regfile.cfg.features.bus_width
+        self._bus_width = bus_width
+        self._width = bus_width * len(register.blocks)
+
+        # Registers that map a range of addresses (for instance AXI fields)
+        # are windows into another address space rather than registers.
+        span = (~register.blocks[0].address.mask & 0xFFFFFFFF) + 1
+        self._span = span if span > bus_width // 8 else None
+
+    @property
+    def register(self):
+        """The `LogicalRegister` described by this object."""
+        return self._register
+
+    @property
+    def bus_width(self):
+        """The width of the bus words in bits."""
+        return self._bus_width
+
+    @property
+    def width(self):
+        """The width of the logical register in bits."""
+        return self._width
+
+    @property
+    def offset(self):
+        """The byte offset of the first block of this register."""
+        return self._register.blocks[0].address.address
+
+    @property
+    def span(self):
+        """The size in bytes of the address range mapped by this register if
+        it is a window into another address space, or `None` if it is a
+        normal register."""
+        return self._span
+
+    @staticmethod
+    def field_mask(field):
+        """Returns the mask for the given field within the logical
+        register."""
+        return ((1 << field.bitrange.width) - 1) << field.bitrange.low
+
+    def readable_fields(self):
+        """Returns the fields that are readable through this register."""
+        if not self._register.can_read():
+            return []
+        return [field for field in self._register.fields if field.behavior.bus.can_read()]
+
+    def writable_fields(self):
+        """Returns the fields that are writable through this register."""
+        if not self._register.can_write():
+            return []
+        return [field for field in self._register.fields if field.behavior.bus.can_write()]
+
+    def is_read_no_op(self):
+        """Returns whether reading this register has no side effects."""
+        return all(field.behavior.bus.is_read_no_op() for field in self.readable_fields())
+
+    def preserve_mask(self):
+        """Returns the mask of the bits belonging to writable fields that
+        cannot be masked out by writing zero, and therefore need to be
+        preserved through a read-modify-write when they are not written."""
+        preserve = 0
+        for field in self.writable_fields():
+            if not field.behavior.bus.can_mask_with_zero():
+                preserve |= self.field_mask(field)
+        return preserve
+
+    def can_preserve(self):
+        """Returns whether the bits in `preserve_mask()` can be preserved
+        through a read-modify-write without side effects."""
+        return (
+            self._register.can_read()
+            and self.is_read_no_op()
+            and all(
+                field.behavior.bus.can_mask_with_rmw()
+                for field in self.writable_fields()
+                if not field.behavior.bus.can_mask_with_zero()))
+
+    def keep_mask(self, fields):
+        """Determines how the given fields can be written together without
+        affecting the other fields in the register. Returns `None` if this is
+        not possible at all, or the mask of the bits that need to be preserved
+        through a read-modify-write otherwise (zero if no read is needed)."""
+        keep = self.preserve_mask()
+        for field in fields:
+            keep &= ~self.field_mask(field)
+        if keep and not self.can_preserve():
+            return None
+        return keep
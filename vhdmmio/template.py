@@ -3,8 +3,16 @@
 import os
 import re
 import inspect
+import ast
+import functools
+import itertools
+from collections import namedtuple
+from .utils import write_if_changed, write_lines_if_changed
+from . import profiling
 
-__all__ = ['TemplateEngine', 'TemplateSyntaxError', 'annotate_block']
+__all__ = [
+    'TemplateEngine', 'TemplateSyntaxError', 'CompiledTemplate',
+    'compile_template', 'annotate_block']
 
 class TemplateEngine:
     """Simple templating engine.
@@ -112,9 +120,10 @@ class TemplateEngine:
         if args:
             code += '\n' + '\n'.join(args)
 
-        # Blocks can contain directives and are internally stored as directive
-        # lists. So split the code into directives now.
-        directives = self._split_directives(code)
+        # Blocks can contain directives and are internally stored as compiled
+        # directive lists. So split and compile the code now.
+        directives = _compile_directives(code)
+        profiling.count('template blocks')
 
         # Save the block.
         key = str(key)
@@ -128,31 +137,55 @@ class TemplateEngine:
         if key in self._blocks:
             del self._blocks[key]
 
-    def apply_file_to_file(self, template_filename, output_filename, *args, **kwargs):
+    def apply_file_to_file(self, template_filename, output_filename, *args,
+                           stream=False, **kwargs):
         """Applies this template engine to the given template file, writing the
-        result to the given output file. Extra arguments are passed to
-        `apply_str_to_str()` and are documented there."""
-        output = self.apply_file_to_str(template_filename, *args, **kwargs)
-        with open(output_filename, 'w', encoding="utf-8") as output_file:
-            output_file.write(output)
+        result to the given output file. The file is only written if its
+        contents would change. Returns whether the file was written. If
+        `stream` is set, the output is written line by line as it is produced
+        using `apply_str_to_lines()`, instead of being built in memory first.
+        Extra arguments are passed to `apply_str_to_str()` or
+        `apply_str_to_lines()` and are documented there."""
+        if not stream:
+            output = self.apply_file_to_str(template_filename, *args, **kwargs)
+            return write_if_changed(output_filename, output)
+        template = self._load_template_file(template_filename, **kwargs)
+        try:
+            return write_lines_if_changed(
+                output_filename, self.apply_str_to_lines(template, *args, **kwargs))
+        except TemplateSyntaxError as exc:
+            exc.set_filename(template_filename)
+            raise
 
-    def apply_str_to_file(self, template, output_filename, *args, **kwargs):
+    def apply_str_to_file(self, template, output_filename, *args,
+                          stream=False, **kwargs):
         """Applies this template engine to the given template string, writing the
-        result to the given output file. Extra arguments are passed to
-        `apply_str_to_str()` and are documented there."""
-        output = self.apply_str_to_str(template, *args, **kwargs)
-        with open(output_filename, 'w', encoding="utf-8") as output_file:
-            output_file.write(output)
+        result to the given output file. The file is only written if its
+        contents would change. Returns whether the file was written. If
+        `stream` is set, the output is written line by line as it is produced
+        using `apply_str_to_lines()`, instead of being built in memory first.
+        Extra arguments are passed to `apply_str_to_str()` or
+        `apply_str_to_lines()` and are documented there."""
+        if not stream:
+            output = self.apply_str_to_str(template, *args, **kwargs)
+            return write_if_changed(output_filename, output)
+        return write_lines_if_changed(
+            output_filename, self.apply_str_to_lines(template, *args, **kwargs))
+
+    @staticmethod
+    def _load_template_file(template_filename, comment='#', **_):
+        """Loads, annotates, and compiles the given template file. The
+        compiled template is cached until the file is modified."""
+        return _compile_template_file(
+            template_filename,
+            os.stat(template_filename).st_mtime_ns,
+            comment.strip())
 
     def apply_file_to_str(self, template_filename, *args, **kwargs):
         """Applies this template engine to the given template file, returning
         the result as a string. Extra arguments are passed to
         `apply_str_to_str()` and are documented there."""
-        with open(template_filename, 'r', encoding="utf-8") as template_file:
-            template = annotate_block(
-                template_file.read(),
-                template_filename,
-                kwargs.get('comment', '#').strip())
+        template = self._load_template_file(template_filename, **kwargs)
         try:
             return self.apply_str_to_str(template, *args, **kwargs)
         except TemplateSyntaxError as exc:
@@ -168,29 +201,59 @@ class TemplateEngine:
         of characters per line when wrapping; it defaults to 80. The
         `postprocess` keyword argument can be set to `False` to disable
         post-processing altogether; use this when the output of this templating
-        step will be used within a later templating step."""
-
-        # If the template is specified as a list of strings, join them first.
-        if isinstance(template, list):
-            template = '\n'.join(template)
-
-        # Remove any template indentation, which is separated from output
-        # indentation through pipe symbols.
-        template = re.sub(r'\n *\|', '\n', template)
-
-        # Split the template file into a list of alternating literals and
-        # directives.
-        directives = self._split_directives(template)
+        step will be used within a later templating step. `template` can also
+        be a `CompiledTemplate`, or a list of strings, which is equivalent to
+        passing `'\n'.join(template)`."""
+
+        # Without post-processing, just handle the $ directives.
+        if not postprocess:
+            if not isinstance(template, CompiledTemplate):
+                template = compile_template(template)
+            markers = self._process_directives(template.directives)
+            return '\n'.join(self._process_markers(markers))
+
+        # Join the post-processed lines together and ensure that the file
+        # ends in a single newline.
+        return '\n'.join(self.apply_str_to_lines(
+            template, comment=comment, wrap=wrap, annotate=annotate)) + '\n'
+
+    def apply_str_to_lines(self, template, comment='# ', wrap=80, annotate=False):
+        """Applies this template engine to the given template string, yielding
+        the post-processed output line by line (without newline terminators)
+        as it is produced. Joining the lines with newlines and adding a
+        terminating newline gives the same result as `apply_str_to_str()`.
+        This allows very large outputs to be written to a file without ever
+        having the complete output in memory. The arguments are documented at
+        `apply_str_to_str()`."""
+
+        # Get the compiled form of the template.
+        if not isinstance(template, CompiledTemplate):
+            template = compile_template(template)
+        profiling.count('template expansions')
 
         # Handle $ directives.
-        markers = self._process_directives(directives)
-        output = self._process_markers(markers)
-
-        # Process @ directives to clean up the output.
-        if postprocess:
-            output = self._process_wrapping(output, comment, wrap, annotate)
+        markers = self._process_directives(template.directives)
+        lines = self._process_markers(markers)
+
+        # Process @ directives to clean up the output. Empty lines are held
+        # back until we get another line, such that the output does not end
+        # in empty lines.
+        empty_lines = 0
+        any_lines = False
+        for line in self._process_wrapping(lines, comment, wrap, annotate):
+            if not line:
+                empty_lines += 1
+                continue
+            for _ in range(empty_lines):
+                yield ''
+            empty_lines = 0
+            any_lines = True
+            yield line
 
-        return output
+        # Output a single empty line if there was no output at all, such that
+        # the output still consists of a single newline.
+        if not any_lines:
+            yield ''
 
     @staticmethod
     def _split_directives(template):
@@ -237,24 +300,31 @@ class TemplateEngine:
         return directives
 
     def _process_directives(self, directives, block_recursion_limit=100): #pylint: disable=R0912,R0914,R0915
-        """Process a directive list as returned by `_split_directives()` into a
-        list of literals and markers. Literals and markers are distinguished by
-        type: literals are strings, markers are N-tuples. The first entry of a
+        """Process a compiled directive list as returned by
+        `_compile_directives()` into literals and markers, yielded as they are
+        produced. Literals and markers are distinguished by type: literals are
+        strings, markers are N-tuples. The first entry of a
         marker tuple is a string that identifies what it represents.
 
         Currently the only marker is 'indent'. It's a two-tuple; the second
         entry is an integer representing an indentation delta (number of
         spaces). This indentation needs to be applied to subsequent literals."""
 
-        # Make a copy of the directive list so we can consume it one entry at a
-        # time without affecting the argument.
-        directive_stack = list(directives)
+        # Stack of iterators over directive lists. The bottom iterator runs
+        # over the directive list passed to us; block insertions push an
+        # iterator for the contents of the block. This way, each directive is
+        # handled in constant time regardless of the size of the template,
+        # such that processing time is linear in the size of the output.
+        directive_stack = [iter(directives)]
 
         # Conditional code block stack. For code to be handled, all entries in
         # this list must be True (or there must be zero entries). Each $if
         # directive appends its condition to the list, $else directives invert
-        # the last one, and $endif directives remove from the list.
+        # the last one, and $endif directives remove from the list. The number
+        # of False entries is tracked separately, so we don't have to scan the
+        # stack for every literal.
         condition_stack = []
+        false_conditions = 0
 
         # Line number of the outermost $if statement, used for line number info
         # when we're missing an $endif.
@@ -277,12 +347,18 @@ class TemplateEngine:
         # info when we're missing an $endblock.
         outer_block_line_nr = None
 
-        # Output buffer.
-        output_buffer = []
+        # Scope for evaluating expressions. The variables cannot change while
+        # we're processing, so this only needs to be constructed once. The
+        # results of pure expressions are memoized for the same reason.
+        scope = self._get_scope()
+        memo = {}
 
         # Iterate over all the directives and literals.
         while directive_stack:
-            directive_or_literal = directive_stack.pop(0)
+            directive_or_literal = next(directive_stack[-1], None)
+            if directive_or_literal is None:
+                directive_stack.pop()
+                continue
 
             # Handle literals first.
             if isinstance(directive_or_literal, str):
@@ -295,38 +371,25 @@ class TemplateEngine:
                     continue
 
                 # Delete literals that have been conditioned away.
-                if not all(condition_stack):
+                if false_conditions:
                     continue
 
                 # Output the literal.
-                output_buffer.append(literal)
+                yield literal
                 continue
 
-            # Unpack the directive.
-            directive_tuple = directive_or_literal
-            line_nr, directive = directive_tuple
-
             # Handle markers inserted into the stack by this function.
-            if line_nr is None:
-                marker = directive
+            if not isinstance(directive_or_literal, _Directive):
+                marker = directive_or_literal
                 if marker[0] == 'end_block':
                     block_recursion -= 1
                 else:
-                    output_buffer.append(marker)
+                    yield marker
                 continue
 
-            # Parse/simplify the directive syntax.
-            if directive.endswith('$'):
-                indent = 0
-                directive = directive[1:-1]
-                argument = None
-            else:
-                matches = re.match(r'\$( *)([^ ]*)(?: (.*))?$', directive)
-                indent = len(matches.group(1))
-                if indent:
-                    indent += 1
-                directive = '$' + matches.group(2).rstrip()
-                argument = matches.group(3)
+            # Unpack the precompiled directive.
+            directive_tuple = directive_or_literal
+            line_nr, directive, indent, argument, code = directive_tuple
 
             # Handle $block directive.
             if directive == '$block':
@@ -374,17 +437,19 @@ class TemplateEngine:
                         line_nr, '$if without expression')
                 if not condition_stack:
                     outer_if_line_nr = line_nr
-                if not all(condition_stack):
+                if false_conditions:
                     # Don't try to evaluate the condition if we're already
                     # conditioned away.
                     condition = False
                 else:
                     try:
-                        condition = bool(eval(argument, self._get_scope())) #pylint: disable=W0123
+                        condition = bool(_evaluate(code, scope, memo))
                     except (NameError, ValueError, TypeError, SyntaxError) as exc:
                         raise TemplateSyntaxError(
                             line_nr, 'error in $if expression: {}'.format(exc))
                 condition_stack.append(condition)
+                if not condition:
+                    false_conditions += 1
                 continue
 
             # Handle $else directive.
@@ -396,6 +461,7 @@ class TemplateEngine:
                     raise TemplateSyntaxError(
                         line_nr, '$else without $if')
                 condition_stack[-1] = not condition_stack[-1]
+                false_conditions += -1 if condition_stack[-1] else 1
                 continue
 
             # Handle $endif directive.
@@ -406,27 +472,28 @@ class TemplateEngine:
                 if not condition_stack:
                     raise TemplateSyntaxError(
                         line_nr, '$endif without $if')
-                del condition_stack[-1]
+                if not condition_stack.pop():
+                    false_conditions -= 1
                 continue
 
             # Don't process directives further if we're inside a false conditional
             # block.
-            if not all(condition_stack):
+            if false_conditions:
                 continue
 
             # Handle dollar escape sequences.
             if directive == '':
-                output_buffer.append('$')
+                yield '$'
                 continue
 
             # Handle inline directives.
             if not directive.startswith('$'):
                 try:
-                    result = str(eval(directive, self._get_scope())) #pylint: disable=W0123
+                    result = str(_evaluate(code, scope, memo))
                 except (NameError, ValueError, TypeError, SyntaxError) as exc:
                     raise TemplateSyntaxError(
                         line_nr, 'error in inline expression: {}'.format(exc))
-                output_buffer.append(result)
+                yield result
                 continue
 
             # Handle block insertions.
@@ -437,20 +504,21 @@ class TemplateEngine:
                         line_nr, 'block recursion limit reached ({})'.format(block_recursion_limit))
                 key = directive[1:]
 
-                # Get the blocks associated with the given key, if any.
-                blocks = self._blocks.get(key, [])
-                blocks.extend(block_definitions.get(key, []))
-
-                # Flatten the directive lists.
-                directives = [(None, ('indent', indent))]
-                for block_directives in blocks:
-                    directives.extend(block_directives)
-                    directives.append('\n\n')
-                directives.append((None, ('indent', -indent)))
-                directives.append((None, ('end_block',)))
-
-                # Insert the directives at the start of our directive stack.
-                directive_stack[0:0] = directives
+                # Get the blocks associated with the given key, if any. Take
+                # a snapshot, since the block definitions may be extended
+                # while the blocks are being processed.
+                blocks = (
+                    tuple(self._blocks.get(key, ()))
+                    + tuple(block_definitions.get(key, ())))
+
+                # Push an iterator over the flattened directive lists onto the
+                # directive stack.
+                directive_stack.append(itertools.chain(
+                    (('indent', indent),),
+                    itertools.chain.from_iterable(
+                        itertools.chain(block_directives, ('\n\n',))
+                        for block_directives in blocks),
+                    (('indent', -indent), ('end_block',))))
                 continue
 
             # Unknown directive.
@@ -465,52 +533,26 @@ class TemplateEngine:
             raise TemplateSyntaxError(
                 outer_block_line_nr, '$block without $endblock')
 
-        return output_buffer
-
     @staticmethod
     def _process_markers(markers):
-        """Processes a list of literals and markers as returned by
-        `_process_directives()` into a single string representing the source
-        code."""
-
-        # Join all consecutive literals together, then split them into lines.
-        # That allows us to prefix indentation properly.
-        marker_buffer = [[]]
-        for marker_or_literal in markers:
-            if isinstance(marker_or_literal, tuple):
-                marker_buffer[-1] = ''.join(marker_buffer[-1]).split('\n')
-                marker_buffer.append(marker_or_literal)
-                marker_buffer.append([])
-            else:
-                marker_buffer[-1].append(marker_or_literal)
-        marker_buffer[-1] = ''.join(marker_buffer[-1]).split('\n')
+        """Processes an iterable of literals and markers as returned by
+        `_process_directives()` into the lines of the source code, yielded one
+        at a time as soon as they are complete."""
 
         # Current number of spaces to indent by.
         indent = 0
 
-        # Buffer to output processed literals to.
-        output_buffer = []
-
         # State variables used to collapse empty lines and annotations.
+        any_output = False
         empty_line = False
         source_annotation = None
 
-        for marker_or_literals in marker_buffer:
-
-            # Handle markers.
-            if isinstance(marker_or_literals, tuple):
-                marker = marker_or_literals
-
-                if marker[0] == 'indent':
-                    indent += marker[1]
-                    continue
-
-                raise AssertionError('unknown marker: {}'.format(indent))
-
-            # Handle blocks of literals. We process indentation markers and
-            # collapse multiple newlines and source markers into one to
-            # (hopefully) improve readability.
-            for literal in marker_or_literals:
+        def process_literals(literals):
+            """Processes a list of single-line literals. We process
+            indentation markers and collapse multiple newlines and source
+            markers into one to (hopefully) improve readability."""
+            nonlocal any_output, empty_line, source_annotation
+            for literal in literals:
                 literal = literal.rstrip()
 
                 if not literal:
@@ -518,24 +560,50 @@ class TemplateEngine:
                 elif literal.startswith('@!'):
                     source_annotation = literal
                 else:
-                    if output_buffer and empty_line:
-                        output_buffer.append('')
+                    if any_output and empty_line:
+                        yield ''
                     if source_annotation is not None:
-                        output_buffer.append(source_annotation)
-                    output_buffer.append(' ' * indent + literal)
+                        yield source_annotation
+                    yield ' ' * indent + literal
+                    any_output = True
                     empty_line = False
                     source_annotation = None
 
-        # Make sure we output the source termination marker at the end, if any.
-        if source_annotation and source_annotation.startswith('!@^->'):
-            output_buffer.append(source_annotation)
+        # Join all consecutive literals together, then split them into lines.
+        # That allows us to prefix indentation properly. Complete lines are
+        # processed as soon as we get them; only the trailing partial line is
+        # kept in the buffer.
+        literal_buffer = []
+        for marker_or_literal in markers:
+
+            # Handle markers.
+            if isinstance(marker_or_literal, tuple):
+                yield from process_literals(''.join(literal_buffer).split('\n'))
+                literal_buffer = []
+                marker = marker_or_literal
+
+                if marker[0] == 'indent':
+                    indent += marker[1]
+                    continue
+
+                raise AssertionError('unknown marker: {}'.format(indent))
 
-        return '\n'.join(output_buffer)
+            # Handle literals.
+            literal_buffer.append(marker_or_literal)
+            if '\n' in marker_or_literal:
+                literals = ''.join(literal_buffer).split('\n')
+                literal_buffer = [literals.pop()]
+                yield from process_literals(literals)
+        yield from process_literals(''.join(literal_buffer).split('\n'))
 
-    def _process_wrapping(self, text, comment, wrap, annotate): #pylint disable=R0912
-        """Post-processes code by handling comment and wrapping markers."""
+        # Make sure we output the source termination marker at the end, if any.
+        if source_annotation and source_annotation.startswith('!@^->'):
+            yield source_annotation
 
-        output_lines = []
+    def _process_wrapping(self, lines, comment, wrap, annotate): #pylint disable=R0912
+        """Post-processes code by handling comment and wrapping markers. Takes
+        an iterable of lines and yields the processed lines as they are
+        produced."""
 
         # Since multiple subsequent lines of commented text should be
         # interpreted as a single paragraph before they're wrapped, we need to
@@ -554,7 +622,7 @@ class TemplateEngine:
         # List of source annotations that have not been written yet.
         annotations = []
 
-        for line in text.split('\n'):
+        for line in lines:
 
             # Strip trailing spaces.
             line = line.rstrip()
@@ -608,7 +676,7 @@ class TemplateEngine:
             if line_is_text:
 
                 # Output source annotations before processing the comment.
-                output_lines.extend(annotations)
+                yield from annotations
                 annotations = []
 
                 match = re.match(r'([-* ]*)(.*)$', line)
@@ -624,11 +692,11 @@ class TemplateEngine:
 
                     # Not a continuation of the buffered paragraph. Output the
                     # current buffer so we can start a new one.
-                    output_lines.extend(self._wrap(
+                    yield from self._wrap(
                         paragraph_buffer_leading,
                         paragraph_buffer_hanging,
                         paragraph_buffer,
-                        wrap))
+                        wrap)
                     paragraph_buffer = None
 
                 if line:
@@ -642,7 +710,7 @@ class TemplateEngine:
 
                     # Output empty lines immediately to maintain them. They'd
                     # be lost if we'd stick them in the paragraph buffer.
-                    output_lines.append((indent + comment_indent).rstrip())
+                    yield (indent + comment_indent).rstrip()
 
                 continue
 
@@ -650,16 +718,16 @@ class TemplateEngine:
             # invalidate the current paragraph buffer, if any, before we can
             # continue.
             if paragraph_buffer is not None:
-                output_lines.extend(self._wrap(
+                yield from self._wrap(
                     paragraph_buffer_leading,
                     paragraph_buffer_hanging,
                     paragraph_buffer,
-                    wrap))
+                    wrap)
                 paragraph_buffer = None
 
             # Output annotations after dumping the comment paragraph buffer,
             # but before outputting the statement.
-            output_lines.extend(annotations)
+            yield from annotations
             annotations = []
 
             # Split the text into tokens split by single at signs. Also
@@ -670,24 +738,20 @@ class TemplateEngine:
             line = (token.replace('@_', '@') for token in line)
 
             # Wrap the text.
-            output_lines.extend(self._wrap(
+            yield from self._wrap(
                 indent,
                 indent + '    ',
                 line,
-                wrap))
+                wrap)
 
         # If we were still buffering a paragraph of commented text, output it
         # now.
         if paragraph_buffer is not None:
-            output_lines.extend(self._wrap(
+            yield from self._wrap(
                 paragraph_buffer_leading,
                 paragraph_buffer_hanging,
                 paragraph_buffer,
-                wrap))
-
-        # Join the lines together and ensure that the file ends in a single
-        # newline.
-        return '\n'.join(output_lines).rstrip() + '\n'
+                wrap)
 
     @staticmethod
     def _wrap(leading_indent, hanging_indent, tokens, wrap):
@@ -725,6 +789,138 @@ class TemplateEngine:
             yield line.rstrip()
 
 
+# Precompiled form of a directive. `source` is the `(filename, line_nr)` tuple
+# of the directive. `directive` is the directive with its syntax simplified:
+# the expression for inline directives, an empty string for dollar escape
+# sequences, or the dollar-prefixed directive name otherwise. `indent` and
+# `argument` are the indentation and argument of non-inline directives. `code`
+# is the `_Expression` for inline and `$if` directives.
+_Directive = namedtuple('_Directive', ['source', 'directive', 'indent', 'argument', 'code'])
+
+
+# Compiled template expression. `source` is the expression string, `code` is
+# the compiled code object or the `SyntaxError` raised when compiling it, and
+# `pure` indicates whether the result of the expression only depends on the
+# template variables, such that it can be memoized.
+_Expression = namedtuple('_Expression', ['source', 'code', 'pure'])
+
+
+# AST node types that make an expression impure. Function calls may have side
+# effects or depend on state other than the template variables, and named
+# expressions (Python 3.8+) modify the scope.
+_IMPURE_NODES = tuple(
+    getattr(ast, name)
+    for name in ('Call', 'NamedExpr', 'Await', 'Yield', 'YieldFrom')
+    if hasattr(ast, name))
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_expression(expression):
+    """Compiles a template expression to an `_Expression`. If the expression
+    has a syntax error, the exception is stored instead of the code object,
+    such that it is only raised if the directive is actually evaluated. The
+    result is cached process-wide, so each distinct expression string is only
+    compiled once."""
+    try:
+        tree = ast.parse(expression, '<string>', 'eval')
+        code = compile(tree, '<string>', 'eval')
+    except SyntaxError as exc:
+        return _Expression(expression, exc, False)
+    pure = not any(isinstance(node, _IMPURE_NODES) for node in ast.walk(tree))
+    return _Expression(expression, code, pure)
+
+
+def _evaluate(expression, scope, memo):
+    """Evaluates an `_Expression` within the given scope. The results of pure
+    expressions are memoized in the `memo` dictionary, which must be specific
+    to the scope."""
+    if isinstance(expression.code, SyntaxError):
+        raise expression.code
+    if expression.pure:
+        result = memo.get(expression.source, memo)
+        if result is not memo:
+            return result
+    result = eval(expression.code, scope) #pylint: disable=W0123
+    if expression.pure:
+        memo[expression.source] = result
+    return result
+
+
+def _compile_directive(source, directive):
+    """Parses and compiles a directive as returned by `_split_directives()`
+    into a `_Directive`."""
+    if directive.endswith('$'):
+        directive = directive[1:-1]
+        code = None
+        if directive:
+            code = _compile_expression(directive)
+        return _Directive(source, directive, 0, None, code)
+    matches = re.match(r'\$( *)([^ ]*)(?: (.*))?$', directive)
+    indent = len(matches.group(1))
+    if indent:
+        indent += 1
+    directive = '$' + matches.group(2).rstrip()
+    argument = matches.group(3)
+    code = None
+    if directive == '$if' and argument:
+        code = _compile_expression(argument)
+    return _Directive(source, directive, indent, argument, code)
+
+
+def _compile_directives(template):
+    """Splits the given template string into directives using
+    `TemplateEngine._split_directives()`, and then compiles the directives.
+    Returns a tuple of literal strings and `_Directive`s. The result is not
+    cached, since this is also used for the generated blocks, which are
+    rarely reused."""
+    return tuple(
+        _compile_directive(*item) if idx % 2 else item
+        for idx, item in enumerate(TemplateEngine._split_directives(template))) #pylint: disable=W0212
+
+
+class CompiledTemplate:
+    """Represents a template that has been parsed and compiled, such that it
+    can be applied any number of times without being parsed again."""
+
+    def __init__(self, template):
+        super().__init__()
+
+        # If the template is specified as a list of strings, join them first.
+        if isinstance(template, list):
+            template = '\n'.join(template)
+
+        # Remove any template indentation, which is separated from output
+        # indentation through pipe symbols.
+        template = re.sub(r'\n *\|', '\n', template)
+
+        # Split the template file into a list of alternating literals and
+        # compiled directives.
+        self._directives = _compile_directives(template)
+
+    @property
+    def directives(self):
+        """The compiled directive list for this template."""
+        return self._directives
+
+
+def compile_template(template):
+    """Returns the `CompiledTemplate` for the given template string or list of
+    strings. The result is not cached: templates that are applied many times
+    should be compiled once, for instance at module level, and the compiled
+    template should be passed to the `apply_*()` functions instead."""
+    return CompiledTemplate(template)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_template_file(template_filename, mtime, comment): #pylint: disable=W0613
+    """Loads, annotates, and compiles the given template file. The result is
+    cached process-wide, keyed by the filename and modification time (`mtime`)
+    of the file."""
+    with open(template_filename, 'r', encoding="utf-8") as template_file:
+        return CompiledTemplate(annotate_block(
+            template_file.read(), template_filename, comment))
+
+
 class TemplateSyntaxError(Exception):
     """Template syntax error class. Contains line number and source file
     information."""
@@ -1,5 +1,8 @@
 """Module for miscellaneous utilities."""
 
+import os
+import shutil
+
 def doc_enumerate(items, connect_with='and', map_using=str, default='<null>'):
     """Enumerates a list of items using natural English. That is, `'[0]'`,
     `'[0] and [1]'`, , `'[0], [1] and [2]'`, and so on. The connecting word is
@@ -20,3 +23,96 @@ def doc_enumerate(items, connect_with='and', map_using=str, default='<null>'):
         ', '.join(map(map_using, items[:-1])),
         connect_with,
         map_using(items[-1]))
+
+
+def write_if_changed(filename, data):
+    """Writes the string `data` to the file named `filename`, unless the file
+    already contains exactly that data. This prevents the modification time of
+    the file from being updated needlessly, which would otherwise trigger
+    rebuilds in downstream build systems. Returns whether the file was
+    written."""
+    if os.path.isfile(filename):
+        with open(filename, 'r', encoding="utf-8") as fil:
+            if fil.read() == data:
+                return False
+    with open(filename, 'w', encoding="utf-8") as fil:
+        fil.write(data)
+    return True
+
+
+def _files_equal(filename_a, filename_b, chunk_size=1 << 16):
+    """Returns whether the two given files have the same contents, without
+    reading either file into memory completely."""
+    if os.path.getsize(filename_a) != os.path.getsize(filename_b):
+        return False
+    with open(filename_a, 'rb') as fil_a, open(filename_b, 'rb') as fil_b:
+        while True:
+            chunk_a = fil_a.read(chunk_size)
+            if chunk_a != fil_b.read(chunk_size):
+                return False
+            if not chunk_a:
+                return True
+
+
+def write_lines_if_changed(filename, lines):
+    """Like `write_if_changed()`, but takes an iterable of lines without
+    newline terminators, each of which is written followed by a newline. The
+    lines are written to a temporary file next to `filename` as they are
+    produced, such that the complete data never needs to be in memory. The
+    temporary file then replaces `filename` if the contents differ, or is
+    removed otherwise. Returns whether the file was written."""
+    temp_filename = '%s.%d.tmp' % (filename, os.getpid())
+    try:
+        with open(temp_filename, 'w', encoding="utf-8") as fil:
+            for line in lines:
+                fil.write(line)
+                fil.write('\n')
+        if os.path.isfile(filename):
+            if _files_equal(temp_filename, filename):
+                os.remove(temp_filename)
+                return False
+            shutil.copymode(filename, temp_filename)
+        os.replace(temp_filename, filename)
+        return True
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+def expand_output_dir(output_dir, source_directory):
+    """Expands the `@` symbol in the given output directory specification to
+    the relative path from the current working directory to
+    `source_directory`, the directory of the register file description (which
+    may be `None` if unknown). Returns the resulting directory name, which is
+    an empty string for the current working directory."""
+    output_dir = os.path.normpath(output_dir)
+    if '@' in output_dir:
+        left, right = output_dir.split('@', maxsplit=1)
+
+        relpath = ''
+        if source_directory is not None:
+            relpath = source_directory
+            if relpath:
+                relpath = os.path.relpath(os.path.normpath(relpath))
+        if relpath == '.':
+            relpath = ''
+
+        relpath = relpath.split(os.sep)
+
+        output_dir = [left]
+        if output_dir[-1].endswith(os.sep):
+            output_dir.extend(relpath)
+        else:
+            output_dir[-1] += relpath[0]
+            output_dir.extend(relpath[1:])
+        if right.startswith(os.sep):
+            output_dir.append(right[1:])
+        else:
+            output_dir[-1] += right
+
+        output_dir = os.path.join(*output_dir)
+
+        if output_dir == '.':
+            output_dir = ''
+    return output_dir
@@ -6,8 +6,10 @@ import shutil
 from ..version import __version__
 from ..core.address import AddressSignalMap
 from ..core.subaddress import SubAddress
-from ..template import TemplateEngine, annotate_block
-from .types import Axi4Lite, gather_defs
+from ..template import TemplateEngine, annotate_block, compile_template
+from ..utils import expand_output_dir
+from .. import profiling
+from .types import Axi4Lite, gather_defs, std_logic, std_logic_vector
 from .interface import Interface
 from .address_decoder import AddressDecoder
 from .behavior import BehaviorCodeGen
@@ -54,7 +56,11 @@ _BLOCK_ACCESS_TEMPLATE = annotate_block("""
 |$endblock
 |
 |$block AFTER_READ_RESP
-  |r_data := r_hold($bw*word_idx + bw-1$ downto $bw*word_idx$);
+  |$if mux_idx is None
+    |r_data := r_hold($bw*word_idx + bw-1$ downto $bw*word_idx$);
+  |$else
+    |r_bdata($mux_idx$) := r_hold($bw*word_idx + bw-1$ downto $bw*word_idx$);
+  |$endif
   |$if blk_cnt > 1
     |$if blk_idx == 0
       |r_multi := '1';
@@ -141,6 +147,39 @@ _INTERNAL_SIGNAL_TEMPLATE = annotate_block("""
 |end if;
 """, comment='--')
 
+# These are applied for every address block and internal signal, so they are
+# compiled once at import.
+_INTERRUPT_TEMPLATE = compile_template(_INTERRUPT_TEMPLATE)
+_BLOCK_ACCESS_TEMPLATE = compile_template(_BLOCK_ACCESS_TEMPLATE)
+_INTERNAL_SIGNAL_TEMPLATE = compile_template(_INTERNAL_SIGNAL_TEMPLATE)
+
+
+# Ports of the flattened AXI4 slave interface (excluding the bus prefix) as
+# `(mode, name, count)` three-tuples, in the order in which they appear in the
+# entity. `count` is `None` for `std_logic` ports, an integer for
+# `std_logic_vector` ports, or `'data'`, `'strb'`, or `'id'` for vectors whose
+# width depends on the configuration.
+_AXI4_PORTS = [
+    ('i', 'awvalid', None), ('o', 'awready', None), ('i', 'awid', 'id'),
+    ('i', 'awaddr', 32), ('i', 'awlen', 8), ('i', 'awsize', 3),
+    ('i', 'awburst', 2), ('i', 'awprot', 3),
+    ('i', 'wvalid', None), ('o', 'wready', None), ('i', 'wdata', 'data'),
+    ('i', 'wstrb', 'strb'), ('i', 'wlast', None),
+    ('o', 'bvalid', None), ('i', 'bready', None), ('o', 'bid', 'id'),
+    ('o', 'bresp', 2),
+    ('i', 'arvalid', None), ('o', 'arready', None), ('i', 'arid', 'id'),
+    ('i', 'araddr', 32), ('i', 'arlen', 8), ('i', 'arsize', 3),
+    ('i', 'arburst', 2), ('i', 'arprot', 3),
+    ('o', 'rvalid', None), ('i', 'rready', None), ('o', 'rid', 'id'),
+    ('o', 'rdata', 'data'), ('o', 'rresp', 2), ('o', 'rlast', None),
+    ('o', 'uirq', None),
+]
+
+
+# Templates for the files generated for each register file, and the suffixes
+# of the corresponding filenames.
+_OUTPUTS = (('entity', '.gen.vhd'), ('package', '_pkg.gen.vhd'))
+
 
 class VhdlEntityGenerator:
     """Generator for the entity and associated package for a single register
@@ -151,6 +190,13 @@ class VhdlEntityGenerator:
         super().__init__()
         self._regfile = regfile
 
+        with profiling.phase('vhdl', regfile.name):
+            self._generate(regfile)
+
+    def _generate(self, regfile):
+        """Generates the contents of the VHDL files for the given register
+        file. Called by the constructor."""
+
         # Main template engine, used to generate the actual VHDL files.
         self._tple = TemplateEngine()
 
@@ -163,19 +209,30 @@ class VhdlEntityGenerator:
         self._tple['ai'] = regfile.address_info
         self._tple['di'] = regfile.defer_tag_info
         self._tple['ii'] = regfile.interrupt_info
+        self._tple['pl'] = regfile.cfg.features.decoder_stages
+        if regfile.cfg.entity.bus_protocol == 'axi4-lite':
+            self._tple['qd'] = regfile.cfg.features.request_queue_depth
+        else:
+            self._tple['qd'] = 0
 
         # Interface builder.
         self._interface = Interface(regfile.name)
 
+        # Number of readable blocks assigned an index in the read data
+        # multiplexer so far, if the multiplexer is enabled.
+        self._read_mux_count = 0
+
         # Construct address decoder builders.
         self._read_decoder = AddressDecoder(
             'r_addr', regfile.address_info.width,
             optimize=regfile.cfg.features.optimize,
-            allow_duplicate=True, allow_overlap=True)
+            allow_duplicate=True, allow_overlap=True,
+            minimize=regfile.cfg.features.decoder == 'minimized')
         self._write_decoder = AddressDecoder(
             'w_addr', regfile.address_info.width,
             optimize=regfile.cfg.features.optimize,
-            allow_duplicate=True, allow_overlap=True)
+            allow_duplicate=True, allow_overlap=True,
+            minimize=regfile.cfg.features.decoder == 'minimized')
 
         # Construct defer tag decoder builders.
         self._read_tag_decoder = AddressDecoder(
@@ -197,10 +254,18 @@ class VhdlEntityGenerator:
         self._add_subaddress_construction(
             regfile.iter_subaddresses())
 
+        # Determine which field descriptors describe regular arrays of
+        # fields that can be handled by a single piece of logic indexed by
+        # the address, instead of by one copy for each field.
+        arrays = {}
+        for field_descriptor in regfile.field_descriptors:
+            array = self._get_array(field_descriptor)
+            if array is not None:
+                arrays[field_descriptor] = array
+
         # Generate the block access code that comes before the field code.
-        for register in regfile.registers:
-            for address_block in register.blocks:
-                self._add_address_block(address_block, 'before')
+        for address_block, array in self._iter_address_blocks(arrays):
+            self._add_address_block(address_block, 'before', array)
 
         # Generate code for fields.
         for field_descriptor in regfile.field_descriptors:
@@ -208,7 +273,8 @@ class VhdlEntityGenerator:
                 field_descriptor,
                 self._tple, self._interface,
                 self._read_decoder, self._write_decoder,
-                self._read_tag_decoder, self._write_tag_decoder).generate()
+                self._read_tag_decoder, self._write_tag_decoder,
+                array=arrays.get(field_descriptor)).generate()
 
         # The fields share temporary variables for read/write/strobe data of
         # the right sizes for the fields, such that the templates don't have to
@@ -232,25 +298,30 @@ class VhdlEntityGenerator:
         self._tple.append_block('DECLARATIONS', block)
 
         # Generate the block access code that comes after the field code.
-        for register in regfile.registers:
-            for address_block in register.blocks:
-                self._add_address_block(address_block, 'after')
+        for address_block, array in self._iter_address_blocks(arrays):
+            self._add_address_block(address_block, 'after', array)
+        self._tple['rmux'] = self._read_mux_count
 
         # Add the address decoders to the main template engine.
-        self._read_decoder.append_to_template(
-            self._tple, 'FIELD_LOGIC_READ',
-            'Read address decoder.')
-        self._write_decoder.append_to_template(
-            self._tple, 'FIELD_LOGIC_WRITE',
-            'Write address decoder.')
-
-        # Add the defer tag decoders to the main template engine.
-        self._read_tag_decoder.append_to_template(
-            self._tple, 'FIELD_LOGIC_READ_TAG',
-            'Deferred read tag decoder.')
-        self._write_tag_decoder.append_to_template(
-            self._tple, 'FIELD_LOGIC_WRITE_TAG',
-            'Deferred write tag decoder.')
+        with profiling.phase('decoder'):
+            if regfile.cfg.features.decoder_stages:
+                self._add_pipelined_decoder(self._read_decoder, 'r', 'read')
+                self._add_pipelined_decoder(self._write_decoder, 'w', 'write')
+            else:
+                self._read_decoder.append_to_template(
+                    self._tple, 'FIELD_LOGIC_READ',
+                    'Read address decoder.')
+                self._write_decoder.append_to_template(
+                    self._tple, 'FIELD_LOGIC_WRITE',
+                    'Write address decoder.')
+
+            # Add the defer tag decoders to the main template engine.
+            self._read_tag_decoder.append_to_template(
+                self._tple, 'FIELD_LOGIC_READ_TAG',
+                'Deferred read tag decoder.')
+            self._write_tag_decoder.append_to_template(
+                self._tple, 'FIELD_LOGIC_WRITE_TAG',
+                'Deferred write tag decoder.')
 
         # Generate code for internal signals.
         for internal in regfile.internals:
@@ -270,6 +341,7 @@ class VhdlEntityGenerator:
                 '@ Types used by the register file interface.',
                 '\n'.join(typedefs))
 
+
     @staticmethod
     def _describe_interrupt(interrupt):
         """Generates a description for an interrupt, to be used as block
@@ -286,6 +358,16 @@ class VhdlEntityGenerator:
             block.name,
             block.brief)
 
+    @staticmethod
+    def _describe_array(block, array):
+        """Generates a description for the blocks of a regular array of
+        fields, given the block of the first field, to be used as block
+        comment."""
+        return 'blocks of field group %s (%d fields, stride %d): %s' % (
+            block.register.fields[0].descriptor.name,
+            array.count, array.stride,
+            block.register.fields[0].descriptor.brief)
+
     @staticmethod
     def _describe_internal(internal):
         """Generates a description for an internal signal, to be used as block
@@ -423,17 +505,56 @@ class VhdlEntityGenerator:
         self._tple.append_block('FIELD_LOGIC_READ', construct_read)
         self._tple.append_block('FIELD_LOGIC_WRITE', construct_write)
 
-    def _add_address_block(self, address_block, position):
+    def _get_array(self, field_descriptor):
+        """Returns the `FieldArray` for the given field descriptor if its
+        fields can be handled by a single piece of logic indexed by the
+        address, or `None` if the logic must be generated for each field
+        separately."""
+        array = field_descriptor.array
+        if array is None or not BehaviorCodeGen.supports_arrays(field_descriptor):
+            return None
+
+        # Note that this also works for the pipelined address decoders: the
+        # field index is derived from the address of the request in the
+        # holding register, which remains there until the field logic handles
+        # it in the last stage. The read data multiplexer entry is likewise
+        # shared by the whole array, since only one of its fields can be
+        # accessed at a time.
+        return array
+
+    def _iter_address_blocks(self, arrays):
+        """Yields `(block, array)` two-tuples for the blocks of all registers
+        in the register file. `arrays` maps the field descriptors that are
+        handled as a whole to their `FieldArray`. Only the blocks of the first
+        field of such a descriptor are yielded, along with the `FieldArray`;
+        `array` is `None` for all other blocks."""
+        for register in self._regfile.registers:
+            array = None
+            if len(register.fields) == 1:
+                field, = register.fields
+                array = arrays.get(field.descriptor)
+                if array is not None and field.index:
+                    continue
+            for address_block in register.blocks:
+                yield address_block, array
+
+    def _add_address_block(self, address_block, position, array=None):
         """Adds the boilerplate bus logic for the given block. `position`
         indicates the relation of this function call with respect to the
         functions that add the field logic; if `'before'`, the function assumes
         that it is called before the field logic is added, if `'after'` it
         assumes after. Both variants must be called exactly once for each
-        register."""
+        register. If `array` is specified, the block is the block of the first
+        field in the given `FieldArray`, and the logic is added for the address
+        that matches all fields in the array at once."""
+        internal_address = address_block.internal_address
         tple = TemplateEngine()
         tple['pos'] = position
         tple['bw'] = self._regfile.cfg.features.bus_width
         tple['desc'] = self._describe_block(address_block)
+        if array is not None:
+            internal_address = array.address
+            tple['desc'] = self._describe_array(address_block, array)
         tple['blk_cnt'] = len(address_block.register.blocks)
         tple['blk_idx'] = address_block.index
         if address_block.register.endianness == 'little':
@@ -442,12 +563,17 @@ class VhdlEntityGenerator:
             tple['word_idx'] = len(address_block.register.blocks) - address_block.index - 1
         tple['read_tag'] = address_block.read_tag
         tple['write_tag'] = address_block.write_tag
+        tple['mux_idx'] = None
+        if (address_block.can_read() and position == 'after'
+                and self._regfile.cfg.features.read_mux != 'decoder'):
+            tple['mux_idx'] = self._read_mux_count
+            self._read_mux_count += 1
         if address_block.can_read():
             tple['dir'] = 'r'
             tple['phase'] = 'request'
             block = tple.apply_str_to_str(
                 _BLOCK_ACCESS_TEMPLATE, postprocess=False)
-            self._read_decoder[address_block.internal_address] = block
+            self._read_decoder[internal_address] = block
             if address_block.read_tag is not None:
                 tple['phase'] = 'response'
                 block = tple.apply_str_to_str(
@@ -458,13 +584,51 @@ class VhdlEntityGenerator:
             tple['phase'] = 'request'
             block = tple.apply_str_to_str(
                 _BLOCK_ACCESS_TEMPLATE, postprocess=False)
-            self._write_decoder[address_block.internal_address] = block
+            self._write_decoder[internal_address] = block
             if address_block.write_tag is not None:
                 tple['phase'] = 'response'
                 block = tple.apply_str_to_str(
                     _BLOCK_ACCESS_TEMPLATE, postprocess=False)
                 self._write_tag_decoder[address_block.write_tag] = block
 
+    def _add_pipelined_decoder(self, decoder, prefix, direction):
+        """Adds the given address decoder to the main template engine in its
+        pipelined form. `prefix` must be `'r'` or `'w'`, and `direction` must
+        be `'read'` or `'write'` correspondingly."""
+        result = decoder.generate_pipelined(
+            '%s_sel(0)' % prefix,
+            '%s_sel(%d)' % (prefix, self._regfile.cfg.features.decoder_stages - 1))
+        if result is None:
+            return
+        width, decode, actions = result
+
+        self._tple.append_block(
+            'DECLARATIONS',
+            '@ Pipeline registers for the %s address decoder. %s_sel(0) is the '
+            'one-hot register select vector for the request in the %s holding '
+            'register; the subsequent stages are delayed copies of it.' % (
+                direction, prefix, direction),
+            'type %s_sel_array is array (natural range <>) of '
+            'std_logic_vector(%d downto 0);' % (prefix, width - 1),
+            'variable %s_sel : %s_sel_array(0 to %d) := (others => (others => \'0\')); -- reg' % (
+                prefix, prefix, self._regfile.cfg.features.decoder_stages - 1))
+
+        self._tple.append_block(
+            '%s_DECODER' % direction.upper(),
+            '@ Advance the %s address decoder pipeline and decode the address '
+            'of the request in the holding register into the first stage.' % direction,
+            'for i in %s_sel\'high downto 1 loop' % prefix,
+            '  %s_sel(i) := %s_sel(i - 1);' % (prefix, prefix),
+            'end loop;',
+            '%s_sel(0) := (others => \'0\');' % prefix,
+            decode)
+
+        self._tple.append_block(
+            'FIELD_LOGIC_%s' % direction.upper(),
+            '@ Pipelined %s address decoder, operating on the register '
+            'select vector of the last pipeline stage.' % direction,
+            actions)
+
     def _add_internal_signal(self, internal):
         """Adds the boilerplate code that supports the given internal signal
         (such as its variable declaration) to the template engine."""
@@ -521,51 +685,38 @@ class VhdlEntityGenerator:
 
     def generate(self, output_dir, annotate=False):
         """Generates the files for this register file in the specified
-        directory."""
-        output_dir = os.path.normpath(output_dir)
-        if '@' in output_dir:
-            left, right = output_dir.split('@', maxsplit=1)
-
-            relpath = ''
-            if self._regfile.cfg.source_directory is not None:
-                relpath = self._regfile.cfg.source_directory
-                if relpath:
-                    relpath = os.path.relpath(os.path.normpath(relpath))
-            if relpath == '.':
-                relpath = ''
-
-            relpath = relpath.split(os.sep)
-
-            output_dir = [left]
-            if output_dir[-1].endswith(os.sep):
-                output_dir.extend(relpath)
-            else:
-                output_dir[-1] += relpath[0]
-                output_dir.extend(relpath[1:])
-            if right.startswith(os.sep):
-                output_dir.append(right[1:])
-            else:
-                output_dir[-1] += right
-
-            output_dir = os.path.join(*output_dir)
-
-            if output_dir == '.':
-                output_dir = ''
+        directory. Returns the list of generated files."""
+        output_dir = expand_output_dir(output_dir, self._regfile.cfg.source_directory)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         name = os.path.join(output_dir, self._regfile.name)
 
-        self._tple.apply_file_to_file(
-            pjoin(_MODULE_DIR, 'entity.template.vhd'),
-            name + '.gen.vhd',
-            comment='-- ', annotate=annotate)
-        print('Wrote %s.gen.vhd' % name)
-
-        self._tple.apply_file_to_file(
-            pjoin(_MODULE_DIR, 'package.template.vhd'),
-            name + '_pkg.gen.vhd',
-            comment='-- ', annotate=annotate)
-        print('Wrote %s_pkg.gen.vhd' % name)
+        output_files = []
+        with profiling.phase('vhdl-write', self._regfile.name):
+            for template, suffix in _OUTPUTS:
+                output_file = name + suffix
+                if self._tple.apply_file_to_file(
+                        pjoin(_MODULE_DIR, '%s.template.vhd' % template),
+                        output_file,
+                        comment='-- ', annotate=annotate, stream=True):
+                    print('Wrote %s' % output_file)
+                else:
+                    print('%s is up to date' % output_file)
+                output_files.append(output_file)
+        return output_files
+
+    def generate_strings(self, annotate=False):
+        """Generates the files for this register file in memory, without
+        touching the filesystem. Returns a dictionary mapping the names of the
+        files that `generate()` would write (without directory) to their
+        contents."""
+        output = {}
+        with profiling.phase('vhdl-write', self._regfile.name):
+            for template, suffix in _OUTPUTS:
+                output[self._regfile.name + suffix] = self._tple.apply_file_to_str(
+                    pjoin(_MODULE_DIR, '%s.template.vhd' % template),
+                    comment='-- ', annotate=annotate)
+        return output
 
     def gather_ports(self):
         """Yields all the inputs/outputs/generics excluding `clk` and `reset`
@@ -574,8 +725,21 @@ class VhdlEntityGenerator:
         the type is not an incomplete array."""
         for mode, name, typ, count in self._interface.gather_ports():
             yield mode, name, typ, count
-        yield 'i', 'bus_i', Axi4Lite('m2s', self._regfile.cfg.features.bus_width), None
-        yield 'o', 'bus_o', Axi4Lite('s2m', self._regfile.cfg.features.bus_width), None
+        bus_width = self._regfile.cfg.features.bus_width
+        entity = self._regfile.cfg.entity
+        if entity.bus_protocol == 'axi4':
+            for mode, name, count in _AXI4_PORTS:
+                if count == 'data':
+                    count = bus_width
+                elif count == 'strb':
+                    count = bus_width // 8
+                elif count == 'id':
+                    count = entity.bus_id_width
+                typ = std_logic if count is None else std_logic_vector
+                yield mode, entity.bus_prefix + name, typ, count
+            return
+        yield 'i', 'bus_i', Axi4Lite('m2s', bus_width), None
+        yield 'o', 'bus_o', Axi4Lite('s2m', bus_width), None
 
 
 class VhdlEntitiesGenerator:
@@ -586,10 +750,12 @@ class VhdlEntitiesGenerator:
         self._regfiles = regfiles
 
     def generate(self, output_dir, annotate=False):
-        """Generates the HTML documentation files for the register files in the
-        given directory."""
+        """Generates the VHDL files for the register files in the given
+        directory. Returns the list of generated files."""
+        output_files = []
         for regfile in self._regfiles:
-            VhdlEntityGenerator(regfile).generate(output_dir, annotate)
+            output_files.extend(VhdlEntityGenerator(regfile).generate(output_dir, annotate))
+        return output_files
 
 
 class VhdlPackageGenerator:
@@ -598,13 +764,27 @@ class VhdlPackageGenerator:
     @staticmethod
     def generate(output_dir):
         """Generates the common `vhdmmio_pkg.gen.vhd` file in the given
-        directory."""
+        directory. Returns the list of generated files."""
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         tple = TemplateEngine()
         tple['version'] = __version__
-        tple.apply_file_to_file(
+        output_file = pjoin(output_dir, 'vhdmmio_pkg.gen.vhd')
+        if tple.apply_file_to_file(
+                pjoin(_MODULE_DIR, 'vhdmmio_pkg.template.vhd'),
+                output_file,
+                comment='-- '):
+            print('Wrote %s' % output_file)
+        else:
+            print('%s is up to date' % output_file)
+        return [output_file]
+
+    @staticmethod
+    def generate_strings():
+        """Generates the common `vhdmmio_pkg.gen.vhd` file in memory. Returns
+        a dictionary mapping its name to its contents."""
+        tple = TemplateEngine()
+        tple['version'] = __version__
+        return {'vhdmmio_pkg.gen.vhd': tple.apply_file_to_str(
             pjoin(_MODULE_DIR, 'vhdmmio_pkg.template.vhd'),
-            pjoin(output_dir, 'vhdmmio_pkg.gen.vhd'),
-            comment='-- ')
-        print('Wrote %s' % pjoin(output_dir, 'vhdmmio_pkg.gen.vhd'))
+            comment='-- ')}
@@ -19,13 +19,26 @@ class AddressDecoder:
     behavior. If `allow_overlap` is set, addresses that partially or fully
     overlap each other due to don't cares (for instance `1--1` and `11--`) do
     not result in an exception. Similarly, if `allow_duplicate` is set,
-    multiple actions per address do not result in an exception."""
-
-    def __init__(self, address, num_bits,
-                 optimize=False, allow_overlap=False, allow_duplicate=False):
+    multiple actions per address do not result in an exception.
+
+    If `minimize` is set, the decoder is generated as a flat list of
+    independent if statements, one for each action, instead of as a tree of
+    nested if and case statements. The match condition of each action is then
+    minimized using the don't-care set formed by the unused addresses when
+    `optimize` is set, much like the expand step of the Espresso logic
+    minimizer. The resulting comparators only include the address bits needed
+    to discriminate between the actions, so the decoder logic is shallower.
+    The minimized match conditions are chosen such that they are mutually
+    exclusive outside of overlapping addresses, so no address ever triggers
+    more actions than it would with the tree decoder."""
+
+    def __init__(self, address, num_bits, optimize=False,
+                 allow_overlap=False, allow_duplicate=False, minimize=False):
         super().__init__()
+        self._address = address
         self._num_bits = num_bits
         self._optimize = optimize
+        self._minimize = minimize
         self._allow_overlap = allow_overlap
         self._allow_duplicate = allow_duplicate
         self._tple = TemplateEngine()
@@ -71,6 +84,15 @@ class AddressDecoder:
             count += 1
         return count
 
+    @staticmethod
+    def _is_single_if(lines):
+        """Returns whether the given list of VHDL template lines consists of
+        a single if statement, which can thus be merged into an elsif. This
+        is not the case when overlapping addresses produced more code after
+        the if statement."""
+        return bool(lines) and lines[0].startswith('if ') and lines[-1] == 'end if;' and all(
+            line.startswith((' ', 'els', 'end if;')) for line in lines[1:])
+
     @staticmethod
     def _address_to_key(address):
         """Converts the given address to the key name used within the template
@@ -234,14 +256,14 @@ class AddressDecoder:
                         [a[1:] for a in addresses if a.startswith('1')])
                     result = []
 
-                    if recurse_one and recurse_one[0].startswith('if '):
+                    if self._is_single_if(recurse_one):
                         result.append('if $address$(%d) = \'0\' then' % high)
                         result.extend(('  ' + s for s in recurse_zero))
                         result.append('els' + recurse_one[0])
                         result.extend(recurse_one[1:])
                         return result
 
-                    if recurse_zero and recurse_zero[0].startswith('if '):
+                    if self._is_single_if(recurse_zero):
                         result.append('if $address$(%d) = \'1\' then' % high)
                         result.extend(('  ' + s for s in recurse_one))
                         result.append('els' + recurse_zero[0])
@@ -297,6 +319,167 @@ class AddressDecoder:
             [address for address in addresses if address[0] == '-']))
         return result
 
+    @staticmethod
+    def _hit_conflicts(conflicts):
+        """Returns a minimal integer bitmask that has at least one bit in
+        common with each of the integer bitmasks in `conflicts`, none of which
+        may be zero. This is the minimum hitting set problem, which is
+        NP-hard, so a greedy heuristic is used: bits that are the only bit in
+        one of the masks must be selected, after which the bit that hits the
+        most remaining masks is selected until all masks are hit. Finally,
+        selected bits that turn out to be redundant are removed again. Ties
+        are broken in favor of the most significant bit for determinism."""
+        conflicts = set(conflicts)
+
+        # Select the bits that are forced by single-bit conflicts.
+        selected = 0
+        for conflict in conflicts:
+            if not conflict & (conflict - 1):
+                selected |= conflict
+        forced = selected
+        remaining = [conflict for conflict in conflicts if not conflict & selected]
+
+        # Greedily select bits until all conflicts are hit.
+        unforced = []
+        while remaining:
+            counts = {}
+            for conflict in remaining:
+                while conflict:
+                    bit = conflict & -conflict
+                    counts[bit] = counts.get(bit, 0) + 1
+                    conflict ^= bit
+            bit = max(counts, key=lambda bit: (counts[bit], bit))
+            unforced.append(bit)
+            selected |= bit
+            remaining = [conflict for conflict in remaining if not conflict & bit]
+
+        # Remove redundant greedily-selected bits. The forced bits are never
+        # redundant, so we only need to check the conflicts they don't hit.
+        if len(unforced) > 1:
+            remaining = [conflict for conflict in conflicts if not conflict & forced]
+            for bit in unforced:
+                reduced = selected & ~bit
+                if all(conflict & reduced for conflict in remaining):
+                    selected = reduced
+
+        return selected
+
+    def _minimize_addresses(self, addresses):
+        """Computes the minimized match conditions for the given list of
+        addresses, represented as strings of `0`, `1`, and `-` characters.
+        Returns a list of `(address, term)` tuples, where `term` is the
+        minimized match condition in the same representation."""
+
+        # Convert the addresses to (value, mask) integer pairs. The order of
+        # the addresses is also the order in which the actions are executed,
+        # so the more specific of any two overlapping addresses must come
+        # first, like in the tree decoder.
+        cubes = []
+        for address in self._sort_by_specificity(addresses):
+            value = int(address.replace('-', '0'), 2)
+            mask = int(address.replace('0', '1').replace('-', '0'), 2)
+            cubes.append((address, value, mask))
+
+        # When we're not optimizing, all addresses that don't match an action
+        # must not do anything, so the match conditions cannot be expanded.
+        if not self._optimize and self._allow_overlap:
+            return [(address, address) for address, _, _ in cubes]
+
+        terms = []
+        for index, (address, value, mask) in enumerate(cubes):
+
+            # Gather the cubes that the expanded term must not intersect with:
+            # the terms chosen for the previous addresses, and the original
+            # cubes of the next addresses.
+            others = [(other_value, other_mask) for _, other_value, other_mask in terms]
+            others.extend((other_value, other_mask) for _, other_value, other_mask in cubes[index+1:])
+
+            # For each of those cubes, compute the set of bits that
+            # discriminates between the cube and our address as a bitmask.
+            # The expanded term must retain at least one of these bits.
+            conflicts = [
+                mask & other_mask & (value ^ other_value)
+                for other_value, other_mask in others]
+
+            # Handle overlapping cubes. The term may only overlap with the
+            # part of the other cube that our address also covers, so the
+            # term must retain one of the bits that the other cube does not
+            # care about. If the other cube is contained entirely by our
+            # address, there is no constraint.
+            if 0 in conflicts:
+                if not self._allow_overlap:
+                    other_value, other_mask = others[conflicts.index(0)]
+                    raise ValueError(
+                        'addresses overlap: found both {} and {}'.format(
+                            address, self._term_to_str(other_value, other_mask)))
+                overlaps = [
+                    other_mask for (_, other_mask), conflict in zip(others, conflicts)
+                    if not conflict]
+                conflicts = [conflict for conflict in conflicts if conflict]
+                for other_mask in overlaps:
+                    free = mask & ~other_mask
+                    while free:
+                        bit = free & -free
+                        conflicts.append(bit)
+                        free ^= bit
+
+            if self._optimize:
+                term_mask = self._hit_conflicts(conflicts)
+            else:
+                term_mask = mask
+            terms.append((address, value & term_mask, term_mask))
+
+        return [
+            (address, self._term_to_str(value, mask))
+            for address, value, mask in terms]
+
+    @staticmethod
+    def _sort_by_specificity(addresses):
+        """Sorts the given addresses such that the more specific of any two
+        overlapping addresses comes first."""
+        return sorted(addresses, key=lambda address: (address.count('-'), address))
+
+    def _term_to_str(self, value, mask):
+        """Converts an integer value and mask to the string representation of
+        an address."""
+        return ''.join(
+            ('1' if (value >> bit) & 1 else '0') if (mask >> bit) & 1 else '-'
+            for bit in reversed(range(self._num_bits)))
+
+    def _gen_minimized_template(self, addresses):
+        """Generates the template for a decoder with minimized match
+        conditions and a flat list of if statements; see `minimize`. The
+        return value is a list of VHDL template lines."""
+        result = []
+        for address, term in self._minimize_addresses(addresses):
+
+            # Build the match condition, comparing contiguous runs of
+            # significant bits as vectors.
+            conditions = []
+            for match in re.finditer(r'[01]+', term):
+                high = self._num_bits - 1 - match.start()
+                low = self._num_bits - match.end()
+                if high == low:
+                    conditions.append(
+                        '$address$(%d) = \'%s\'' % (high, match.group(0)))
+                else:
+                    conditions.append(
+                        '$address$(%d downto %d) = "%s"' % (high, low, match.group(0)))
+
+            if result:
+                result.append('')
+            body = [
+                '-- $address$ = %s' % address,
+                '$%s' % self._address_to_key(address)]
+            if not conditions:
+                result.extend(body)
+                continue
+            result.append('if %s then' % ' and@'.join(conditions))
+            result.extend(('  ' + s for s in body))
+            result.append('end if;')
+
+        return result
+
     def add_action(self, masked_address, block):
         """Registers the given code block for execution when the address
         input matches `address`, which should be of type
@@ -313,17 +496,69 @@ class AddressDecoder:
     def __setitem__(self, key, value):
         self.add_action(key, value)
 
+    def index(self, stride, count):
+        """Returns a VHDL expression for the index of the addressed element of
+        an array of `count` elements spaced `stride` addresses apart, both of
+        which must be powers of two. Combined with an action registered for
+        the `MaskedAddress` that matches all elements at once, this allows the
+        action to be indexed by the address rather than to be repeated for
+        each element."""
+        low = stride.bit_length() - 1
+        high = low + count.bit_length() - 2
+        return 'to_integer(unsigned(%s(%d downto %d)))' % (self._address, high, low)
+
     def generate(self):
         """Generates the address decoder."""
         if not self._addresses:
             return None
 
+        if self._minimize:
+            template = self._gen_minimized_template(self._addresses)
+        else:
+            template = self._gen_template(
+                self._num_bits - 1, 0, '', '', list(self._addresses))
+
         return self._tple.apply_str_to_str(
             '\n'.join((
                 re.sub(r'^ ( +)\$', r'$\1', line).rstrip()
-                for line in self._gen_template(
-                    self._num_bits - 1, 0, '', '', list(self._addresses)))),
+                for line in template)),
+            postprocess=False)
+
+    def generate_pipelined(self, select_out, select_in):
+        """Generates the address decoder split into two parts, such that
+        pipeline registers can be inserted in between. The first part decodes
+        the address into a one-hot select vector named by `select_out` (or
+        rather a few-hot vector when addresses overlap), which must be cleared
+        before the decoder. The second part executes the actions based on the
+        select vector named by `select_in`. Returns `None` if there are no
+        actions, or a three-tuple of the width of the select vector, the code
+        for the first part, and the code for the second part otherwise."""
+        if not self._addresses:
+            return None
+
+        # Order the addresses such that the more specific of any two
+        # overlapping addresses comes first, like in the tree decoder.
+        addresses = self._sort_by_specificity(self._addresses)
+
+        decoder = AddressDecoder(
+            self._address, self._num_bits, self._optimize,
+            self._allow_overlap, self._allow_duplicate, self._minimize)
+        template = []
+        for index, address in enumerate(addresses):
+            decoder._addresses.add(address) #pylint: disable=W0212
+            decoder._tple.append_block( #pylint: disable=W0212
+                self._address_to_key(address), '%s(%d) := \'1\';' % (select_out, index))
+            if template:
+                template.append('')
+            template.append('if %s(%d) = \'1\' then' % (select_in, index))
+            template.append('  -- $address$ = %s' % address)
+            template.append('  $%s' % self._address_to_key(address))
+            template.append('end if;')
+
+        actions = self._tple.apply_str_to_str(
+            '\n'.join((re.sub(r'^ ( +)\$', r'$\1', line) for line in template)),
             postprocess=False)
+        return len(addresses), decoder.generate(), actions
 
     def __str__(self):
         result = self.generate()
@@ -1,12 +1,17 @@
 """Submodule for AXI field behavior VHDL code generation."""
 
-from ...template import TemplateEngine, preload_template
+from ...template import TemplateEngine, preload_template, compile_template
 from ...core.behavior import AxiBehavior
 from ..types import Axi4Lite, Record, Array, gather_defs
 from .base import BehaviorCodeGen, behavior_code_gen
 
 _TEMPLATE = preload_template('axi.template.vhd', '--')
 
+# Compiled template variants for the blocks used by the generator.
+_BLOCKS = {
+    block: compile_template('%s\n\n$%s' % (_TEMPLATE, block))
+    for block in ('PRE', 'POST', 'READ_REQ', 'READ_RESP', 'WRITE_REQ', 'WRITE_RESP')}
+
 @behavior_code_gen(AxiBehavior)
 class AxiBehaviorCodeGen(BehaviorCodeGen):
     """Behavior code generator class for AXI fields."""
@@ -70,8 +75,7 @@ class AxiBehaviorCodeGen(BehaviorCodeGen):
         tple.passthrough('i', 'r_data', 'r_sub', 'w_data', 'w_strobe', 'w_sub')
 
         def expand(block):
-            expanded = tple.apply_str_to_str(
-                '%s\n\n$%s' % (_TEMPLATE, block), postprocess=False)
+            expanded = tple.apply_str_to_str(_BLOCKS[block], postprocess=False)
             if not expanded.strip():
                 expanded = None
             return expanded
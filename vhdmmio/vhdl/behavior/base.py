@@ -1,6 +1,6 @@
 """Contains the base class for behaviors."""
 
-from ...template import TemplateEngine, annotate_block
+from ...template import TemplateEngine, annotate_block, compile_template
 
 _BEHAVIOR_CODE_GEN_CLASS_MAP = []
 
@@ -62,6 +62,10 @@ _BUS_RESP_FIELD_TEMPLATE = annotate_block("""
 |$endif
 """, comment='--')
 
+# Compiled once here, since these are applied for every field descriptor.
+_BUS_REQ_FIELD_TEMPLATE = compile_template(_BUS_REQ_FIELD_TEMPLATE)
+_BUS_RESP_FIELD_TEMPLATE = compile_template(_BUS_RESP_FIELD_TEMPLATE)
+
 
 def behavior_code_gen(behavior_cls):
     """Decorator generator which registers a behavior class."""
@@ -72,12 +76,25 @@ def behavior_code_gen(behavior_cls):
 
 
 class BehaviorCodeGen:
-    """Base class for field behavior VHDL code generators."""
+    """Base class for field behavior VHDL code generators.
+
+    If `array` is specified, it must be the `FieldArray` of the field
+    descriptor. The bus logic for the fields is then generated once for the
+    address that matches all fields in the array, with `$i$` set to an
+    expression that derives the field index from the address. This is only
+    allowed if the code generator class supports it; see
+    `supports_arrays()`."""
+
+    # Whether this code generator only uses `$i$` in the bus logic as a VHDL
+    # expression, such that it can be set to an expression that depends on
+    # the address.
+    SUPPORTS_ARRAYS = True
 
     def __init__(self, field_descriptor,
                  tple, interface,
                  read_decoder, write_decoder,
-                 read_tag_decoder, write_tag_decoder):
+                 read_tag_decoder, write_tag_decoder,
+                 array=None):
         super().__init__()
         self._field_descriptor = field_descriptor
         self._tple = tple
@@ -86,20 +103,34 @@ class BehaviorCodeGen:
         self._write_decoder = write_decoder
         self._read_tag_decoder = read_tag_decoder
         self._write_tag_decoder = write_tag_decoder
+        self._array = array
 
     @staticmethod
-    def construct(field_descriptor, *args, **kwargs):
-        """Constructs a `BehaviorCodeGen` class instance based on the given
-        parsed field descriptor. The remainder of the arguments are passed to
-        the constructor of the selected behavior class. These arguments include
-        the builder objects of the VHDL generator."""
+    def _lookup(field_descriptor):
+        """Returns the `BehaviorCodeGen` subclass for the given parsed field
+        descriptor."""
         for behavior_cls, code_gen_cls in _BEHAVIOR_CODE_GEN_CLASS_MAP:
             if isinstance(field_descriptor.behavior, behavior_cls):
-                return code_gen_cls(field_descriptor, *args, **kwargs)
+                return code_gen_cls
         raise TypeError(
             'no mapping exists from type %s to a BehaviorCodeGen subclass'
             % type(field_descriptor.behavior).__name__)
 
+    @staticmethod
+    def construct(field_descriptor, *args, **kwargs):
+        """Constructs a `BehaviorCodeGen` class instance based on the given
+        parsed field descriptor. The remainder of the arguments are passed to
+        the constructor of the selected behavior class. These arguments include
+        the builder objects of the VHDL generator."""
+        code_gen_cls = BehaviorCodeGen._lookup(field_descriptor)
+        return code_gen_cls(field_descriptor, *args, **kwargs)
+
+    @staticmethod
+    def supports_arrays(field_descriptor):
+        """Returns whether the code generator for the given parsed field
+        descriptor can generate the bus logic for a `FieldArray` at once."""
+        return BehaviorCodeGen._lookup(field_descriptor).SUPPORTS_ARRAYS
+
     @staticmethod
     def generate():
         """This function must be overridden by the derived classes to generate
@@ -378,6 +409,7 @@ class BehaviorCodeGen:
     def _add_bus_logic(self, direction, normal, lookahead, both, deferred):
         """Implements `add_read_logic()` and `add_write_logic()`. They are
         distinguished through `direction`, which must be `'r'` or `'w'`."""
+        decoder = {'r': self._read_decoder, 'w': self._write_decoder}[direction]
         for index, field in enumerate(self.field_descriptor.fields):
 
             # Determine the address that the regular field logic should be
@@ -392,6 +424,13 @@ class BehaviorCodeGen:
             # Describe the field for use in comments.
             desc = self._describe_field(field)
 
+            # Fields in a regular array are handled all at once, by indexing
+            # using the address bits that discriminate between them.
+            if self._array is not None:
+                address = self._array.address
+                desc = self._describe()
+                index = decoder.index(self._array.stride, self._array.count)
+
             # Create a template engine for processing the incoming blocks.
             tple = TemplateEngine()
             tple['i'] = index
@@ -422,7 +461,6 @@ class BehaviorCodeGen:
             if both is not None:
                 tple.append_block('BOTH', '@ Access logic.', both)
             block = tple.apply_str_to_str(_BUS_REQ_FIELD_TEMPLATE, postprocess=False)
-            decoder = {'r': self._read_decoder, 'w': self._write_decoder}[direction]
             decoder[address] = block
 
             # Add the deferred block.
@@ -434,3 +472,6 @@ class BehaviorCodeGen:
                 }[direction]
                 block = tple.apply_str_to_str(_BUS_RESP_FIELD_TEMPLATE, postprocess=False)
                 tag_decoder[tag] = block
+
+            if self._array is not None:
+                break
@@ -9,6 +9,10 @@ from .base import BehaviorCodeGen, behavior_code_gen
 class CustomBehaviorCodeGen(BehaviorCodeGen):
     """Behavior code generator class for custom fields."""
 
+    # The bus logic of custom fields is user-specified, and may rely on the
+    # field index being a literal, for instance to select a generic.
+    SUPPORTS_ARRAYS = False
+
     def generate(self):
         """Code generator implementation."""
 
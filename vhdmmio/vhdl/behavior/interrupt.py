@@ -1,11 +1,17 @@
 """Submodule for interrupt field behavior VHDL code generation."""
 
-from ...template import TemplateEngine, preload_template
+from ...template import TemplateEngine, preload_template, compile_template
 from ...core.behavior import InterruptBehavior
 from .base import BehaviorCodeGen, behavior_code_gen
 
 _TEMPLATE = preload_template('interrupt.template.vhd', '--')
 
+# Variants of the template expanding its READ and WRITE blocks, compiled
+# once at import.
+_BLOCKS = {
+    block: compile_template('%s\n\n$%s' % (_TEMPLATE, block))
+    for block in ('READ', 'WRITE')}
+
 @behavior_code_gen(InterruptBehavior)
 class InterruptBehaviorCodeGen(BehaviorCodeGen):
     """Behavior code generator class for interrupt fields."""
@@ -30,8 +36,7 @@ class InterruptBehaviorCodeGen(BehaviorCodeGen):
         tple.passthrough('i', 'r_data', 'w_data', 'w_strobe')
 
         def expand(block):
-            expanded = tple.apply_str_to_str(
-                '%s\n\n$%s' % (_TEMPLATE, block), postprocess=False)
+            expanded = tple.apply_str_to_str(_BLOCKS[block], postprocess=False)
             if not expanded.strip():
                 expanded = None
             return expanded
@@ -1,12 +1,17 @@
 """Submodule for primitive field behavior VHDL code generation."""
 
-from ...template import TemplateEngine, preload_template
+from ...template import TemplateEngine, preload_template, compile_template
 from ...core.behavior import PrimitiveBehavior
 from ..types import std_logic, std_logic_vector, Record, Array, gather_defs
 from .base import BehaviorCodeGen, behavior_code_gen
 
 _TEMPLATE = preload_template('primitive.template.vhd', '--')
 
+# Compiled variants of the template, one for each block that is expanded.
+_BLOCKS = {
+    block: compile_template('%s\n\n$%s' % (_TEMPLATE, block))
+    for block in ('PRE', 'POST', 'READ', 'WRITE')}
+
 @behavior_code_gen(PrimitiveBehavior)
 class PrimitiveBehaviorCodeGen(BehaviorCodeGen):
     """Behavior code generator class for primitive fields."""
@@ -120,8 +125,7 @@ class PrimitiveBehaviorCodeGen(BehaviorCodeGen):
         tple.passthrough('i', 'r_data', 'w_data', 'w_strobe')
 
         def expand(block):
-            expanded = tple.apply_str_to_str(
-                '%s\n\n$%s' % (_TEMPLATE, block), postprocess=False)
+            expanded = tple.apply_str_to_str(_BLOCKS[block], postprocess=False)
             if not expanded.strip():
                 expanded = None
             return expanded
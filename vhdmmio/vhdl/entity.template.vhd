@@ -25,31 +25,67 @@ $endif
 
 $   PORTS
 
-    -- AXI4-lite + interrupt request bus to the master.
-$if e.bus_flatten
+$if e.bus_protocol == 'axi4'
+    -- AXI4 + interrupt request bus to the master.
     $e.bus_prefix$awvalid : in  std_logic := '0';
     $e.bus_prefix$awready : out std_logic := '1';
+    $e.bus_prefix$awid    : in  std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
     $e.bus_prefix$awaddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+    $e.bus_prefix$awlen   : in  std_logic_vector(7 downto 0) := X"00";
+    $e.bus_prefix$awsize  : in  std_logic_vector(2 downto 0) := "$'{:03b}'.format(bw.bit_length()-4)$";
+    $e.bus_prefix$awburst : in  std_logic_vector(1 downto 0) := "01";
     $e.bus_prefix$awprot  : in  std_logic_vector(2 downto 0) := "000";
     $e.bus_prefix$wvalid  : in  std_logic := '0';
     $e.bus_prefix$wready  : out std_logic := '1';
     $e.bus_prefix$wdata   : in  std_logic_vector($bw-1$ downto 0) := (others => '0');
     $e.bus_prefix$wstrb   : in  std_logic_vector($bw//8-1$ downto 0) := (others => '0');
+    $e.bus_prefix$wlast   : in  std_logic := '1';
     $e.bus_prefix$bvalid  : out std_logic := '0';
     $e.bus_prefix$bready  : in  std_logic := '1';
+    $e.bus_prefix$bid     : out std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
     $e.bus_prefix$bresp   : out std_logic_vector(1 downto 0) := "00";
     $e.bus_prefix$arvalid : in  std_logic := '0';
     $e.bus_prefix$arready : out std_logic := '1';
+    $e.bus_prefix$arid    : in  std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
     $e.bus_prefix$araddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+    $e.bus_prefix$arlen   : in  std_logic_vector(7 downto 0) := X"00";
+    $e.bus_prefix$arsize  : in  std_logic_vector(2 downto 0) := "$'{:03b}'.format(bw.bit_length()-4)$";
+    $e.bus_prefix$arburst : in  std_logic_vector(1 downto 0) := "01";
     $e.bus_prefix$arprot  : in  std_logic_vector(2 downto 0) := "000";
     $e.bus_prefix$rvalid  : out std_logic := '0';
     $e.bus_prefix$rready  : in  std_logic := '1';
+    $e.bus_prefix$rid     : out std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
     $e.bus_prefix$rdata   : out std_logic_vector($bw-1$ downto 0) := (others => '0');
     $e.bus_prefix$rresp   : out std_logic_vector(1 downto 0) := "00";
+    $e.bus_prefix$rlast   : out std_logic := '0';
     $e.bus_prefix$uirq    : out std_logic := '0'
 $else
+    -- AXI4-lite + interrupt request bus to the master.
+ |$if e.bus_flatten
+    $e.bus_prefix$awvalid : in  std_logic := '0';
+    $e.bus_prefix$awready : out std_logic := '1';
+    $e.bus_prefix$awaddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+    $e.bus_prefix$awprot  : in  std_logic_vector(2 downto 0) := "000";
+    $e.bus_prefix$wvalid  : in  std_logic := '0';
+    $e.bus_prefix$wready  : out std_logic := '1';
+    $e.bus_prefix$wdata   : in  std_logic_vector($bw-1$ downto 0) := (others => '0');
+    $e.bus_prefix$wstrb   : in  std_logic_vector($bw//8-1$ downto 0) := (others => '0');
+    $e.bus_prefix$bvalid  : out std_logic := '0';
+    $e.bus_prefix$bready  : in  std_logic := '1';
+    $e.bus_prefix$bresp   : out std_logic_vector(1 downto 0) := "00";
+    $e.bus_prefix$arvalid : in  std_logic := '0';
+    $e.bus_prefix$arready : out std_logic := '1';
+    $e.bus_prefix$araddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+    $e.bus_prefix$arprot  : in  std_logic_vector(2 downto 0) := "000";
+    $e.bus_prefix$rvalid  : out std_logic := '0';
+    $e.bus_prefix$rready  : in  std_logic := '1';
+    $e.bus_prefix$rdata   : out std_logic_vector($bw-1$ downto 0) := (others => '0');
+    $e.bus_prefix$rresp   : out std_logic_vector(1 downto 0) := "00";
+    $e.bus_prefix$uirq    : out std_logic := '0'
+ |$else
     $e.bus_prefix$i : in  axi4l$bw$_m2s_type := AXI4L$bw$_M2S_RESET;
     $e.bus_prefix$o : out axi4l$bw$_s2m_type := AXI4L$bw$_S2M_RESET
+ |$endif
 $endif
 
   );
@@ -79,6 +115,42 @@ begin
         unsigned(accum) - resize(unsigned(addend), accum'length));
     end procedure accum_sub;
 
+$if e.bus_protocol == 'axi4'
+    -- Decodes the address increment and wrapping mask for an AXI4 burst.
+    -- Address bits that are set in the mask are taken from the incremented
+    -- address, the others remain constant.
+    procedure axi4_burst(
+      len   : std_logic_vector(7 downto 0);
+      size  : std_logic_vector(2 downto 0);
+      burst : std_logic_vector(1 downto 0);
+      inc   : out std_logic_vector(31 downto 0);
+      mask  : out std_logic_vector(31 downto 0)) is
+    begin
+      inc := std_logic_vector(shift_left(to_unsigned(1, 32), to_integer(unsigned(size))));
+      case burst is
+        when "00" => -- FIXED
+          mask := (others => '0');
+        when "10" => -- WRAP
+          mask := std_logic_vector(shift_left(
+            resize(unsigned(len), 32) + 1, to_integer(unsigned(size))) - 1);
+        when others => -- INCR
+          mask := (others => '1');
+      end case;
+    end procedure axi4_burst;
+
+    -- Advances an address to the next beat of an AXI4 burst.
+    procedure axi4_next(
+      addr  : inout std_logic_vector(31 downto 0);
+      inc   : std_logic_vector(31 downto 0);
+      mask  : std_logic_vector(31 downto 0)) is
+      variable next_addr : std_logic_vector(31 downto 0);
+    begin
+      next_addr := std_logic_vector(
+        (unsigned(addr) and not (unsigned(inc) - 1)) + unsigned(inc));
+      addr := (addr and not mask) or (next_addr and mask);
+    end procedure axi4_next;
+
+$endif
 $if e.reset_name != 'reset'
     -- Internal alias for the reset input.
     variable reset : std_logic;
@@ -94,6 +166,66 @@ $endif
     variable wl  : axi4lw$bw$_type := AXI4LW$bw$_RESET; -- reg
     variable arl : axi4la_type := AXI4LA_RESET; -- reg
 
+$if qd
+    -- Request queues in front of the holding registers. Incoming requests are
+    -- pushed into the queue when the respective *q_ready flag is set, and the
+    -- oldest queued request is moved into the holding register whenever it
+    -- is empty. The queue entries at and beyond *q_count are always invalid.
+    -- The ready signals seen by the master are driven by the *q_ready flags
+    -- instead of bus_v.
+    type axi4la_queue_type is array (natural range <>) of axi4la_type;
+    type axi4lw_queue_type is array (natural range <>) of axi4lw$bw$_type;
+    variable awq       : axi4la_queue_type(0 to $qd-1$) := (others => AXI4LA_RESET); -- reg
+    variable awq_count : natural range 0 to $qd$ := 0; -- reg
+    variable awq_ready : std_logic := '1'; -- reg
+    variable wq        : axi4lw_queue_type(0 to $qd-1$) := (others => AXI4LW$bw$_RESET); -- reg
+    variable wq_count  : natural range 0 to $qd$ := 0; -- reg
+    variable wq_ready  : std_logic := '1'; -- reg
+    variable arq       : axi4la_queue_type(0 to $qd-1$) := (others => AXI4LA_RESET); -- reg
+    variable arq_count : natural range 0 to $qd$ := 0; -- reg
+    variable arq_ready : std_logic := '1'; -- reg
+
+$endif
+$if e.bus_protocol == 'axi4'
+    -- AXI4 burst state. When the master transfers a burst request, its first
+    -- beat is placed in the request holding register, and the remaining
+    -- beats are placed there one by one as the previous beat is accepted.
+    -- *_len is the number of beats that still need to be issued, *_inc and
+    -- *_mask are the address increment and wrapping mask (see axi4_burst),
+    -- and *_busy is set until the response for the last beat of the burst
+    -- has been sent, since only one burst is handled at a time. b_len and
+    -- r_len count the responses still expected before the last beat of the
+    -- burst, and b_resp accumulates the most severe write response.
+    variable aw_id    : std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0'); -- reg
+    variable aw_len   : std_logic_vector(7 downto 0) := X"00"; -- reg
+    variable aw_inc   : std_logic_vector(31 downto 0) := X"00000000"; -- reg
+    variable aw_mask  : std_logic_vector(31 downto 0) := X"00000000"; -- reg
+    variable aw_busy  : std_logic := '0'; -- reg
+    variable b_len    : std_logic_vector(7 downto 0) := X"00"; -- reg
+    variable b_resp   : std_logic_vector(1 downto 0) := AXI4L_RESP_OKAY; -- reg
+    variable ar_id    : std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0'); -- reg
+    variable ar_len   : std_logic_vector(7 downto 0) := X"00"; -- reg
+    variable ar_inc   : std_logic_vector(31 downto 0) := X"00000000"; -- reg
+    variable ar_mask  : std_logic_vector(31 downto 0) := X"00000000"; -- reg
+    variable ar_busy  : std_logic := '0'; -- reg
+    variable r_len    : std_logic_vector(7 downto 0) := X"00"; -- reg
+
+    -- AXI4 output registers. The responses in bus_v are forwarded to these
+    -- registers by the burst logic, so they are never seen by the master
+    -- directly.
+    variable xaw_ready : std_logic := '1'; -- reg
+    variable xar_ready : std_logic := '1'; -- reg
+    variable xb_valid  : std_logic := '0'; -- reg
+    variable xb_id     : std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0'); -- reg
+    variable xb_resp   : std_logic_vector(1 downto 0) := AXI4L_RESP_OKAY; -- reg
+    variable xr_valid  : std_logic := '0'; -- reg
+    variable xr_id     : std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0'); -- reg
+    variable xr_data   : std_logic_vector($bw-1$ downto 0) := (others => '0'); -- reg
+    variable xr_resp   : std_logic_vector(1 downto 0) := AXI4L_RESP_OKAY; -- reg
+    variable xr_last   : std_logic := '0'; -- reg
+
+$endif
+
     -- Request flags for the register logic. When asserted, a request is
     -- present in awl/wl/arl, and the response can be returned immediately.
     -- This is used by simple registers.
@@ -107,6 +239,15 @@ $endif
     variable w_lreq : boolean := false;
     variable r_lreq : boolean := false;
 
+$if pl
+    -- Address decoder pipeline valid flags. Bit i is set when stage i of the
+    -- respective address decoder pipeline holds the decoded address of the
+    -- request in the holding register(s). The request flags above are only
+    -- asserted once the last stage is valid.
+    variable w_dec : std_logic_vector($pl-1$ downto 0) := (others => '0'); -- reg
+    variable r_dec : std_logic_vector($pl-1$ downto 0) := (others => '0'); -- reg
+$endif
+
 $if di.write_count
     -- Write response request flag and tag for deferred requests. When the flag
     -- is set, the register matching the tag can return its result.
@@ -266,6 +407,42 @@ $endif
     -- subregister is being read.
     variable r_data  : std_logic_vector($bw-1$ downto 0);
 
+$if rmux
+    -- Read data multiplexer. When a readable block is accessed, it stores its
+    -- physical read data in its own entry of r_bdata instead of in r_data
+    -- directly. All entries are cleared every cycle, so r_data can be formed
+    -- by OR-ing all entries together. This is done using a balanced
+    -- reduction tree, such that the logic depth is logarithmic in the number
+    -- of blocks.
+    type r_bdata_array is array (natural range <>) of std_logic_vector($bw-1$ downto 0);
+ |$if r.cfg.features.read_mux == 'registered-or-tree'
+    variable r_bdata : r_bdata_array(0 to $rmux-1$) := (others => (others => '0')); -- reg
+ |$else
+    variable r_bdata : r_bdata_array(0 to $rmux-1$) := (others => (others => '0'));
+ |$endif
+
+    -- Balanced OR reduction tree for the read data multiplexer.
+    function r_bdata_reduce(data: r_bdata_array) return std_logic_vector is
+      constant mid : natural := data'low + (data'length - 1) / 2;
+    begin
+      if data'length = 1 then
+        return data(data'low);
+      end if;
+      return r_bdata_reduce(data(data'low to mid))
+          or r_bdata_reduce(data(mid + 1 to data'high));
+    end function r_bdata_reduce;
+
+ |$if r.cfg.features.read_mux == 'registered-or-tree'
+    -- With the registered read data multiplexer, read responses are sent one
+    -- cycle after they are handled, when the read data has passed through the
+    -- r_bdata registers. r_pend is set in the cycle in which the response is
+    -- handled, and r_presp holds the response code in the meantime.
+    variable r_pend  : boolean := false; -- reg
+    variable r_presp : std_logic_vector(1 downto 0) := AXI4L_RESP_OKAY; -- reg
+
+ |$endif
+$endif
+
 $if ii.concat_width > 0
     -- Interrupt input variables. i_raw is set to the raw incoming interrupt
     -- values, as read by the interrupt-raw fields. This value is subsequently
@@ -317,10 +494,14 @@ $if di.read_count
       r_rreq  := false;
       r_rtag  := (others => '0');
 $endif
+$if not pl
       w_addr  := (others => '0');
+$endif
       w_data  := (others => '0');
       w_strb  := (others => '0');
+$if not pl
       r_addr  := (others => '0');
+$endif
 $if di.write_count
       w_defer := false;
       w_dtag  := (others => '0');
@@ -345,51 +526,200 @@ $endif
       -------------------------------------------------------------------------
       -- Invalidate responses that were acknowledged by the master in the
       -- previous cycle.
-$if e.bus_flatten
+$if e.bus_protocol == 'axi4'
       if $e.bus_prefix$bready = '1' then
+        xb_valid := '0';
+      end if;
+      if $e.bus_prefix$rready = '1' then
+        xr_valid := '0';
+      end if;
 $else
+ |$if e.bus_flatten
+      if $e.bus_prefix$bready = '1' then
+ |$else
       if $e.bus_prefix$i.b.ready = '1' then
-$endif
+ |$endif
         bus_v.b.valid := '0';
       end if;
-$if e.bus_flatten
+ |$if e.bus_flatten
       if $e.bus_prefix$rready = '1' then
-$else
+ |$else
       if $e.bus_prefix$i.r.ready = '1' then
-$endif
+ |$endif
         bus_v.r.valid := '0';
       end if;
+$endif
 
+$if rmux
+ |$if r.cfg.features.read_mux == 'registered-or-tree'
+      -- Send the read response handled in the previous cycle, now that the
+      -- read data is available in the r_bdata registers. The response
+      -- register is guaranteed to be empty at this point, since the request
+      -- could only be handled if it was empty.
+      if r_pend then
+        bus_v.r.valid := '1';
+        bus_v.r.resp := r_presp;
+        if r_presp = AXI4L_RESP_OKAY then
+          bus_v.r.data := r_bdata_reduce(r_bdata);
+        end if;
+        r_pend := false;
+      end if;
+
+ |$endif
+      -- Clear the read data multiplexer inputs.
+      r_bdata := (others => (others => '0'));
+
+$endif
       -- If we indicated to the master that we were ready for a transaction on
       -- any of the incoming channels, we must latch any incoming requests. If
       -- we're ready but there is no incoming request this becomes don't-care.
-      if bus_v.aw.ready = '1' then
-$if e.bus_flatten
+$if e.bus_protocol == 'axi4'
+      -- For AXI4, the address holding registers are either loaded with the
+      -- first beat of a new burst, or with the next beat of the current one.
+      if xaw_ready = '1' then
         awl.valid := $e.bus_prefix$awvalid;
         awl.addr  := $e.bus_prefix$awaddr;
         awl.prot  := $e.bus_prefix$awprot;
+        if $e.bus_prefix$awvalid = '1' then
+          aw_id   := $e.bus_prefix$awid;
+          aw_len  := $e.bus_prefix$awlen;
+          aw_busy := '1';
+          b_len   := $e.bus_prefix$awlen;
+          b_resp  := AXI4L_RESP_OKAY;
+          axi4_burst($e.bus_prefix$awlen, $e.bus_prefix$awsize, $e.bus_prefix$awburst, aw_inc, aw_mask);
+        end if;
+      elsif bus_v.aw.ready = '1' and aw_len /= X"00" then
+        awl.valid := '1';
+        axi4_next(awl.addr, aw_inc, aw_mask);
+        aw_len    := std_logic_vector(unsigned(aw_len) - 1);
+      end if;
+      if bus_v.w.ready = '1' then
+        wl.valid := $e.bus_prefix$wvalid;
+        wl.data  := $e.bus_prefix$wdata;
+        wl.strb  := $e.bus_prefix$wstrb;
+      end if;
 $else
+ |$if qd
+      -- With request queues, incoming requests are pushed into the queues,
+      -- and the holding registers are loaded from the queues instead.
+      if awq_ready = '1' then
+  |$if e.bus_flatten
+        awq(awq_count).valid := $e.bus_prefix$awvalid;
+        awq(awq_count).addr  := $e.bus_prefix$awaddr;
+        awq(awq_count).prot  := $e.bus_prefix$awprot;
+  |$else
+        awq(awq_count) := $e.bus_prefix$i.aw;
+  |$endif
+        if awq(awq_count).valid = '1' then
+          awq_count := awq_count + 1;
+        end if;
+      end if;
+      if bus_v.aw.ready = '1' then
+        awl := awq(0);
+        if awq_count > 0 then
+  |$if qd > 1
+          awq(0 to $qd-2$) := awq(1 to $qd-1$);
+  |$endif
+          awq($qd-1$).valid := '0';
+          awq_count := awq_count - 1;
+        end if;
+      end if;
+      if wq_ready = '1' then
+  |$if e.bus_flatten
+        wq(wq_count).valid := $e.bus_prefix$wvalid;
+        wq(wq_count).data  := $e.bus_prefix$wdata;
+        wq(wq_count).strb  := $e.bus_prefix$wstrb;
+  |$else
+        wq(wq_count) := $e.bus_prefix$i.w;
+  |$endif
+        if wq(wq_count).valid = '1' then
+          wq_count := wq_count + 1;
+        end if;
+      end if;
+      if bus_v.w.ready = '1' then
+        wl := wq(0);
+        if wq_count > 0 then
+  |$if qd > 1
+          wq(0 to $qd-2$) := wq(1 to $qd-1$);
+  |$endif
+          wq($qd-1$).valid := '0';
+          wq_count := wq_count - 1;
+        end if;
+      end if;
+ |$else
+      if bus_v.aw.ready = '1' then
+  |$if e.bus_flatten
+        awl.valid := $e.bus_prefix$awvalid;
+        awl.addr  := $e.bus_prefix$awaddr;
+        awl.prot  := $e.bus_prefix$awprot;
+  |$else
         awl := $e.bus_prefix$i.aw;
-$endif
+  |$endif
       end if;
       if bus_v.w.ready = '1' then
-$if e.bus_flatten
+  |$if e.bus_flatten
         wl.valid := $e.bus_prefix$wvalid;
         wl.data  := $e.bus_prefix$wdata;
         wl.strb  := $e.bus_prefix$wstrb;
-$else
+  |$else
         wl := $e.bus_prefix$i.w;
+  |$endif
+      end if;
+ |$endif
 $endif
+$if e.bus_protocol == 'axi4'
+      if xar_ready = '1' then
+        arl.valid := $e.bus_prefix$arvalid;
+        arl.addr  := $e.bus_prefix$araddr;
+        arl.prot  := $e.bus_prefix$arprot;
+        if $e.bus_prefix$arvalid = '1' then
+          ar_id   := $e.bus_prefix$arid;
+          ar_len  := $e.bus_prefix$arlen;
+          ar_busy := '1';
+          r_len   := $e.bus_prefix$arlen;
+          axi4_burst($e.bus_prefix$arlen, $e.bus_prefix$arsize, $e.bus_prefix$arburst, ar_inc, ar_mask);
+        end if;
+      elsif bus_v.ar.ready = '1' and ar_len /= X"00" then
+        arl.valid := '1';
+        axi4_next(arl.addr, ar_inc, ar_mask);
+        ar_len    := std_logic_vector(unsigned(ar_len) - 1);
+      end if;
+$else
+ |$if qd
+      if arq_ready = '1' then
+  |$if e.bus_flatten
+        arq(arq_count).valid := $e.bus_prefix$arvalid;
+        arq(arq_count).addr  := $e.bus_prefix$araddr;
+        arq(arq_count).prot  := $e.bus_prefix$arprot;
+  |$else
+        arq(arq_count) := $e.bus_prefix$i.ar;
+  |$endif
+        if arq(arq_count).valid = '1' then
+          arq_count := arq_count + 1;
+        end if;
       end if;
       if bus_v.ar.ready = '1' then
-$if e.bus_flatten
+        arl := arq(0);
+        if arq_count > 0 then
+  |$if qd > 1
+          arq(0 to $qd-2$) := arq(1 to $qd-1$);
+  |$endif
+          arq($qd-1$).valid := '0';
+          arq_count := arq_count - 1;
+        end if;
+      end if;
+ |$else
+      if bus_v.ar.ready = '1' then
+  |$if e.bus_flatten
         arl.valid := $e.bus_prefix$arvalid;
         arl.addr  := $e.bus_prefix$araddr;
         arl.prot  := $e.bus_prefix$arprot;
-$else
+  |$else
         arl := $e.bus_prefix$i.ar;
-$endif
+  |$endif
       end if;
+ |$endif
+$endif
 
 $if defined('INTERNAL_SIGNAL_EARLY')
       -------------------------------------------------------------------------
@@ -422,14 +752,22 @@ $endif
       -------------------------------------------------------------------------
       -- We're ready for a write/read when all the respective channels (or
       -- their holding registers) are ready/waiting for us.
+$if pl
+      if awl.valid = '1' and wl.valid = '1' and w_dec($pl-1$) = '1' then
+$else
       if awl.valid = '1' and wl.valid = '1' then
+$endif
         if bus_v.b.valid = '0' then
           w_req := true; -- Request valid and response register empty.
         else
           w_lreq := true; -- Request valid, but response register is busy.
         end if;
       end if;
+$if pl
+      if arl.valid = '1' and r_dec($pl-1$) = '1' then
+$else
       if arl.valid = '1' then
+$endif
         if bus_v.r.valid = '0' then
           r_req := true; -- Request valid and response register empty.
         else
@@ -643,6 +981,11 @@ $endif
 
       end if;
 
+$if rmux and r.cfg.features.read_mux != 'registered-or-tree'
+      -- Form the read data using the read data multiplexer.
+      r_data := r_bdata_reduce(r_bdata);
+
+$endif
       -- Perform the read action dictated by the field logic.
 $if di.read_count
       if (r_req and not r_block) or r_defer then
@@ -680,6 +1023,18 @@ $else
         arl.valid := '0';
 $endif
 
+$if rmux and r.cfg.features.read_mux == 'registered-or-tree'
+        -- Prepare the appropriate read response, to be sent in the next
+        -- cycle.
+        r_pend := true;
+        if r_nack then
+          r_presp := AXI4L_RESP_SLVERR;
+        elsif r_ack then
+          r_presp := AXI4L_RESP_OKAY;
+        else
+          r_presp := AXI4L_RESP_DECERR;
+        end if;
+$else
         -- Send the appropriate read response.
         bus_v.r.valid := '1';
         if r_nack then
@@ -690,6 +1045,7 @@ $endif
         else
           bus_v.r.resp := AXI4L_RESP_DECERR;
         end if;
+$endif
 
       end if;
 
@@ -718,6 +1074,109 @@ $endif
       bus_v.w.ready := not wl.valid;
       bus_v.ar.ready := not arl.valid;
 
+$if qd
+      -- Accept new requests into the request queues as long as they are not
+      -- full.
+      if awq_count < $qd$ then
+        awq_ready := '1';
+      else
+        awq_ready := '0';
+      end if;
+      if wq_count < $qd$ then
+        wq_ready := '1';
+      else
+        wq_ready := '0';
+      end if;
+      if arq_count < $qd$ then
+        arq_ready := '1';
+      else
+        arq_ready := '0';
+      end if;
+
+$endif
+$if e.bus_protocol == 'axi4'
+      -------------------------------------------------------------------------
+      -- AXI4 burst logic
+      -------------------------------------------------------------------------
+      -- Forward write responses to the master. Only the response to the last
+      -- beat of a burst is sent; the responses to the other beats are merged
+      -- into b_resp and dropped.
+      if bus_v.b.valid = '1' then
+        if unsigned(bus_v.b.resp) > unsigned(b_resp) then
+          b_resp := bus_v.b.resp;
+        end if;
+        if b_len /= X"00" then
+          b_len := std_logic_vector(unsigned(b_len) - 1);
+          bus_v.b.valid := '0';
+        elsif xb_valid = '0' then
+          xb_valid := '1';
+          xb_id := aw_id;
+          xb_resp := b_resp;
+          aw_busy := '0';
+          bus_v.b.valid := '0';
+        end if;
+      end if;
+
+      -- Forward read responses to the master, marking the last beat of each
+      -- burst.
+      if bus_v.r.valid = '1' and xr_valid = '0' then
+        xr_valid := '1';
+        xr_id := ar_id;
+        xr_data := bus_v.r.data;
+        xr_resp := bus_v.r.resp;
+        bus_v.r.valid := '0';
+        if r_len = X"00" then
+          xr_last := '1';
+          ar_busy := '0';
+        else
+          xr_last := '0';
+          r_len := std_logic_vector(unsigned(r_len) - 1);
+        end if;
+      end if;
+
+      -- We're ready for a new burst when the holding register is empty and
+      -- the previous burst has been completed.
+      xaw_ready := bus_v.aw.ready and not aw_busy;
+      xar_ready := bus_v.ar.ready and not ar_busy;
+
+$endif
+$if pl
+      -------------------------------------------------------------------------
+      -- Pipelined address decoders
+      -------------------------------------------------------------------------
+      -- Requests remain in the holding registers until they are accepted, so
+      -- the decoded address of a request remains valid until then. When the
+      -- holding register is emptied, the pipeline is invalidated; the next
+      -- request will be decoded in the cycle in which it is received. Note
+      -- that the address variables retain their value (including any
+      -- concatenated page/condition signals) when the request is not handled
+      -- immediately in pipelined mode.
+      if awl.valid = '1' then
+        for i in $pl-1$ downto 1 loop
+          w_dec(i) := w_dec(i - 1);
+        end loop;
+        w_dec(0) := '1';
+      else
+        w_dec := (others => '0');
+      end if;
+      if arl.valid = '1' then
+        for i in $pl-1$ downto 1 loop
+          r_dec(i) := r_dec(i - 1);
+        end loop;
+        r_dec(0) := '1';
+      else
+        r_dec := (others => '0');
+      end if;
+ |$if defined('WRITE_DECODER')
+
+$     WRITE_DECODER
+ |$endif
+ |$if defined('READ_DECODER')
+
+$     READ_DECODER
+ |$endif
+
+$endif
 $if defined('INTERNAL_SIGNAL_LATE')
       -------------------------------------------------------------------------
       -- Internal signal logic
@@ -737,6 +1196,31 @@ $endif
         awl        := AXI4LA_RESET;
         wl         := AXI4LW$bw$_RESET;
         arl        := AXI4LA_RESET;
+$if qd
+        awq        := (others => AXI4LA_RESET);
+        awq_count  := 0;
+        awq_ready  := '1';
+        wq         := (others => AXI4LW$bw$_RESET);
+        wq_count   := 0;
+        wq_ready   := '1';
+        arq        := (others => AXI4LA_RESET);
+        arq_count  := 0;
+        arq_ready  := '1';
+$endif
+$if e.bus_protocol == 'axi4'
+        aw_len     := X"00";
+        aw_busy    := '0';
+        ar_len     := X"00";
+        ar_busy    := '0';
+        xaw_ready  := '1';
+        xar_ready  := '1';
+        xb_valid   := '0';
+        xr_valid   := '0';
+$endif
+$if pl
+        w_dec      := (others => '0');
+        r_dec      := (others => '0');
+$endif
 $if di.write_count
         w_tag_wptr := (others => '0');
         w_tag_rptr := (others => '0');
@@ -756,6 +1240,9 @@ $endif
         w_multi    := '0';
         r_multi    := '0';
         r_hold     := (others => '0');
+$if rmux and r.cfg.features.read_mux == 'registered-or-tree'
+        r_pend     := false;
+$endif
 $if ii.concat_width > 0
         i_umsk     := "$ii.umsk_reset$";
         i_flag     := "$'0' * ii.concat_width$";
@@ -763,18 +1250,38 @@ $if ii.concat_width > 0
 $endif
       end if;
 
-$if e.bus_flatten
-      $e.bus_prefix$awready <= bus_v.aw.ready;
+$if e.bus_protocol == 'axi4'
+      $e.bus_prefix$awready <= xaw_ready;
       $e.bus_prefix$wready  <= bus_v.w.ready;
+      $e.bus_prefix$bvalid  <= xb_valid;
+      $e.bus_prefix$bid     <= xb_id;
+      $e.bus_prefix$bresp   <= xb_resp;
+      $e.bus_prefix$arready <= xar_ready;
+      $e.bus_prefix$rvalid  <= xr_valid;
+      $e.bus_prefix$rid     <= xr_id;
+      $e.bus_prefix$rdata   <= xr_data;
+      $e.bus_prefix$rresp   <= xr_resp;
+      $e.bus_prefix$rlast   <= xr_last;
+      $e.bus_prefix$uirq    <= bus_v.u.irq;
+$else
+ |$if e.bus_flatten
+      $e.bus_prefix$awready <= $'awq_ready' if qd else 'bus_v.aw.ready'$;
+      $e.bus_prefix$wready  <= $'wq_ready' if qd else 'bus_v.w.ready'$;
       $e.bus_prefix$bvalid  <= bus_v.b.valid;
       $e.bus_prefix$bresp   <= bus_v.b.resp;
-      $e.bus_prefix$arready <= bus_v.ar.ready;
+      $e.bus_prefix$arready <= $'arq_ready' if qd else 'bus_v.ar.ready'$;
       $e.bus_prefix$rvalid  <= bus_v.r.valid;
       $e.bus_prefix$rdata   <= bus_v.r.data;
       $e.bus_prefix$rresp   <= bus_v.r.resp;
       $e.bus_prefix$uirq    <= bus_v.u.irq;
-$else
+ |$else
       $e.bus_prefix$o <= bus_v;
+  |$if qd
+      $e.bus_prefix$o.aw.ready <= awq_ready;
+      $e.bus_prefix$o.w.ready <= wq_ready;
+      $e.bus_prefix$o.ar.ready <= arq_ready;
+  |$endif
+ |$endif
 $endif
 
     end if;
@@ -29,31 +29,67 @@ $endif
 
 $     PORTS
 
-      -- AXI4-lite + interrupt request bus to the master.
-$if e.bus_flatten
+$if e.bus_protocol == 'axi4'
+      -- AXI4 + interrupt request bus to the master.
       $e.bus_prefix$awvalid : in  std_logic := '0';
       $e.bus_prefix$awready : out std_logic := '1';
+      $e.bus_prefix$awid    : in  std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
       $e.bus_prefix$awaddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+      $e.bus_prefix$awlen   : in  std_logic_vector(7 downto 0) := X"00";
+      $e.bus_prefix$awsize  : in  std_logic_vector(2 downto 0) := "$'{:03b}'.format(bw.bit_length()-4)$";
+      $e.bus_prefix$awburst : in  std_logic_vector(1 downto 0) := "01";
       $e.bus_prefix$awprot  : in  std_logic_vector(2 downto 0) := "000";
       $e.bus_prefix$wvalid  : in  std_logic := '0';
       $e.bus_prefix$wready  : out std_logic := '1';
       $e.bus_prefix$wdata   : in  std_logic_vector($bw-1$ downto 0) := (others => '0');
       $e.bus_prefix$wstrb   : in  std_logic_vector($bw//8-1$ downto 0) := (others => '0');
+      $e.bus_prefix$wlast   : in  std_logic := '1';
       $e.bus_prefix$bvalid  : out std_logic := '0';
       $e.bus_prefix$bready  : in  std_logic := '1';
+      $e.bus_prefix$bid     : out std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
       $e.bus_prefix$bresp   : out std_logic_vector(1 downto 0) := "00";
       $e.bus_prefix$arvalid : in  std_logic := '0';
       $e.bus_prefix$arready : out std_logic := '1';
+      $e.bus_prefix$arid    : in  std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
       $e.bus_prefix$araddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+      $e.bus_prefix$arlen   : in  std_logic_vector(7 downto 0) := X"00";
+      $e.bus_prefix$arsize  : in  std_logic_vector(2 downto 0) := "$'{:03b}'.format(bw.bit_length()-4)$";
+      $e.bus_prefix$arburst : in  std_logic_vector(1 downto 0) := "01";
       $e.bus_prefix$arprot  : in  std_logic_vector(2 downto 0) := "000";
       $e.bus_prefix$rvalid  : out std_logic := '0';
       $e.bus_prefix$rready  : in  std_logic := '1';
+      $e.bus_prefix$rid     : out std_logic_vector($e.bus_id_width-1$ downto 0) := (others => '0');
       $e.bus_prefix$rdata   : out std_logic_vector($bw-1$ downto 0) := (others => '0');
       $e.bus_prefix$rresp   : out std_logic_vector(1 downto 0) := "00";
+      $e.bus_prefix$rlast   : out std_logic := '0';
       $e.bus_prefix$uirq    : out std_logic := '0'
 $else
+      -- AXI4-lite + interrupt request bus to the master.
+ |$if e.bus_flatten
+      $e.bus_prefix$awvalid : in  std_logic := '0';
+      $e.bus_prefix$awready : out std_logic := '1';
+      $e.bus_prefix$awaddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+      $e.bus_prefix$awprot  : in  std_logic_vector(2 downto 0) := "000";
+      $e.bus_prefix$wvalid  : in  std_logic := '0';
+      $e.bus_prefix$wready  : out std_logic := '1';
+      $e.bus_prefix$wdata   : in  std_logic_vector($bw-1$ downto 0) := (others => '0');
+      $e.bus_prefix$wstrb   : in  std_logic_vector($bw//8-1$ downto 0) := (others => '0');
+      $e.bus_prefix$bvalid  : out std_logic := '0';
+      $e.bus_prefix$bready  : in  std_logic := '1';
+      $e.bus_prefix$bresp   : out std_logic_vector(1 downto 0) := "00";
+      $e.bus_prefix$arvalid : in  std_logic := '0';
+      $e.bus_prefix$arready : out std_logic := '1';
+      $e.bus_prefix$araddr  : in  std_logic_vector(31 downto 0) := X"00000000";
+      $e.bus_prefix$arprot  : in  std_logic_vector(2 downto 0) := "000";
+      $e.bus_prefix$rvalid  : out std_logic := '0';
+      $e.bus_prefix$rready  : in  std_logic := '1';
+      $e.bus_prefix$rdata   : out std_logic_vector($bw-1$ downto 0) := (others => '0');
+      $e.bus_prefix$rresp   : out std_logic_vector(1 downto 0) := "00";
+      $e.bus_prefix$uirq    : out std_logic := '0'
+ |$else
       $e.bus_prefix$i : in  axi4l$bw$_m2s_type := AXI4L$bw$_M2S_RESET;
       $e.bus_prefix$o : out axi4l$bw$_s2m_type := AXI4L$bw$_S2M_RESET
+ |$endif
 $endif
 
     );
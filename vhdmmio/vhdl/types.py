@@ -250,8 +250,8 @@ class Axi4Lite(_Base):
         base = component_map.get(component, None)
         if base is None:
             raise ValueError('unknown component %s' % component)
-        if width not in [32, 64]:
-            raise ValueError('width must be 32 or 64')
+        if width not in [32, 64, 128, 256, 512]:
+            raise ValueError('width must be 32, 64, 128, 256, or 512')
         base = base.format(width=width)
         super().__init__(base, base.upper() + '_RESET')
 
@@ -59,6 +59,45 @@ package vhdmmio_pkg is
     strb  => "00000000"
   );
 
+  -- Write data channel, 128-bit, master to slave.
+  type axi4lw128_type is record
+    valid : std_logic;
+    data  : std_logic_vector(127 downto 0);
+    strb  : std_logic_vector(15 downto 0);
+  end record;
+
+  constant AXI4LW128_RESET: axi4lw128_type := (
+    valid => '0',
+    data  => (others => '0'),
+    strb  => (others => '0')
+  );
+
+  -- Write data channel, 256-bit, master to slave.
+  type axi4lw256_type is record
+    valid : std_logic;
+    data  : std_logic_vector(255 downto 0);
+    strb  : std_logic_vector(31 downto 0);
+  end record;
+
+  constant AXI4LW256_RESET: axi4lw256_type := (
+    valid => '0',
+    data  => (others => '0'),
+    strb  => (others => '0')
+  );
+
+  -- Write data channel, 512-bit, master to slave.
+  type axi4lw512_type is record
+    valid : std_logic;
+    data  : std_logic_vector(511 downto 0);
+    strb  : std_logic_vector(63 downto 0);
+  end record;
+
+  constant AXI4LW512_RESET: axi4lw512_type := (
+    valid => '0',
+    data  => (others => '0'),
+    strb  => (others => '0')
+  );
+
   -- Write response channel, slave to master.
   type axi4lb_type is record
     valid : std_logic;
@@ -96,6 +135,45 @@ package vhdmmio_pkg is
     resp  => AXI4L_RESP_OKAY
   );
 
+  -- Read response channel, 128-bit, slave to master.
+  type axi4lr128_type is record
+    valid : std_logic;
+    data  : std_logic_vector(127 downto 0);
+    resp  : std_logic_vector(1 downto 0);
+  end record;
+
+  constant AXI4LR128_RESET: axi4lr128_type := (
+    valid => '0',
+    data  => (others => '0'),
+    resp  => AXI4L_RESP_OKAY
+  );
+
+  -- Read response channel, 256-bit, slave to master.
+  type axi4lr256_type is record
+    valid : std_logic;
+    data  : std_logic_vector(255 downto 0);
+    resp  : std_logic_vector(1 downto 0);
+  end record;
+
+  constant AXI4LR256_RESET: axi4lr256_type := (
+    valid => '0',
+    data  => (others => '0'),
+    resp  => AXI4L_RESP_OKAY
+  );
+
+  -- Read response channel, 512-bit, slave to master.
+  type axi4lr512_type is record
+    valid : std_logic;
+    data  : std_logic_vector(511 downto 0);
+    resp  : std_logic_vector(1 downto 0);
+  end record;
+
+  constant AXI4LR512_RESET: axi4lr512_type := (
+    valid => '0',
+    data  => (others => '0'),
+    resp  => AXI4L_RESP_OKAY
+  );
+
   -- Handshake return for any AXI4-lite channel.
   type axi4lh_type is record
     ready : std_logic;
@@ -195,6 +273,126 @@ package vhdmmio_pkg is
 
   type axi4l64_s2m_array is array (natural range <>) of axi4l64_s2m_type;
 
+  -- Complete 128-bit AXI4-lite bus, master to slave direction.
+  type axi4l128_m2s_type is record
+    aw    : axi4la_type;
+    w     : axi4lw128_type;
+    b     : axi4lh_type;
+    ar    : axi4la_type;
+    r     : axi4lh_type;
+  end record;
+
+  constant AXI4L128_M2S_RESET: axi4l128_m2s_type := (
+    aw    => AXI4LA_RESET,
+    w     => AXI4LW128_RESET,
+    b     => AXI4LH_RESET,
+    ar    => AXI4LA_RESET,
+    r     => AXI4LH_RESET
+  );
+
+  type axi4l128_m2s_array is array (natural range <>) of axi4l128_m2s_type;
+
+  -- Complete 128-bit AXI4-lite bus, slave to master direction.
+  type axi4l128_s2m_type is record
+    aw    : axi4lh_type;
+    w     : axi4lh_type;
+    b     : axi4lb_type;
+    ar    : axi4lh_type;
+    r     : axi4lr128_type;
+    u     : axi4lu_type;
+  end record;
+
+  constant AXI4L128_S2M_RESET: axi4l128_s2m_type := (
+    aw    => AXI4LH_RESET,
+    w     => AXI4LH_RESET,
+    b     => AXI4LB_RESET,
+    ar    => AXI4LH_RESET,
+    r     => AXI4LR128_RESET,
+    u     => AXI4LU_RESET
+  );
+
+  type axi4l128_s2m_array is array (natural range <>) of axi4l128_s2m_type;
+
+  -- Complete 256-bit AXI4-lite bus, master to slave direction.
+  type axi4l256_m2s_type is record
+    aw    : axi4la_type;
+    w     : axi4lw256_type;
+    b     : axi4lh_type;
+    ar    : axi4la_type;
+    r     : axi4lh_type;
+  end record;
+
+  constant AXI4L256_M2S_RESET: axi4l256_m2s_type := (
+    aw    => AXI4LA_RESET,
+    w     => AXI4LW256_RESET,
+    b     => AXI4LH_RESET,
+    ar    => AXI4LA_RESET,
+    r     => AXI4LH_RESET
+  );
+
+  type axi4l256_m2s_array is array (natural range <>) of axi4l256_m2s_type;
+
+  -- Complete 256-bit AXI4-lite bus, slave to master direction.
+  type axi4l256_s2m_type is record
+    aw    : axi4lh_type;
+    w     : axi4lh_type;
+    b     : axi4lb_type;
+    ar    : axi4lh_type;
+    r     : axi4lr256_type;
+    u     : axi4lu_type;
+  end record;
+
+  constant AXI4L256_S2M_RESET: axi4l256_s2m_type := (
+    aw    => AXI4LH_RESET,
+    w     => AXI4LH_RESET,
+    b     => AXI4LB_RESET,
+    ar    => AXI4LH_RESET,
+    r     => AXI4LR256_RESET,
+    u     => AXI4LU_RESET
+  );
+
+  type axi4l256_s2m_array is array (natural range <>) of axi4l256_s2m_type;
+
+  -- Complete 512-bit AXI4-lite bus, master to slave direction.
+  type axi4l512_m2s_type is record
+    aw    : axi4la_type;
+    w     : axi4lw512_type;
+    b     : axi4lh_type;
+    ar    : axi4la_type;
+    r     : axi4lh_type;
+  end record;
+
+  constant AXI4L512_M2S_RESET: axi4l512_m2s_type := (
+    aw    => AXI4LA_RESET,
+    w     => AXI4LW512_RESET,
+    b     => AXI4LH_RESET,
+    ar    => AXI4LA_RESET,
+    r     => AXI4LH_RESET
+  );
+
+  type axi4l512_m2s_array is array (natural range <>) of axi4l512_m2s_type;
+
+  -- Complete 512-bit AXI4-lite bus, slave to master direction.
+  type axi4l512_s2m_type is record
+    aw    : axi4lh_type;
+    w     : axi4lh_type;
+    b     : axi4lb_type;
+    ar    : axi4lh_type;
+    r     : axi4lr512_type;
+    u     : axi4lu_type;
+  end record;
+
+  constant AXI4L512_S2M_RESET: axi4l512_s2m_type := (
+    aw    => AXI4LH_RESET,
+    w     => AXI4LH_RESET,
+    b     => AXI4LB_RESET,
+    ar    => AXI4LH_RESET,
+    r     => AXI4LR512_RESET,
+    u     => AXI4LU_RESET
+  );
+
+  type axi4l512_s2m_array is array (natural range <>) of axi4l512_s2m_type;
+
   -- Arrays of primitive types, occasionally used by the register file
   -- generator. Note that std_logic_array is defined just like
   -- std_logic_vector; the difference is that the programmer can assume that